@@ -0,0 +1,89 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+class BatchSizer(object):
+    """
+        Adapts the number of paths sent to a worker process per task to the observed cost per file. Cheap files (small files,
+        metadata queries) get large batches so that the pipe overhead per task is spread over many files, while expensive
+        files get small batches so that the work stays evenly spread over the workers.
+    """
+
+    MINIMUM_SIZE = 16
+    """
+        The smallest batch size that is used.
+    """
+
+    MAXIMUM_SIZE = 4096
+    """
+        The largest batch size that is used.
+    """
+
+    TARGET_DURATION = 0.05
+    """
+        How long, in seconds, a worker should ideally spend on one batch.
+    """
+
+    SMOOTHING = 0.25
+    """
+        The weight of the most recent batch in the running estimate of the cost per file.
+    """
+
+    size = None
+    """
+        The current batch size.
+    """
+
+    file_cost = None
+    """
+        The running estimate of the time, in seconds, a worker spends per file. None until the first batch completed.
+    """
+
+    def __init__(self, initial_size=64):
+        """
+            Initializes a new BatchSizer.
+
+            :param initial_size: The batch size used until the first batch completed.
+        """
+        self.size = initial_size
+        self.file_cost = None
+
+    def record(self, file_count, elapsed):
+        """
+            Records a completed batch and adjusts the batch size.
+
+            :param file_count: The number of files in the batch.
+            :param elapsed: The time, in seconds, the worker spent on the batch.
+        """
+        if file_count == 0:
+            return
+
+        batch_cost = elapsed / file_count
+        if self.file_cost is None:
+            self.file_cost = batch_cost
+        else:
+            self.file_cost += self.SMOOTHING * (batch_cost - self.file_cost)
+
+        if self.file_cost <= 0:
+            self.size = self.MAXIMUM_SIZE
+        else:
+            self.size = int(max(self.MINIMUM_SIZE, min(self.MAXIMUM_SIZE, self.TARGET_DURATION / self.file_cost)))
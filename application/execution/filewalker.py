@@ -0,0 +1,322 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import os
+import stat
+import random
+import threading
+import collections
+
+from timeit import default_timer
+
+# Python 2 has no os.scandir, the scandir package listed in requirements.txt provides it there
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+class _ListDirEntry(object):
+    """
+        A minimal stand-in for os.DirEntry that is used when neither os.scandir nor the scandir package are available.
+        Type and stat information are retrieved on first use and cached, like os.DirEntry does.
+    """
+
+    __slots__ = ("name", "path", "_stat", "_lstat")
+
+    def __init__(self, directory, name):
+        self.name = name
+        self.path = os.path.join(directory, name)
+        self._stat = None
+        self._lstat = None
+
+    def stat(self, follow_symlinks=True):
+        if follow_symlinks:
+            if self._stat is None:
+                self._stat = os.stat(self.path)
+            return self._stat
+
+        if self._lstat is None:
+            self._lstat = os.lstat(self.path)
+        return self._lstat
+
+    def _test_mode(self, test, follow_symlinks):
+        try:
+            return test(self.stat(follow_symlinks=follow_symlinks).st_mode)
+        except OSError:
+            return False
+
+    def is_dir(self, follow_symlinks=True):
+        return self._test_mode(stat.S_ISDIR, follow_symlinks)
+
+    def is_file(self, follow_symlinks=True):
+        return self._test_mode(stat.S_ISREG, follow_symlinks)
+
+def _list_directory(directory):
+    """
+        Lists a directory as DirEntry-like objects. Without scandir, every entry costs a further lstat call to tell
+        directories from files and a stat call for files, where scandir mostly takes the type from the listing itself.
+
+        :param directory: The directory to list.
+
+        :return: An iterable of os.DirEntry (or compatible) objects. Iterators that are not exhausted should be passed to
+            _close_listing.
+    """
+    if scandir is not None:
+        return scandir(directory)
+    return [_ListDirEntry(directory, name) for name in os.listdir(directory)]
+
+def _close_listing(entries):
+    """
+        Releases the directory handle of a listing returned by _list_directory, which scandir otherwise keeps open until the
+        iterator is exhausted or collected.
+
+        :param entries: The listing returned by _list_directory.
+    """
+    close = getattr(entries, "close", None)
+    if close is not None:
+        close()
+
+class FileWalker(object):
+    """
+        A parallel directory walker built on os.scandir. Directories are enumerated by a pool of threads: each thread works
+        depth first from its own deque of pending directories and steals the oldest pending directory of another thread
+        when it runs out of work, so wide trees are spread across all threads. The DirEntry type and stat information are
+        handed on with every file so that they do not have to be retrieved again.
+    """
+
+    THREAD_COUNT = 8
+    """
+        The default number of enumeration threads. Directory listing is dominated by system calls that release the
+        interpreter lock, so this is not bound to the number of processing cores.
+    """
+
+    IDLE_TIMEOUT = 0.05
+    """
+        How long, in seconds, an idle thread waits for new work before looking for directories to steal again.
+    """
+
+    roots = None
+    """
+        The list of directories to walk.
+    """
+
+    thread_count = None
+    """
+        The number of enumeration threads to use.
+    """
+
+    entry_filter = None
+    """
+        An optional callable that receives the DirEntry of every file found and returns the object to emit in its place, or
+        None to skip the file. This is called on the enumeration threads.
+    """
+
+    directory_callback = None
+    """
+        An optional callable that receives the path of every directory right before it is listed. This is called on the
+        enumeration threads.
+    """
+
+    timings = None
+    """
+        An optional execution.TimingReport the time spent listing directories is added to, as the walk phase. The time spent
+        in entry_filter and in handing the files on is not part of it.
+    """
+
+    def __init__(self, roots, thread_count=THREAD_COUNT, entry_filter=None, directory_callback=None, timings=None):
+        """
+            Initializes a new FileWalker.
+
+            :param roots: A directory path or a list of directory paths to walk.
+            :param thread_count: The number of enumeration threads to use.
+            :param entry_filter: An optional callable that receives the DirEntry of every file found and returns the object to
+                emit in its place, or None to skip the file.
+            :param directory_callback: An optional callable that receives the path of every directory right before it is
+                listed.
+            :param timings: An optional execution.TimingReport to add the time spent listing directories to.
+        """
+        self.roots = roots if type(roots) is list else [roots]
+        self.thread_count = max(1, thread_count)
+        self.entry_filter = entry_filter
+        self.directory_callback = directory_callback
+        self.timings = timings
+
+    @staticmethod
+    def list_directory(directory):
+        """
+            Lists a single directory the way the walk does.
+
+            :param directory: The directory to list.
+
+            :return: An iterable of os.DirEntry (or compatible) objects.
+        """
+        return _list_directory(directory)
+
+    def walk(self, emit):
+        """
+            Walks the roots and calls emit for every regular file found. emit is called from the enumeration threads and must
+            be thread safe. Symbolic links to files are reported, symbolic links to directories are not followed, and
+            directories that cannot be listed are skipped, matching the defaults of os.walk.
+
+            An exception other than OSError raised on an enumeration thread, such as one from entry_filter, emit or
+            directory_callback, stops the walk and is raised again here once all threads have finished.
+
+            :param emit: A callable receiving the DirEntry of each file, or the result of entry_filter if one is set. If it
+                returns False, the walk is stopped.
+        """
+        self._emit = emit
+        self._stopped = False
+        self._error = None
+        self._condition = threading.Condition()
+        self._pending = len(self.roots)
+        self._idle = 0
+        self._deques = [collections.deque() for _ in range(self.thread_count)]
+
+        for index, root in enumerate(self.roots):
+            self._deques[index % self.thread_count].append(root)
+
+        threads = [threading.Thread(target=self._work, args=(index,)) for index in range(self.thread_count)]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+    def __iter__(self):
+        """
+            Walks the roots and iterates the DirEntry of every regular file found, or the result of entry_filter if one is set.
+
+            :return: A generator of DirEntry objects.
+            :rtype: generator
+        """
+        # Imported here to avoid a circular import between the execution modules
+        from .searchpipeline import SearchPipeline
+
+        pipeline = SearchPipeline(self)
+        try:
+            for entry in pipeline:
+                yield entry
+        finally:
+            pipeline.close()
+
+    def _take_directory(self, index):
+        """
+            Takes the next directory for the given thread to enumerate, stealing from other threads when its own deque is
+            empty.
+
+            :return: A directory path, or None once the walk is complete.
+        """
+        own_deque = self._deques[index]
+        while not self._stopped:
+            try:
+                return own_deque.pop()
+            except IndexError:
+                pass
+
+            offset = random.randrange(self.thread_count)
+            for victim in range(self.thread_count):
+                try:
+                    return self._deques[(offset + victim) % self.thread_count].popleft()
+                except IndexError:
+                    pass
+
+            with self._condition:
+                if self._pending == 0 or self._stopped:
+                    return None
+                self._idle += 1
+                self._condition.wait(self.IDLE_TIMEOUT)
+                self._idle -= 1
+        return None
+
+    def _work(self, index):
+        """
+            The enumeration thread body.
+
+            :param index: The index of this thread's deque.
+        """
+        own_deque = self._deques[index]
+        timings = self.timings
+        while True:
+            directory = self._take_directory(index)
+            if directory is None:
+                return
+
+            if timings is not None:
+                start_time = default_timer()
+                handoff_time = 0.0
+
+            found_directories = 0
+            entries = None
+            try:
+                if self.directory_callback is not None:
+                    self.directory_callback(directory)
+
+                entries = _list_directory(directory)
+                for entry in entries:
+                    if self._stopped:
+                        break
+
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            found_directories += 1
+                            with self._condition:
+                                self._pending += 1
+                            own_deque.append(entry.path)
+                        elif entry.is_file():
+                            if timings is not None:
+                                handoff_start_time = default_timer()
+
+                            if self.entry_filter is not None:
+                                entry = self.entry_filter(entry)
+                            if entry is not None and self._emit(entry) is False:
+                                self._stopped = True
+
+                            if timings is not None:
+                                handoff_time += default_timer() - handoff_start_time
+                    except OSError:
+                        continue
+            except OSError:
+                pass
+            except Exception as error:
+                # The other threads are stopped and .walk raises the first error, as the directory is never released otherwise
+                if self._error is None:
+                    self._error = error
+                self._stopped = True
+            finally:
+                if entries is not None:
+                    _close_listing(entries)
+                if timings is not None:
+                    timings.add("walk", default_timer() - start_time - handoff_time)
+
+                with self._condition:
+                    self._pending -= 1
+                    if self._pending == 0 or self._stopped:
+                        self._condition.notify_all()
+                    elif found_directories != 0 and self._idle != 0:
+                        self._condition.notify(min(found_directories, self._idle))
@@ -0,0 +1,82 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+class PendingBatch(object):
+    """
+        A batch of paths submitted to a SearchExecutor. Batches are usually sent without the serialized query, which the
+        worker processes keep from earlier batches. A worker that does not have the query answers with None, in which case
+        the batch is submitted again together with the serialized query.
+    """
+
+    paths = None
+    """
+        The list of file paths of the batch.
+    """
+
+    def __init__(self, apply_batch, query_handle, paths, send_query):
+        """
+            Initializes a new PendingBatch and submits it.
+
+            :param apply_batch: A callable taking the task tuple of the worker and returning a multiprocessing AsyncResult.
+            :param query_handle: The tuple (query_key, query_data) returned by SearchExecutor.register.
+            :param paths: A list of file paths.
+            :param send_query: Whether the serialized query is sent along with the first submission.
+        """
+        self.paths = paths
+        self._apply_batch = apply_batch
+        self._query_handle = query_handle
+        self._result = self._submit(send_query)
+
+    def _submit(self, send_query):
+        """
+            Submits the batch to the pool.
+
+            :rtype: multiprocessing.pool.AsyncResult
+        """
+        query_key, query_data = self._query_handle
+        return self._apply_batch((query_key, query_data if send_query else None, self.paths))
+
+    def ready(self):
+        """
+            Returns whether the result of the batch is available. A batch that has to be submitted again is not ready.
+
+            :rtype: bool
+        """
+        if not self._result.ready():
+            return False
+        elif self._result.successful() and self._result.get() is None:
+            self._result = self._submit(True)
+            return False
+        return True
+
+    def get(self):
+        """
+            Waits for the result of the batch, see SearchExecutor.submit.
+
+            :rtype: tuple
+        """
+        result = self._result.get()
+        if result is None:
+            self._result = self._submit(True)
+            result = self._result.get()
+        return result
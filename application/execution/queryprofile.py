@@ -0,0 +1,158 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import json
+import threading
+
+class QueryProfile(object):
+    """
+        Counters for every node of a query that was executed with SearchQuery.profiled set: how often each group and predicate
+        was evaluated, how often it was true and false, the time spent in it and the bytes of file contents it scanned. This
+        shows which clause of a slow query is to blame, like EXPLAIN ANALYZE does for a database query.
+
+        Nodes are identified by their position in the query tree, so the profiles of worker processes, which evaluate their
+        own copies of the query, can be merged. The time of a group includes the time of its children, and the time of the
+        first predicate reading a file includes reading it.
+    """
+
+    FIELDS = ("evaluations", "true", "false", "time", "bytes")
+    """
+        The counters kept for every node, in the order of the lists in .counters.
+    """
+
+    labels = None
+    """
+        A list of tuples (depth, description) for the nodes of the query, in depth first order.
+    """
+
+    counters = None
+    """
+        A list with one list of counters per node, see FIELDS. The evaluators of a profiled query update these in place.
+    """
+
+    walk_files = 0
+    """
+        The number of files the entry filter of the execution excluded during the directory walk, which were never
+        evaluated. Every other file is counted by the root of the query.
+    """
+
+    def __init__(self, labels):
+        """
+            Initializes a new QueryProfile with all counters at zero.
+
+            :param labels: A list of tuples (depth, description) for the nodes of the query, in depth first order.
+        """
+        self.labels = labels
+        self.counters = [[0, 0, 0, 0.0, 0] for _ in labels]
+        self.walk_files = 0
+        self._lock = threading.Lock()
+
+    def add_walk_decision(self):
+        """
+            Counts a file the entry filter excluded during the directory walk. This may be called from several threads at
+            once.
+        """
+        with self._lock:
+            self.walk_files += 1
+
+    def reset(self):
+        """
+            Sets all counters back to zero, keeping the lists the evaluators update.
+        """
+        for counters in self.counters:
+            counters[:] = [0, 0, 0, 0.0, 0]
+        self.walk_files = 0
+
+    def merge(self, other):
+        """
+            Adds the counters of the profile of another execution of the same query, such as one of a worker process.
+
+            :param other: The QueryProfile to merge.
+        """
+        if other.labels != self.labels:
+            raise ValueError("Cannot merge the profiles of different queries.")
+
+        with self._lock:
+            for counters, other_counters in zip(self.counters, other.counters):
+                for index, value in enumerate(other_counters):
+                    counters[index] += value
+            self.walk_files += other.walk_files
+
+    def to_dict(self):
+        """
+            Returns the profile as a tree of dicts, one per node with its description, counters and children, for
+            consumption by other programs.
+
+            :rtype: dict
+        """
+        root = None
+        parents = []
+        for (depth, description), counters in zip(self.labels, self.counters):
+            node = dict(zip(self.FIELDS, counters))
+            node["node"] = description
+            node["children"] = []
+
+            del parents[depth:]
+            if len(parents) == 0:
+                root = node
+            else:
+                parents[-1]["children"].append(node)
+            parents.append(node)
+        return {"query": root, "walk_files": self.walk_files}
+
+    def to_json(self):
+        """
+            Returns the profile as JSON, see .to_dict.
+
+            :rtype: str
+        """
+        return json.dumps(self.to_dict(), sort_keys=True, indent=4, separators=(",", ": "))
+
+    def format(self):
+        """
+            Formats the profile as an annotated tree for display.
+
+            :rtype: str
+        """
+        lines = []
+        if self.walk_files != 0:
+            lines.append("Excluded during the walk: %u files" % self.walk_files)
+
+        for (depth, description), counters in zip(self.labels, self.counters):
+            evaluations, true_count, false_count, elapsed, scanned = counters
+            annotation = "evaluations=%u true=%u false=%u time=%.6f s" % (evaluations, true_count, false_count, elapsed)
+            if scanned != 0:
+                annotation += " bytes=%u" % scanned
+            prefix = "" if depth == 0 else "    " * (depth - 1) + "->  "
+            lines.append("%s%s  (%s)" % (prefix, description, annotation))
+        return "\n".join(lines)
+
+    def __getstate__(self):
+        # Profiles travel back from worker processes, but locks cannot be pickled
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,219 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import os
+import time
+import itertools
+import collections
+import multiprocessing
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+from .timingreport import TimingReport
+from .pendingbatch import PendingBatch
+
+_worker_queries = collections.OrderedDict()
+"""
+    The queries this worker process has received, keyed by their query key. Only the most recently used entries are kept.
+"""
+
+_WORKER_QUERY_LIMIT = 16
+"""
+    The maximum number of queries a worker process keeps deserialized.
+"""
+
+def _warm_up(index):
+    """
+        Internal worker warm up function. Loading the query modules here means the first real batch does not pay for it.
+
+        :param index: Unused. One call is made per worker process.
+
+        :return: The process id of the worker.
+        :rtype: int
+    """
+    import parse
+    import searchquery
+    return os.getpid()
+
+def _execute_batch(task):
+    """
+        Internal worker function evaluating one batch of paths. Only paths are sent to the worker, so it stats and reads the
+        files itself. The serialized query is only sent with the first batches of an execution and is deserialized once per
+        worker, which keeps it for the later batches.
+
+        :param task: A tuple (query_key, query_data, paths) where query_data is the pickled SearchQuery, or None if it was
+            not sent with this batch.
+
+        :return: A tuple (matched_paths, evaluated_predicates, skipped_predicates, elapsed, timings, profile) where
+            matched_paths is the list of paths that match the search term, the counters are those of this batch, elapsed is
+            the time spent on it, timings is the TimingReport of the batch, or None if the query is not timed, and profile is
+            the QueryProfile of the batch, or None if the query is not profiled. None is returned if the query was not sent
+            and this worker does not have it.
+        :rtype: tuple
+    """
+    start_time = time.time()
+    query_key, query_data, paths = task
+
+    built_query = _worker_queries.pop(query_key, None)
+    if built_query is None:
+        if query_data is None:
+            return None
+
+        built_query = pickle.loads(query_data)
+        while len(_worker_queries) >= _WORKER_QUERY_LIMIT:
+            _worker_queries.popitem(last=False)
+    _worker_queries[query_key] = built_query
+
+    built_query.evaluated_predicates = 0
+    built_query.skipped_predicates = 0
+    timings = TimingReport() if built_query.timed else None
+
+    # The evaluator of the query updates the counters of its profile in place, so they are reset for every batch
+    profile = built_query.profile if built_query.profiled else None
+    if profile is not None:
+        profile.reset()
+
+    matched_paths = [result.path for result in built_query._execute_files(paths, timings)]
+    return (
+        matched_paths, built_query.evaluated_predicates, built_query.skipped_predicates, time.time() - start_time, timings,
+        profile
+    )
+
+class SearchExecutor(object):
+    """
+        A long lived pool of worker processes that can be shared between SearchQuery executions. Starting the pool, forking
+        the processes and loading the query modules is paid once instead of once per query.
+
+        The executor can be used as a context manager:
+
+            with SearchExecutor() as executor:
+                first_results = first_query.execute(path, executor=executor)
+                second_results = second_query.execute(path, executor=executor)
+    """
+
+    thread_count = None
+    """
+        The number of worker processes.
+    """
+
+    def __init__(self, thread_count=multiprocessing.cpu_count()):
+        """
+            Initializes a new SearchExecutor. The worker processes are not created before .start is called.
+
+            :param thread_count: The number of worker processes to use.
+        """
+        self.thread_count = thread_count
+        self._pool = None
+        self._query_keys = itertools.count()
+        self._query_sends = collections.OrderedDict()
+
+    @property
+    def running(self):
+        """
+            Whether or not the worker processes are running.
+        """
+        return self._pool is not None
+
+    def start(self):
+        """
+            Starts the worker processes and waits until every one of them is ready. Calling this on a running executor does
+            nothing.
+        """
+        if self._pool is not None:
+            return
+
+        self._pool = multiprocessing.Pool(self.thread_count)
+        self._pool.map(_warm_up, range(self.thread_count), chunksize=1)
+
+    def shutdown(self, wait=True):
+        """
+            Stops the worker processes.
+
+            :param wait: If True, batches that were already submitted are completed first. Otherwise they are abandoned.
+        """
+        if self._pool is None:
+            return
+
+        if wait:
+            self._pool.close()
+        else:
+            self._pool.terminate()
+        self._pool.join()
+        self._pool = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.shutdown(wait=exception_type is None)
+
+    def register(self, built_query):
+        """
+            Serializes a query for dispatch to the workers. This is done once per execution.
+
+            :param built_query: The SearchQuery to execute.
+
+            :return: A tuple (query_key, query_data) to pass to .submit.
+            :rtype: tuple
+        """
+        query_key = "%u-%u" % (os.getpid(), next(self._query_keys))
+        return query_key, pickle.dumps(built_query, pickle.HIGHEST_PROTOCOL)
+
+    def submit(self, query_handle, paths):
+        """
+            Submits a batch of paths to be evaluated by a worker process.
+
+            The serialized query, which may be large, is only sent with the first thread_count batches of a query. Idle
+            workers each take one of these, and a worker that missed them gets the query when its batch is submitted again,
+            see PendingBatch.
+
+            :param query_handle: The tuple returned by .register.
+            :param paths: A list of file paths.
+
+            :return: A PendingBatch for a tuple (matched_paths, evaluated_predicates, skipped_predicates, elapsed, timings,
+                profile).
+            :rtype: PendingBatch
+        """
+        if self._pool is None:
+            self.start()
+
+        query_key = query_handle[0]
+        send_count = self._query_sends.pop(query_key, 0)
+        self._query_sends[query_key] = send_count + 1
+        while len(self._query_sends) > _WORKER_QUERY_LIMIT:
+            self._query_sends.popitem(last=False)
+        return PendingBatch(self._apply_batch, query_handle, paths, send_count < self.thread_count)
+
+    def _apply_batch(self, task):
+        """
+            Sends a task to a worker process.
+
+            :param task: The task tuple for _execute_batch.
+
+            :rtype: multiprocessing.pool.AsyncResult
+        """
+        return self._pool.apply_async(_execute_batch, (task,))
@@ -0,0 +1,213 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import threading
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from .filewalker import FileWalker
+
+class SearchPipeline(object):
+    """
+        A streaming pipeline between file enumeration and query evaluation. A producer thread enumerates the target into a
+        bounded queue which the evaluators consume as entries become available, so memory use is limited by the queue depth
+        rather than by the size of the tree and the first results are produced while the walk is still running.
+
+        Entries move through the queue in chunks. A chunk is handed over as soon as the queue runs empty, so an idle consumer
+        receives entries one by one without delay, while a busy consumer receives up to CHUNK_SIZE entries per queue operation.
+    """
+
+    _END_OF_STREAM = object()
+    """
+        The sentinel placed on the queue once the producer is exhausted.
+    """
+
+    QUEUE_DEPTH = 4096
+    """
+        The default number of entries buffered between the producer and the evaluators.
+    """
+
+    CHUNK_SIZE = 256
+    """
+        The maximum number of entries moved through the queue at once.
+    """
+
+    POLL_INTERVAL = 0.1
+    """
+        How often, in seconds, a blocked producer checks whether the pipeline was closed.
+    """
+
+    queue_depth = None
+    """
+        The maximum number of entries buffered between the producer and the evaluators.
+    """
+
+    def __init__(self, entries, queue_depth=QUEUE_DEPTH):
+        """
+            Initializes a new SearchPipeline and starts its producer thread.
+
+            :param entries: An iterable of entries (paths, TargetFile instances or DirEntry objects) to feed into the pipeline.
+                This is consumed on the producer thread. If this is a FileWalker, its enumeration threads feed the queue
+                directly.
+            :param queue_depth: The maximum number of entries buffered between the producer and the evaluators.
+        """
+        self.queue_depth = queue_depth
+        self._chunk_size = max(1, min(self.CHUNK_SIZE, queue_depth))
+        self._queue = queue.Queue(maxsize=max(1, queue_depth // self._chunk_size))
+        self._chunk = []
+        self._chunk_lock = threading.Lock()
+        self._pending = []
+        self._closed = threading.Event()
+        self._finished = False
+        self._error = None
+
+        self._producer = threading.Thread(target=self._produce, args=(entries,))
+        self._producer.daemon = True
+        self._producer.start()
+
+    def _put_chunk(self, chunk):
+        """
+            Places a chunk of entries on the queue, blocking while the queue is full.
+
+            :return: False if the pipeline was closed while waiting, True otherwise.
+            :rtype: bool
+        """
+        while not self._closed.is_set():
+            try:
+                self._queue.put(chunk, timeout=self.POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _put(self, entry):
+        """
+            Adds an entry to the current chunk and hands the chunk over when it is full or the consumer ran out of entries.
+            This may be called from several threads at once.
+
+            :return: False if the pipeline was closed, True otherwise.
+            :rtype: bool
+        """
+        with self._chunk_lock:
+            self._chunk.append(entry)
+            if len(self._chunk) < self._chunk_size and not self._queue.empty():
+                return True
+            chunk, self._chunk = self._chunk, []
+        return self._put_chunk(chunk)
+
+    def _produce(self, entries):
+        """
+            The producer thread body.
+        """
+        try:
+            if isinstance(entries, FileWalker):
+                entries.walk(self._put)
+            else:
+                for entry in entries:
+                    if not self._put(entry):
+                        return
+        except Exception as error:
+            self._error = error
+
+        with self._chunk_lock:
+            chunk, self._chunk = self._chunk, []
+        if len(chunk) == 0 or self._put_chunk(chunk):
+            self._put_chunk(self._END_OF_STREAM)
+
+    def close(self):
+        """
+            Stops the producer. Entries that were not consumed yet are discarded.
+        """
+        self._closed.set()
+
+    def _take_chunk(self, block):
+        """
+            Moves the next chunk from the queue into the pending entries.
+
+            :param block: Whether to wait for a chunk if none is available.
+
+            :return: False if no chunk was available or the pipeline is exhausted, True otherwise.
+            :rtype: bool
+        """
+        try:
+            chunk = self._queue.get(block)
+        except queue.Empty:
+            return False
+
+        if chunk is self._END_OF_STREAM:
+            self._finished = True
+            return False
+        self._pending.extend(chunk)
+        return True
+
+    def next_batch(self, batch_size):
+        """
+            Takes the next group of entries from the pipeline. A batch is handed out as soon as at least one entry is available,
+            so a slow producer does not delay evaluation while waiting for a full batch.
+
+            :param batch_size: The maximum number of entries in the batch.
+
+            :return: A non empty list of entries, or None once the pipeline is exhausted.
+        """
+        while len(self._pending) == 0 and not self._finished:
+            self._take_chunk(block=True)
+
+        while len(self._pending) < batch_size and not self._finished and self._take_chunk(block=False):
+            pass
+
+        if len(self._pending) == 0:
+            if self._error is not None:
+                raise self._error
+            return None
+
+        batch = self._pending[:batch_size]
+        del self._pending[:batch_size]
+        return batch
+
+    def __iter__(self):
+        """
+            Iterates the entries in the pipeline as the producer makes them available.
+
+            :return: A generator of entries.
+            :rtype: generator
+        """
+        for batch in self.batches(self._chunk_size):
+            for entry in batch:
+                yield entry
+
+    def batches(self, batch_size):
+        """
+            Iterates the entries in the pipeline grouped into lists, see .next_batch.
+
+            :param batch_size: The maximum number of entries per batch.
+
+            :return: A generator of entry lists.
+            :rtype: generator
+        """
+        batch = self.next_batch(batch_size)
+        while batch is not None:
+            yield batch
+            batch = self.next_batch(batch_size)
@@ -0,0 +1,224 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import threading
+import collections
+
+from timeit import default_timer
+
+class TimingReport(object):
+    """
+        The time a search spent in each of its phases, along with the number of files and bytes it processed. A report is
+        produced for every execution of a query that has SearchQuery.timed set, which the "timed:" flag of the query does.
+
+        Phases are measured where they run and added up, so with several enumeration threads or worker processes their sum
+        can exceed the wall time of the search. Each phase excludes the others: the time a predicate spends waiting for the
+        stat information or the contents of a file counts as stat or read time, not as evaluation time. Pages of files that
+        are mapped into memory are only read when a predicate first touches them, which counts as evaluation time.
+
+        The methods adding to a report may be called from several threads at once.
+    """
+
+    COMPILATION_PHASES = ("lex", "parse", "optimize")
+    """
+        The phases measured by the compiler, once per query.
+    """
+
+    EXECUTION_PHASES = ("walk", "stat", "read", "evaluate", "output")
+    """
+        The phases measured by every execution.
+    """
+
+    PHASES = COMPILATION_PHASES + EXECUTION_PHASES
+    """
+        All phases, in the order they are reported in.
+    """
+
+    clock = staticmethod(default_timer)
+    """
+        The clock phases are measured with, returning seconds.
+    """
+
+    phases = None
+    """
+        A dict mapping every phase name to the time spent in it, in seconds.
+    """
+
+    files = 0
+    """
+        The number of files the search decided on, whether in the directory walk or by evaluating them.
+    """
+
+    bytes = 0
+    """
+        The number of bytes read from files.
+    """
+
+    matches = 0
+    """
+        The number of results produced.
+    """
+
+    wall_time = 0.0
+    """
+        The time, in seconds, from the start of the execution until its last result was consumed.
+    """
+
+    def __init__(self):
+        """
+            Initializes a new, empty TimingReport.
+        """
+        self.phases = collections.OrderedDict((phase, 0.0) for phase in self.PHASES)
+        self.files = 0
+        self.bytes = 0
+        self.matches = 0
+        self.wall_time = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, phase, elapsed, files=0, bytes=0):
+        """
+            Adds to the time spent in a phase and to the counters.
+
+            :param phase: The name of the phase, one of PHASES.
+            :param elapsed: The time spent, in seconds.
+            :param files: The number of files that were decided on.
+            :param bytes: The number of bytes that were read.
+        """
+        with self._lock:
+            self.phases[phase] += elapsed
+            self.files += files
+            self.bytes += bytes
+
+    def merge(self, other):
+        """
+            Adds the phases and counters of another report, such as the one of a worker process, to this one. The wall time
+            is not merged.
+
+            :param other: The TimingReport to merge.
+        """
+        with self._lock:
+            for phase, elapsed in other.phases.items():
+                self.phases[phase] += elapsed
+            self.files += other.files
+            self.bytes += other.bytes
+            self.matches += other.matches
+
+    def restart(self):
+        """
+            Returns a new report for another execution of the same query, which keeps the compilation phases of this one.
+
+            :rtype: TimingReport
+        """
+        report = TimingReport()
+        for phase in self.COMPILATION_PHASES:
+            report.phases[phase] = self.phases[phase]
+        return report
+
+    def time_results(self, results, phase=None):
+        """
+            Times the consumption of the results of an execution. The time the consumer spends between two results is output
+            time, and the time from the first request for a result until the last one was consumed is the wall time.
+
+            :param results: An iterable of SearchResult objects.
+            :param phase: The phase the time spent producing the results is added to, or None if the execution measures its
+                own phases.
+
+            :return: A generator of the same results.
+            :rtype: generator
+        """
+        clock = self.clock
+        start_time = clock()
+        resumed_time = start_time
+        try:
+            for result in results:
+                suspended_time = clock()
+                if phase is not None:
+                    self.add(phase, suspended_time - resumed_time)
+                self.matches += 1
+                yield result
+                resumed_time = clock()
+                self.add("output", resumed_time - suspended_time)
+
+            if phase is not None:
+                self.add(phase, clock() - resumed_time)
+        finally:
+            self.wall_time = clock() - start_time
+
+    @property
+    def files_per_second(self):
+        """
+            The number of files decided on per second of wall time, or None if no time was measured.
+        """
+        return self.files / self.wall_time if self.wall_time > 0 else None
+
+    @property
+    def bytes_per_second(self):
+        """
+            The number of bytes read per second of wall time, or None if no time was measured.
+        """
+        return self.bytes / self.wall_time if self.wall_time > 0 else None
+
+    def to_dict(self):
+        """
+            Returns the report as a structure of dicts and plain values, for consumption by other programs.
+
+            :rtype: dict
+        """
+        return {
+            "phases": dict(self.phases),
+            "files": self.files,
+            "bytes": self.bytes,
+            "matches": self.matches,
+            "wall_time": self.wall_time,
+            "files_per_second": self.files_per_second,
+            "bytes_per_second": self.bytes_per_second,
+        }
+
+    def format(self):
+        """
+            Formats the report for display.
+
+            :rtype: str
+        """
+        lines = ["========================================================="]
+        for phase, elapsed in self.phases.items():
+            lines.append("%-10s %12.6f s" % (phase.capitalize() + ":", elapsed))
+        lines.append("---------------------------------------------------------")
+        lines.append("%-10s %12.6f s" % ("Total:", self.wall_time))
+
+        files_per_second, bytes_per_second = self.files_per_second, self.bytes_per_second
+        lines.append("%-10s %12u (%s files/s)" % ("Files:", self.files, "-" if files_per_second is None else "%.1f" % files_per_second))
+        lines.append("%-10s %12u (%s bytes/s)" % ("Bytes:", self.bytes, "-" if bytes_per_second is None else "%.1f" % bytes_per_second))
+        lines.append("%-10s %12u" % ("Matches:", self.matches))
+        lines.append("=========================================================")
+        return "\n".join(lines)
+
+    def __getstate__(self):
+        # Reports travel back from worker processes, but locks cannot be pickled
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
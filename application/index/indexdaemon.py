@@ -0,0 +1,248 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import os
+import time
+import errno
+import threading
+
+from .inotify import Inotify
+
+class IndexDaemon(object):
+    """
+        Keeps a MetadataIndex up to date by subscribing to inotify events for every indexed directory. Events are collected
+        for a short while and applied to the index in one transaction, so searches against the index stay fresh without
+        walking the tree. When the kernel event queue overflows, the lost events are recovered by refreshing the roots from
+        their directory modification times.
+    """
+
+    WATCH_MASK = (
+        Inotify.IN_CREATE | Inotify.IN_DELETE | Inotify.IN_MOVED_FROM | Inotify.IN_MOVED_TO | Inotify.IN_CLOSE_WRITE |
+        Inotify.IN_MODIFY | Inotify.IN_ATTRIB | Inotify.IN_DELETE_SELF | Inotify.IN_MOVE_SELF | Inotify.IN_ONLYDIR |
+        Inotify.IN_DONT_FOLLOW | Inotify.IN_EXCL_UNLINK
+    )
+    """
+        The events subscribed to for every directory.
+    """
+
+    BATCH_INTERVAL = 0.2
+    """
+        How long, in seconds, events are collected after the first one arrives before they are applied.
+    """
+
+    BATCH_LIMIT = 16384
+    """
+        The maximum number of events collected before they are applied.
+    """
+
+    POLL_INTERVAL = 0.5
+    """
+        How often, in seconds, an idle daemon checks whether it was stopped.
+    """
+
+    index = None
+    """
+        The MetadataIndex being kept up to date.
+    """
+
+    roots = None
+    """
+        The list of directories being watched.
+    """
+
+    def __init__(self, index, roots=None):
+        """
+            Initializes a new IndexDaemon.
+
+            :param index: The MetadataIndex to keep up to date.
+            :param roots: A directory or a list of directories to watch. Directories that were not indexed yet are built when
+                the daemon starts. If None, all roots of the index are watched.
+        """
+        self.index = index
+        if roots is None:
+            roots = index.roots()
+        self.roots = [os.path.abspath(root) for root in (roots if type(roots) is list else [roots])]
+
+        self._inotify = None
+        self._watch_paths = {}
+        self._watch_descriptors = {}
+        self._unwatchable = set()
+        self._stopped = threading.Event()
+
+    def _add_watch(self, directory):
+        try:
+            watch_descriptor = self._inotify.add_watch(directory, self.WATCH_MASK)
+        except OSError as error:
+            if error.errno == errno.ENOSPC:
+                raise OSError(error.errno, "Out of inotify watches, raise fs.inotify.max_user_watches")
+
+            # The directory vanished in the meantime, which its parent reports, or it can not be watched at all
+            self._unwatchable.add(directory)
+            return
+
+        # Watching a moved directory again hands out its existing descriptor
+        previous_path = self._watch_paths.get(watch_descriptor)
+        if previous_path is not None:
+            self._watch_descriptors.pop(previous_path, None)
+        self._watch_paths[watch_descriptor] = directory
+        self._watch_descriptors[directory] = watch_descriptor
+
+    def _remove_watch(self, directory):
+        watch_descriptor = self._watch_descriptors.pop(directory, None)
+        if watch_descriptor is not None and self._watch_paths.get(watch_descriptor) == directory:
+            del self._watch_paths[watch_descriptor]
+            self._inotify.remove_watch(watch_descriptor)
+
+    def _watch_tree(self, directory):
+        """
+            Watches every indexed directory at and below a directory. As files may be created in a directory before its watch
+            is in place, the directory is refreshed after new watches were added, until no more directories turn up.
+        """
+        while True:
+            unwatched = [
+                path for path in self.index.directories(directory)
+                if path not in self._watch_descriptors and path not in self._unwatchable
+            ]
+            if len(unwatched) == 0:
+                return
+
+            for path in unwatched:
+                self._add_watch(path)
+            self.index.refresh(directory)
+
+    def _recover(self):
+        """
+            Recovers from lost events by refreshing all roots.
+        """
+        for root in self.roots:
+            for directory in list(self._watch_descriptors):
+                if directory == root or directory.startswith(root + os.sep):
+                    if not os.path.isdir(directory):
+                        self._remove_watch(directory)
+            self.index.refresh(root)
+            self._watch_tree(root)
+
+    def apply(self, events):
+        """
+            Applies a batch of inotify events to the index.
+
+            :param events: A list of InotifyEvent tuples.
+        """
+        changed_paths = set()
+        overflowed = False
+        for event in events:
+            if event.mask & Inotify.IN_Q_OVERFLOW:
+                overflowed = True
+                continue
+
+            directory = self._watch_paths.get(event.watch_descriptor)
+            if directory is None:
+                continue
+
+            if event.mask & Inotify.IN_IGNORED:
+                # The kernel dropped the watch because the directory is gone
+                del self._watch_paths[event.watch_descriptor]
+                if self._watch_descriptors.get(directory) == event.watch_descriptor:
+                    del self._watch_descriptors[directory]
+                continue
+
+            changed_paths.add(os.path.join(directory, event.name) if event.name else directory)
+
+        if overflowed:
+            self._recover()
+            return
+        if len(changed_paths) == 0:
+            return
+
+        # Directories that are no longer at their indexed location lose their watches along with their index entries
+        for path in changed_paths:
+            if not os.path.isdir(path) or os.path.islink(path):
+                for directory in self.index.directories(path):
+                    self._remove_watch(directory)
+        self.index.update(changed_paths)
+
+        for path in changed_paths:
+            if os.path.isdir(path) and not os.path.islink(path):
+                self._watch_tree(path)
+
+    def start(self):
+        """
+            Watches the roots and brings their index up to date. Roots that were not indexed yet are built.
+        """
+        self._inotify = Inotify()
+        self._stopped.clear()
+        for root in self.roots:
+            if not self.index.covers(root):
+                self.index.build(root)
+            self._watch_tree(root)
+
+    def process(self, timeout=None):
+        """
+            Waits for events and applies them as one batch.
+
+            :param timeout: The maximum time to wait for the first event in seconds, or None to wait indefinitely.
+
+            :return: The number of events applied.
+            :rtype: int
+        """
+        events = self._inotify.read_events(timeout)
+        if len(events) == 0:
+            return 0
+
+        deadline = time.time() + self.BATCH_INTERVAL
+        while len(events) < self.BATCH_LIMIT:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            events.extend(self._inotify.read_events(remaining))
+
+        self.apply(events)
+        return len(events)
+
+    def run(self):
+        """
+            Starts the daemon and applies events until .stop is called.
+        """
+        self.start()
+        try:
+            while not self._stopped.is_set():
+                self.process(self.POLL_INTERVAL)
+        finally:
+            self.shutdown()
+
+    def stop(self):
+        """
+            Asks a running daemon to stop. This may be called from any thread.
+        """
+        self._stopped.set()
+
+    def shutdown(self):
+        """
+            Removes all watches.
+        """
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._watch_paths = {}
+        self._watch_descriptors = {}
+        self._unwatchable = set()
@@ -0,0 +1,178 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import os
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import collections
+
+InotifyEvent = collections.namedtuple("InotifyEvent", ("watch_descriptor", "mask", "cookie", "name"))
+"""
+    A single inotify event. The name is empty for events about the watched directory itself.
+"""
+
+class Inotify(object):
+    """
+        A minimal ctypes binding to the Linux inotify interface.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_DONT_FOLLOW = 0x02000000
+    IN_EXCL_UNLINK = 0x04000000
+    IN_ISDIR = 0x40000000
+
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = 0o2000000
+
+    _EVENT_HEADER = struct.Struct("iIII")
+    """
+        The layout of struct inotify_event, without the trailing name.
+    """
+
+    READ_SIZE = 64 * 1024
+    """
+        The number of bytes read from the inotify descriptor at once.
+    """
+
+    _libc = None
+    """
+        The C library providing the inotify functions, loaded on first use.
+    """
+
+    def __init__(self):
+        """
+            Initializes a new inotify instance.
+
+            :raises OSError: If inotify is not available on this system.
+        """
+        if Inotify._libc is None:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            if not hasattr(libc, "inotify_init1"):
+                raise OSError(errno.ENOSYS, "inotify is not available on this system")
+            libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+            libc.inotify_rm_watch.argtypes = (ctypes.c_int, ctypes.c_int)
+            Inotify._libc = libc
+
+        self._descriptor = self._check(self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC))
+
+    def _check(self, result):
+        """
+            Raises the pending C library error if a call failed.
+
+            :return: The result of the call.
+        """
+        if result < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        return result
+
+    def fileno(self):
+        return self._descriptor
+
+    def close(self):
+        """
+            Closes the inotify instance, removing all of its watches.
+        """
+        if self._descriptor is not None:
+            os.close(self._descriptor)
+            self._descriptor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+    def add_watch(self, path, mask):
+        """
+            Starts watching a path. Watching a path that is already watched updates its mask.
+
+            :param path: The path to watch.
+            :param mask: The events to report, a combination of the IN_* constants.
+
+            :return: The watch descriptor.
+            :rtype: int
+        """
+        if not isinstance(path, bytes):
+            path = path.encode("utf-8", "surrogateescape")
+        return self._check(self._libc.inotify_add_watch(self._descriptor, path, mask))
+
+    def remove_watch(self, watch_descriptor):
+        """
+            Stops watching a path. Watches that were already removed by the kernel are ignored.
+
+            :param watch_descriptor: The watch descriptor returned by .add_watch.
+        """
+        try:
+            self._check(self._libc.inotify_rm_watch(self._descriptor, watch_descriptor))
+        except OSError as error:
+            if error.errno != errno.EINVAL:
+                raise
+
+    def read_events(self, timeout=None):
+        """
+            Reads the pending events, waiting for some to arrive first.
+
+            :param timeout: The maximum time to wait for events in seconds, or None to wait indefinitely.
+
+            :return: A list of InotifyEvent tuples, empty if no event arrived in time.
+            :rtype: list
+        """
+        readable, _, _ = select.select([self._descriptor], [], [], timeout)
+        if len(readable) == 0:
+            return []
+
+        try:
+            data = os.read(self._descriptor, self.READ_SIZE)
+        except OSError as error:
+            if error.errno in (errno.EAGAIN, errno.EINTR):
+                return []
+            raise
+
+        events = []
+        offset = 0
+        header_size = self._EVENT_HEADER.size
+        while offset + header_size <= len(data):
+            watch_descriptor, mask, cookie, name_length = self._EVENT_HEADER.unpack_from(data, offset)
+            offset += header_size
+            name = data[offset:offset + name_length].rstrip(b"\0")
+            offset += name_length
+
+            if not isinstance(name, str):
+                name = name.decode("utf-8", "surrogateescape")
+            events.append(InotifyEvent(watch_descriptor, mask, cookie, name))
+        return events
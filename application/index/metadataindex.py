@@ -0,0 +1,476 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import os
+import stat
+import time
+import sqlite3
+import itertools
+
+import parse
+import execution
+from searchresult import SearchResult
+
+from .sqltranslator import SQLTranslator
+
+class MetadataIndex(object):
+    """
+        A persistent index of file metadata stored in an SQLite database. Queries that only depend on file metadata are
+        answered from the index without touching the file system, any other query falls back to a live search.
+    """
+
+    DATABASE_PATH = os.path.join(os.path.expanduser("~"), ".fssearch.db")
+    """
+        The default location of the index database.
+    """
+
+    SCHEMA_VERSION = 2
+    """
+        The version of the database layout. Databases with a different version are rebuilt from scratch.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS roots (
+            path TEXT PRIMARY KEY,
+            built REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS directories (
+            path TEXT PRIMARY KEY,
+            parent TEXT NOT NULL,
+            mtime REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            directory TEXT NOT NULL,
+            basename TEXT NOT NULL,
+            extension TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            ctime REAL NOT NULL,
+            mtime REAL NOT NULL,
+            inode INTEGER NOT NULL,
+            device INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS directories_parent ON directories (parent);
+        CREATE INDEX IF NOT EXISTS files_directory ON files (directory);
+        CREATE INDEX IF NOT EXISTS files_basename ON files (basename);
+        CREATE INDEX IF NOT EXISTS files_extension ON files (extension);
+        CREATE INDEX IF NOT EXISTS files_size ON files (size);
+        CREATE INDEX IF NOT EXISTS files_ctime ON files (ctime);
+    """
+    """
+        The statements creating the database layout.
+    """
+
+    INSERT_BATCH_SIZE = 1024
+    """
+        The number of files inserted into the database at once while building.
+    """
+
+    database_path = None
+    """
+        The path to the index database.
+    """
+
+    def __init__(self, database_path=DATABASE_PATH):
+        """
+            Initializes a new MetadataIndex, creating the database if it does not exist yet.
+
+            :param database_path: The path to the index database.
+        """
+        self.database_path = database_path
+        self._connection = sqlite3.connect(database_path, check_same_thread=False)
+        self._connection.text_factory = str
+        self._connection.create_function(SQLTranslator.EVALUATE_FUNCTION, 7, self._evaluate_row)
+        self._evaluators = {}
+        self._evaluator_keys = itertools.count()
+        self._extension = parse.references.FileExtensionReference(None)
+
+        # Write ahead logging lets searches read the index while it is being updated
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        with self._connection:
+            if self._connection.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+                self._connection.executescript("DROP TABLE IF EXISTS roots; DROP TABLE IF EXISTS directories; DROP TABLE IF EXISTS files;")
+                self._connection.execute("PRAGMA user_version = %d" % self.SCHEMA_VERSION)
+            self._connection.executescript(self.SCHEMA)
+
+    def close(self):
+        """
+            Closes the index database.
+        """
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+    def _prefix_range(self, path):
+        """
+            Returns the bounds of the paths lying below the given directory, for use in a range condition on the path column.
+
+            :rtype: tuple
+        """
+        prefix = path if path.endswith(os.sep) else path + os.sep
+        return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+    def _file_row(self, path, stat_result):
+        """
+            Builds the database row describing a file.
+
+            :param path: The absolute path of the file.
+            :param stat_result: The os.stat_result of the file.
+
+            :rtype: tuple
+        """
+        target_file = parse.TargetFile(path, stat_result=stat_result)
+        return (
+            path, os.path.dirname(path), os.path.basename(path), self._extension.payload(target_file), stat_result.st_size,
+            stat_result.st_ctime, stat_result.st_mtime, stat_result.st_ino, stat_result.st_dev
+        )
+
+    def _remove_tree(self, directory):
+        """
+            Removes a directory and everything below it from the index.
+
+            :return: The number of files removed.
+            :rtype: int
+        """
+        lower_bound, upper_bound = self._prefix_range(directory)
+        self._connection.execute(
+            "DELETE FROM directories WHERE path = ? OR (path >= ? AND path < ?)", (directory, lower_bound, upper_bound)
+        )
+        return self._connection.execute(
+            "DELETE FROM files WHERE path >= ? AND path < ?", (lower_bound, upper_bound)
+        ).rowcount
+
+    def _index_trees(self, directories, thread_count):
+        """
+            Walks directories and adds every file and directory found to the index.
+
+            :param directories: The list of directories to walk.
+            :param thread_count: The number of threads used to walk the directories.
+
+            :return: The number of files indexed.
+            :rtype: int
+        """
+        # Directories are stat'ed before they are listed, so any change made during the walk leaves a newer mtime behind
+        found_directories = []
+        def record_directory(directory):
+            found_directories.append((directory, os.path.dirname(directory), os.stat(directory).st_mtime))
+
+        walker = execution.FileWalker(directories, thread_count=thread_count, directory_callback=record_directory)
+        pipeline = execution.SearchPipeline(walker)
+
+        file_count = 0
+        try:
+            for batch in pipeline.batches(self.INSERT_BATCH_SIZE):
+                rows = []
+                for entry in batch:
+                    try:
+                        rows.append(self._file_row(entry.path, entry.stat()))
+                    except OSError:
+                        continue
+                self._connection.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                file_count += len(rows)
+        finally:
+            pipeline.close()
+
+        self._connection.executemany("INSERT OR REPLACE INTO directories VALUES (?, ?, ?)", found_directories)
+        return file_count
+
+    def build(self, root, thread_count=execution.FileWalker.THREAD_COUNT):
+        """
+            Indexes all files below a directory, replacing anything previously indexed there.
+
+            :param root: The directory to index.
+            :param thread_count: The number of threads used to walk the directory.
+
+            :return: The number of files indexed.
+            :rtype: int
+        """
+        root = os.path.abspath(root)
+        lower_bound, upper_bound = self._prefix_range(root)
+
+        with self._connection:
+            self._remove_tree(root)
+            self._connection.execute("DELETE FROM roots WHERE path >= ? AND path < ?", (lower_bound, upper_bound))
+            file_count = self._index_trees([root], thread_count)
+            self._connection.execute("INSERT OR REPLACE INTO roots VALUES (?, ?)", (root, time.time()))
+        return file_count
+
+    def _refresh_directory(self, directory, mtime):
+        """
+            Lists a changed directory again and applies the differences to the index.
+
+            :param directory: The directory to refresh.
+            :param mtime: The modification time of the directory, retrieved before it is listed.
+
+            :return: A tuple of the number of files written, the number of files removed and the list of directories that
+                are not indexed yet.
+            :rtype: tuple
+        """
+        stored_files = dict(
+            (row[0], row[1:]) for row in self._connection.execute(
+                "SELECT basename, size, ctime, mtime, inode, device FROM files WHERE directory = ?", (directory,)
+            )
+        )
+        stored_directories = set(
+            row[0] for row in self._connection.execute("SELECT path FROM directories WHERE parent = ?", (directory,))
+        )
+
+        try:
+            entries = list(execution.FileWalker.list_directory(directory))
+        except OSError:
+            entries = []
+
+        rows = []
+        new_directories = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.path in stored_directories:
+                        stored_directories.remove(entry.path)
+                    else:
+                        new_directories.append(entry.path)
+                elif entry.is_file():
+                    row = self._file_row(entry.path, entry.stat())
+                    if stored_files.pop(entry.name, None) != row[4:]:
+                        rows.append(row)
+            except OSError:
+                continue
+
+        # Whatever was not found again has been removed
+        removed_count = 0
+        for subdirectory in stored_directories:
+            removed_count += self._remove_tree(subdirectory)
+        self._connection.executemany(
+            "DELETE FROM files WHERE path = ?", [(os.path.join(directory, name),) for name in stored_files]
+        )
+        removed_count += len(stored_files)
+
+        self._connection.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self._connection.execute("UPDATE directories SET mtime = ? WHERE path = ?", (mtime, directory))
+        return len(rows), removed_count, new_directories
+
+    def refresh(self, root, thread_count=execution.FileWalker.THREAD_COUNT):
+        """
+            Brings the index of a directory up to date without a full walk. Every indexed directory is stat'ed, but only the
+            directories whose modification time changed are listed again, and only the files that were added, removed or
+            changed within them are written. Like other indexers relying on directory modification times, this does not
+            notice a file that was modified in place within a directory whose listing did not change.
+
+            A directory that was never indexed is built instead.
+
+            :param root: The directory to refresh.
+            :param thread_count: The number of threads used to walk directories that were added.
+
+            :return: A tuple of the number of files written and the number of files removed.
+            :rtype: tuple
+        """
+        root = os.path.abspath(root)
+        if not self.covers(root):
+            return self.build(root, thread_count), 0
+
+        lower_bound, upper_bound = self._prefix_range(root)
+        directories = self._connection.execute(
+            "SELECT path, mtime FROM directories WHERE path = ? OR (path >= ? AND path < ?)", (root, lower_bound, upper_bound)
+        ).fetchall()
+
+        written_count = 0
+        removed_count = 0
+        new_directories = []
+        with self._connection:
+            for directory, mtime in directories:
+                try:
+                    stat_result = os.stat(directory)
+                except OSError:
+                    stat_result = None
+
+                if stat_result is None or not stat.S_ISDIR(stat_result.st_mode):
+                    removed_count += self._remove_tree(directory)
+                elif stat_result.st_mtime != mtime:
+                    directory_written, directory_removed, directory_new = self._refresh_directory(
+                        directory, stat_result.st_mtime
+                    )
+                    written_count += directory_written
+                    removed_count += directory_removed
+                    new_directories.extend(directory_new)
+
+            if len(new_directories) != 0:
+                written_count += self._index_trees(new_directories, thread_count)
+        return written_count, removed_count
+
+    def update(self, paths, thread_count=execution.FileWalker.THREAD_COUNT):
+        """
+            Brings the index entries of individual paths up to date, for instance as reported by a file system monitor. A
+            path that no longer exists is removed along with anything that was indexed below it, a file is written again and
+            a directory that is not indexed yet is walked. The contents of directories that are already indexed are left
+            alone.
+
+            :param paths: The paths that changed. They must lie within indexed directories.
+            :param thread_count: The number of threads used to walk directories that were added.
+
+            :return: A tuple of the number of files written and the number of files removed.
+            :rtype: tuple
+        """
+        written_count = 0
+        removed_count = 0
+        new_directories = []
+        with self._connection:
+            for path in sorted(set(os.path.abspath(path) for path in paths)):
+                try:
+                    stat_result = os.lstat(path)
+                    if not stat.S_ISDIR(stat_result.st_mode):
+                        stat_result = os.stat(path)
+                except OSError:
+                    stat_result = None
+
+                if stat_result is not None and stat.S_ISDIR(stat_result.st_mode):
+                    removed_count += self._connection.execute("DELETE FROM files WHERE path = ?", (path,)).rowcount
+                    indexed = self._connection.execute("SELECT 1 FROM directories WHERE path = ?", (path,)).fetchone()
+                    if indexed is None and not self._below(path, new_directories):
+                        new_directories.append(path)
+                    continue
+
+                removed_count += self._remove_tree(path)
+                if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", self._file_row(path, stat_result)
+                    )
+                    written_count += 1
+                else:
+                    removed_count += self._connection.execute("DELETE FROM files WHERE path = ?", (path,)).rowcount
+
+            if len(new_directories) != 0:
+                written_count += self._index_trees(new_directories, thread_count)
+        return written_count, removed_count
+
+    def _below(self, path, directories):
+        """
+            Returns whether a path lies below any of the given directories.
+
+            :rtype: bool
+        """
+        for directory in directories:
+            if path.startswith(self._prefix_range(directory)[0]):
+                return True
+        return False
+
+    def directories(self, root):
+        """
+            Returns the indexed directories at and below a directory.
+
+            :rtype: list
+        """
+        root = os.path.abspath(root)
+        lower_bound, upper_bound = self._prefix_range(root)
+        return [
+            row[0] for row in self._connection.execute(
+                "SELECT path FROM directories WHERE path = ? OR (path >= ? AND path < ?)", (root, lower_bound, upper_bound)
+            )
+        ]
+
+    def roots(self):
+        """
+            Returns the directories that were indexed.
+
+            :rtype: list
+        """
+        return [row[0] for row in self._connection.execute("SELECT path FROM roots")]
+
+    def covers(self, path):
+        """
+            Returns whether a path lies within an indexed directory.
+
+            :rtype: bool
+        """
+        path = os.path.abspath(path)
+        roots = self.roots()
+        return path in roots or self._below(path, roots)
+
+    def _evaluate_row(self, evaluator_key, path, size, ctime, mtime, inode, device):
+        """
+            Evaluates a predicate that has no SQL equivalent for a row of the files table.
+        """
+        stat_result = os.stat_result((0, inode, device, 0, 0, 0, size, 0, mtime, ctime))
+        return self._evaluators[evaluator_key](parse.TargetFile(path, stat_result=stat_result))
+
+    def iexecute(self, query, path=os.getcwd(), **execute_arguments):
+        """
+            Executes a query against the index. The query is executed by a live search if it depends on file contents or the
+            path was not indexed.
+
+            :param query: The SearchQuery to execute.
+            :param path: The path to search. Result paths are relative to this path in the same way as for a live search.
+            :param execute_arguments: Additional arguments for SearchQuery.iexecute, used for live searches.
+
+            :return: A generator of SearchResult instances.
+            :rtype: generator
+        """
+        query.prepare(time.time())
+        translator = SQLTranslator(self._evaluator_keys)
+        condition = translator.translate(query)
+        if condition is None or not self.covers(path):
+            return query.iexecute(path, **execute_arguments)
+
+        rows = self._execute_condition(condition, translator, path)
+        if not query.timed:
+            return rows
+
+        # Answering from the index needs no walk, stat or reads, so its time is all spent evaluating the query
+        query.timings = execution.TimingReport() if query.timings is None else query.timings.restart()
+        return query.timings.time_results(rows, phase="evaluate")
+
+    def _execute_condition(self, condition, translator, path):
+        """
+            Runs the SQL condition produced for a query against the index, see .iexecute.
+
+            :return: A generator of SearchResult instances.
+            :rtype: generator
+        """
+        self._evaluators.update(translator.evaluators)
+        absolute_path = os.path.abspath(path)
+        lower_bound, upper_bound = self._prefix_range(absolute_path)
+        try:
+            rows = self._connection.execute(
+                "SELECT path FROM files WHERE (path = ? OR (path >= ? AND path < ?)) AND %s" % condition,
+                [absolute_path, lower_bound, upper_bound] + translator.parameters
+            )
+            for (file_path,) in rows:
+                if file_path == absolute_path:
+                    yield SearchResult(path)
+                else:
+                    yield SearchResult(os.path.join(path, file_path[len(lower_bound):]))
+        finally:
+            for evaluator_key in translator.evaluators:
+                del self._evaluators[evaluator_key]
+
+    def execute(self, query, path=os.getcwd(), **execute_arguments):
+        """
+            Executes a query against the index, see .iexecute.
+
+            :return: A list of SearchResult instances.
+            :rtype: list
+        """
+        return list(self.iexecute(query, path, **execute_arguments))
@@ -0,0 +1,161 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import itertools
+
+import parse
+
+from searchquery import SearchQuery
+
+try:
+    _TEXT_TYPES = (basestring,)
+    _NUMBER_TYPES = (int, long, float)
+except NameError:
+    _TEXT_TYPES = (str,)
+    _NUMBER_TYPES = (int, float)
+
+class SQLTranslator(object):
+    """
+        Translates compiled queries into SQL conditions on the files table of a MetadataIndex. Comparisons of a file attribute
+        against a constant become plain SQL comparisons that can use the indices of the table, while any other metadata
+        predicate is evaluated by calling back into the predicate itself. Queries depending on file contents can not be
+        translated.
+    """
+
+    COLUMNS = {
+        parse.references.FileNameReference: ("basename", _TEXT_TYPES),
+        parse.references.FileExtensionReference: ("extension", _TEXT_TYPES),
+        parse.references.SizeReference: ("size", _NUMBER_TYPES),
+        parse.references.CreationDateReference: ("ctime", _NUMBER_TYPES),
+    }
+    """
+        The columns storing the payload of each reference, along with the constant types the column can be compared with.
+    """
+
+    COMPARISONS = {
+        parse.operators.EqualsOperator: "%s = ?",
+        parse.operators.NotEqualOperator: "%s <> ?",
+        parse.operators.LessThanOperator: "%s < ?",
+        parse.operators.GreaterThanOperator: "%s > ?",
+        parse.operators.ContainsOperator: "instr(%s, ?) > 0",
+    }
+    """
+        The SQL conditions equivalent to each operator, formatted with the column of the left hand side.
+    """
+
+    EVALUATE_FUNCTION = "fssearch_evaluate"
+    """
+        The name of the SQL function used to evaluate predicates that have no SQL equivalent. It receives the number of the
+        predicate followed by the ROW_COLUMNS of the file.
+    """
+
+    ROW_COLUMNS = "path, size, ctime, mtime, inode, device"
+    """
+        The columns a TargetFile is rebuilt from when a predicate is evaluated in Python.
+    """
+
+    parameters = None
+    """
+        The parameters of the last translated condition.
+    """
+
+    evaluators = None
+    """
+        The evaluators of the predicates referenced by EVALUATE_FUNCTION in the last translated condition, keyed by the
+        number passed to the function.
+    """
+
+    def __init__(self, evaluator_keys=None):
+        """
+            Initializes a new SQLTranslator.
+
+            :param evaluator_keys: An iterator producing the numbers that identify predicates evaluated through
+                EVALUATE_FUNCTION. Translators sharing a database connection must share this iterator.
+        """
+        self._evaluator_keys = itertools.count() if evaluator_keys is None else evaluator_keys
+
+    def translate(self, query):
+        """
+            Translates a prepared query into an SQL condition.
+
+            :param query: The SearchQuery to translate. Constant time references must already be resolved with .prepare.
+
+            :return: The SQL condition, or None if the query depends on file contents. The parameters and evaluators of the
+                condition are stored in .parameters and .evaluators.
+        """
+        self.parameters = []
+        self.evaluators = {}
+        return self._translate(query)
+
+    def _translate(self, node):
+        for node_type in type(node).__mro__:
+            if node_type in self.NODE_HANDLERS:
+                return self.NODE_HANDLERS[node_type](self, node)
+        return None
+
+    def translate_query(self, query):
+        deciding_nodes, short_circuit = query.deciding_nodes()
+        if deciding_nodes is None:
+            return None
+
+        conditions = []
+        for node in deciding_nodes:
+            condition = self._translate(node)
+            if condition is None:
+                return None
+            conditions.append(condition)
+        return "(%s)" % (" OR " if short_circuit else " AND ").join(conditions)
+
+    def translate_logical_operator(self, operator):
+        lhs_condition = self._translate(operator.lhs)
+        rhs_condition = self._translate(operator.rhs)
+        if lhs_condition is None or rhs_condition is None:
+            return None
+        return "(%s %s %s)" % (lhs_condition, "OR" if operator.__SHORT_CIRCUIT__ else "AND", rhs_condition)
+
+    def translate_operator(self, operator):
+        if not operator.is_metadata():
+            return None
+
+        column = self.COLUMNS.get(type(operator.lhs))
+        comparison = self.COMPARISONS.get(type(operator))
+        if column is not None and comparison is not None and operator.rhs.__CONSTANT__:
+            column_name, column_types = column
+            value = operator.rhs.payload(None)
+            if isinstance(value, column_types):
+                self.parameters.append(value)
+                return comparison % column_name
+
+        evaluator_key = next(self._evaluator_keys)
+        self.parameters.append(evaluator_key)
+        self.evaluators[evaluator_key] = operator.build_evaluator()
+        return "%s(?, %s)" % (self.EVALUATE_FUNCTION, self.ROW_COLUMNS)
+
+    NODE_HANDLERS = {
+        SearchQuery: translate_query,
+        parse.logic.LogicalOperator: translate_logical_operator,
+        parse.operators.Operator: translate_operator,
+    }
+    """
+        The translation of each node type. Nodes are handled by the entry of the closest class in their hierarchy.
+    """
@@ -0,0 +1,373 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import os
+import time
+import struct
+import sqlite3
+import threading
+import collections
+
+import execution
+
+class TrigramIndex(object):
+    """
+        An index of the three byte sequences (trigrams) occurring in file contents, in the style of Google Code Search. For
+        every trigram the index keeps the list of files containing it, so the files that can contain a literal are found by
+        intersecting the lists of its trigrams. Queries use the literals their content predicates require to skip every
+        indexed file that cannot match, and only the remaining candidates are read and evaluated.
+
+        File lists are stored as ascending document numbers, delta encoded into variable length integers. Files that changed
+        since they were indexed, and files that were not indexed, are always evaluated.
+    """
+
+    DATABASE_PATH = os.path.join(os.path.expanduser("~"), ".fssearch-trigrams.db")
+    """
+        The default location of the index database.
+    """
+
+    SCHEMA_VERSION = 1
+    """
+        The version of the database layout. Databases with a different version are rebuilt from scratch.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS roots (
+            path TEXT PRIMARY KEY,
+            built REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS documents (
+            id INTEGER PRIMARY KEY,
+            path TEXT UNIQUE NOT NULL,
+            size INTEGER NOT NULL,
+            mtime REAL NOT NULL,
+            indexed INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS postings (
+            trigram INTEGER NOT NULL,
+            segment INTEGER NOT NULL,
+            documents BLOB NOT NULL,
+            PRIMARY KEY (trigram, segment)
+        ) WITHOUT ROWID;
+    """
+    """
+        The statements creating the database layout. The documents of a trigram are split into segments, one for every
+        time the postings were flushed while building.
+    """
+
+    MAXIMUM_FILE_SIZE = 16 * 1024 * 1024
+    """
+        The size in bytes above which files are not indexed. Such files are always evaluated.
+    """
+
+    FLUSH_POSTINGS = 8 * 1024 * 1024
+    """
+        The number of postings kept in memory while building before they are written to the database.
+    """
+
+    database_path = None
+    """
+        The path to the index database.
+    """
+
+    def __init__(self, database_path=DATABASE_PATH):
+        """
+            Initializes a new TrigramIndex, creating the database if it does not exist yet.
+
+            :param database_path: The path to the index database.
+        """
+        self.database_path = database_path
+        self._connection = sqlite3.connect(database_path, check_same_thread=False)
+        self._connection.text_factory = str
+
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        with self._connection:
+            if self._connection.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+                self._connection.executescript(
+                    "DROP TABLE IF EXISTS roots; DROP TABLE IF EXISTS documents; DROP TABLE IF EXISTS postings;"
+                )
+                self._connection.execute("PRAGMA user_version = %d" % self.SCHEMA_VERSION)
+            self._connection.executescript(self.SCHEMA)
+
+    def close(self):
+        """
+            Closes the index database.
+        """
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+    @staticmethod
+    def _trigram_key(trigram):
+        """
+            Returns the integer a trigram is stored as.
+
+            :rtype: int
+        """
+        return struct.unpack(">I", b"\0" + trigram)[0]
+
+    @staticmethod
+    def encode_postings(document_ids):
+        """
+            Encodes an ascending list of document numbers as delta encoded variable length integers.
+
+            :rtype: bytearray
+        """
+        data = bytearray()
+        previous_id = 0
+        for document_id in document_ids:
+            delta = document_id - previous_id
+            previous_id = document_id
+            while delta >= 0x80:
+                data.append((delta & 0x7F) | 0x80)
+                delta >>= 7
+            data.append(delta)
+        return data
+
+    @staticmethod
+    def decode_postings(data):
+        """
+            Decodes a list of document numbers encoded by .encode_postings.
+
+            :rtype: list
+        """
+        document_ids = []
+        document_id = 0
+        delta = 0
+        shift = 0
+        for byte in bytearray(data):
+            delta |= (byte & 0x7F) << shift
+            if byte & 0x80:
+                shift += 7
+                continue
+
+            document_id += delta
+            document_ids.append(document_id)
+            delta = 0
+            shift = 0
+        return document_ids
+
+    def _flush(self, postings, segments):
+        """
+            Writes the postings collected while building to the database.
+
+            :param postings: A dictionary mapping trigram keys to ascending lists of document numbers. This is cleared.
+            :param segments: A dictionary mapping trigram keys to the number of segments written for them so far.
+        """
+        rows = []
+        for trigram_key, document_ids in postings.items():
+            segment = segments.get(trigram_key, 0)
+            segments[trigram_key] = segment + 1
+            rows.append((trigram_key, segment, sqlite3.Binary(bytes(self.encode_postings(document_ids)))))
+        self._connection.executemany("INSERT INTO postings VALUES (?, ?, ?)", rows)
+        postings.clear()
+
+    def build(self, roots, thread_count=execution.FileWalker.THREAD_COUNT):
+        """
+            Indexes the contents of all files below the given directories, replacing the previous contents of the index.
+
+            :param roots: A directory or a list of directories to index.
+            :param thread_count: The number of threads used to walk the directories.
+
+            :return: The number of files whose contents were indexed.
+            :rtype: int
+        """
+        roots = [os.path.abspath(root) for root in (roots if type(roots) is list else [roots])]
+        pipeline = execution.SearchPipeline(execution.FileWalker(roots, thread_count=thread_count))
+
+        postings = collections.defaultdict(list)
+        segments = {}
+        posting_count = 0
+        indexed_count = 0
+        try:
+            with self._connection:
+                self._connection.executescript("DELETE FROM roots; DELETE FROM documents; DELETE FROM postings;")
+
+                for document_id, entry in enumerate(pipeline):
+                    try:
+                        stat_result = entry.stat()
+                    except OSError:
+                        continue
+
+                    contents = None
+                    if stat_result.st_size <= self.MAXIMUM_FILE_SIZE:
+                        try:
+                            with open(entry.path, "rb") as handle:
+                                contents = handle.read()
+                        except (IOError, OSError):
+                            pass
+
+                    self._connection.execute(
+                        "INSERT INTO documents VALUES (?, ?, ?, ?, ?)",
+                        (document_id, entry.path, stat_result.st_size, stat_result.st_mtime, contents is not None)
+                    )
+                    if contents is None:
+                        continue
+
+                    trigrams = set(contents[index:index + 3] for index in range(len(contents) - 2))
+                    for trigram in trigrams:
+                        postings[self._trigram_key(trigram)].append(document_id)
+                    posting_count += len(trigrams)
+                    indexed_count += 1
+
+                    if posting_count >= self.FLUSH_POSTINGS:
+                        self._flush(postings, segments)
+                        posting_count = 0
+
+                self._flush(postings, segments)
+                self._connection.executemany("INSERT INTO roots VALUES (?, ?)", [(root, time.time()) for root in roots])
+        finally:
+            pipeline.close()
+        return indexed_count
+
+    def _documents_with(self, trigram):
+        """
+            Returns the set of documents containing a trigram.
+
+            :rtype: set
+        """
+        document_ids = set()
+        for (data,) in self._connection.execute(
+            "SELECT documents FROM postings WHERE trigram = ? ORDER BY segment", (self._trigram_key(trigram),)
+        ):
+            document_ids.update(self.decode_postings(data))
+        return document_ids
+
+    def candidates(self, requirement):
+        """
+            Determines the indexed documents that can satisfy a requirement.
+
+            :param requirement: A requirement in the form described by parse.LiteralExtractor.
+
+            :return: The set of document numbers, or None if the requirement rules out no document.
+        """
+        candidate_ids = set()
+        for literals in requirement:
+            trigrams = set()
+            for literal in literals:
+                trigrams.update(literal[index:index + 3] for index in range(len(literal) - 2))
+
+            # Literals shorter than a trigram say nothing about the documents
+            if len(trigrams) == 0:
+                return None
+
+            alternative_ids = None
+            for trigram in trigrams:
+                trigram_ids = self._documents_with(trigram)
+                alternative_ids = trigram_ids if alternative_ids is None else alternative_ids & trigram_ids
+                if len(alternative_ids) == 0:
+                    break
+            candidate_ids |= alternative_ids
+        return candidate_ids
+
+    def entry_filter(self, query, path):
+        """
+            Builds a filter skipping the files below a directory that the index rules out for a query, for use with
+            SearchQuery.iexecute. The documents are looked up as the walk reaches their directory, so only the documents of
+            the directory each walker thread is listing are held in memory.
+
+            :param query: The SearchQuery to execute.
+            :param path: The directory the query is executed on.
+
+            :return: A callable receiving a DirEntry and returning False if the file cannot match, or None if the index rules
+                out no file.
+        """
+        candidate_ids = self.candidates(query.required_literals())
+        if candidate_ids is None:
+            return None
+
+        absolute_path = os.path.abspath(path)
+        prefix = absolute_path if absolute_path.endswith(os.sep) else absolute_path + os.sep
+        if self._connection.execute(
+            "SELECT 1 FROM documents WHERE indexed AND path >= ? AND path < ? LIMIT 1", (prefix, prefix[:-1] + chr(ord(os.sep) + 1))
+        ).fetchone() is None:
+            return None
+
+        # The walk yields paths below the directory as it was given, the documents are stored with absolute paths
+        relative_start = len(os.path.join(path, ""))
+        lock = threading.Lock()
+        current_directory = threading.local()
+
+        # A walker thread passes all files of a directory before it lists the next one, so every thread only keeps the
+        # documents of its current directory that the index rules out
+        def entry_filter(entry):
+            document_path = prefix + entry.path[relative_start:]
+            directory_prefix = document_path[:document_path.rindex(os.sep) + 1]
+            if getattr(current_directory, "prefix", None) != directory_prefix:
+                with lock:
+                    current_directory.documents = self._directory_documents(directory_prefix, candidate_ids)
+                current_directory.prefix = directory_prefix
+
+            # Only files that are unchanged since they were indexed can be ruled out
+            document = current_directory.documents.get(document_path)
+            if document is None:
+                return True
+
+            stat_result = entry.stat()
+            return document != (stat_result.st_size, stat_result.st_mtime)
+        return entry_filter
+
+    def _directory_documents(self, directory_prefix, candidate_ids):
+        """
+            Returns the indexed documents directly within a directory that are not among the candidates of a query.
+
+            :param directory_prefix: The absolute path of the directory, ending with a separator.
+            :param candidate_ids: The set of candidate document numbers, see .candidates.
+
+            :return: A dict mapping the absolute path of every such document to a tuple (size, mtime).
+            :rtype: dict
+        """
+        documents = {}
+        for document_id, document_path, size, mtime in self._connection.execute(
+            "SELECT id, path, size, mtime FROM documents WHERE indexed AND path >= ? AND path < ? AND instr(substr(path, ?), ?) = 0",
+            (directory_prefix, directory_prefix[:-1] + chr(ord(os.sep) + 1), len(directory_prefix) + 1, os.sep)
+        ):
+            if document_id not in candidate_ids:
+                documents[document_path] = (size, mtime)
+        return documents
+
+    def iexecute(self, query, path=os.getcwd(), **execute_arguments):
+        """
+            Executes a query, reading only the files the index does not rule out.
+
+            :param query: The SearchQuery to execute.
+            :param path: The directory to search.
+            :param execute_arguments: Additional arguments for SearchQuery.iexecute.
+
+            :return: A generator of SearchResult instances.
+            :rtype: generator
+        """
+        return query.iexecute(path, entry_filter=self.entry_filter(query, path), **execute_arguments)
+
+    def execute(self, query, path=os.getcwd(), **execute_arguments):
+        """
+            Executes a query, see .iexecute.
+
+            :return: A list of SearchResult instances.
+            :rtype: list
+        """
+        return list(self.iexecute(query, path, **execute_arguments))
@@ -22,7 +22,11 @@
 """
 
 from .operand import Operand
+from .contentstream import ContentStream
+from .mappedcontents import MappedContents
 from .targetfile import TargetFile
+from .literalextractor import LiteralExtractor
+from .ahocorasick import AhoCorasick
 import data
 import logic
 import suffixes
@@ -0,0 +1,128 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import collections
+
+class AhoCorasick(object):
+    """
+        An Aho-Corasick automaton testing whether bytes contain any of a set of literals in a single pass, regardless of the
+        number of literals.
+
+        The automaton is stored as a dense transition table. Bytes that occur in no literal share a single input class, and
+        the input is mapped to classes with bytes.translate, which keeps the table narrow. Transitions into a state that
+        completes a literal are stored as -1, so the scan loop only does one lookup and one comparison per byte.
+    """
+
+    literals = None
+    """
+        The list of literals searched for.
+    """
+
+    def __init__(self, literals):
+        """
+            Builds the automaton.
+
+            :param literals: A list of non empty bytes literals.
+        """
+        self.literals = literals
+
+        alphabet = sorted(set(byte for literal in literals for byte in bytearray(literal)))
+        classes = bytearray(256)
+        for symbol, byte in enumerate(alphabet):
+            classes[byte] = symbol + 1
+        width = len(alphabet) + 1
+
+        # Build the trie of the literals
+        transitions = [{}]
+        accepting = [False]
+        for literal in literals:
+            state = 0
+            for symbol in bytearray(literal).translate(classes):
+                next_state = transitions[state].get(symbol)
+                if next_state is None:
+                    next_state = len(transitions)
+                    transitions[state][symbol] = next_state
+                    transitions.append({})
+                    accepting.append(False)
+                state = next_state
+            accepting[state] = True
+
+        # Complete the transitions in breadth first order, so the failure state of every state is complete before it
+        table = [0] * (len(transitions) * width)
+        failure = [0] * len(transitions)
+        pending = collections.deque()
+        for symbol, next_state in transitions[0].items():
+            table[symbol] = next_state
+            pending.append(next_state)
+
+        while len(pending) != 0:
+            state = pending.popleft()
+            accepting[state] = accepting[state] or accepting[failure[state]]
+            row = state * width
+            failure_row = failure[state] * width
+            for symbol in range(width):
+                next_state = transitions[state].get(symbol)
+                if next_state is None:
+                    table[row + symbol] = table[failure_row + symbol]
+                else:
+                    failure[next_state] = table[failure_row + symbol]
+                    table[row + symbol] = next_state
+                    pending.append(next_state)
+
+        self._classes = bytes(classes)
+        self._table = [-1 if accepting[next_state] else next_state * width for next_state in table]
+
+    def search(self, data):
+        """
+            Returns whether the data contains any of the literals.
+
+            :param data: The bytes to search.
+
+            :rtype: bool
+        """
+        table = self._table
+        state = 0
+        for symbol in bytearray(data.translate(self._classes)):
+            state = table[state + symbol]
+            if state < 0:
+                return True
+        return False
+
+    def search_chunks(self, chunks):
+        """
+            Returns whether data given in pieces contains any of the literals. The state of the automaton carries over from
+            one piece to the next, so literals spanning two pieces are found as well.
+
+            :param chunks: An iterable of bytes.
+
+            :rtype: bool
+        """
+        table = self._table
+        classes = self._classes
+        state = 0
+        for chunk in chunks:
+            for symbol in bytearray(chunk.translate(classes)):
+                state = table[state + symbol]
+                if state < 0:
+                    return True
+        return False
@@ -0,0 +1,230 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import re
+
+from timeit import default_timer
+
+from .literalextractor import LiteralExtractor
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+class ContentStream(object):
+    """
+        Scans the contents of a file in chunks of a fixed size, so the memory used is bounded by the chunk size rather than
+        by the size of the file. Consecutive chunks are searched with an overlap window that is large enough for a match
+        spanning a chunk boundary to be found in one piece.
+
+        Every search opens the file again, so several predicates can scan the same stream.
+    """
+
+    _LOOKAROUND_OPCODES = set(getattr(sre_parse, name) for name in ("ASSERT", "ASSERT_NOT"))
+    _UNBOUNDED_OPCODES = set(getattr(sre_parse, name) for name in ("GROUPREF", "GROUPREF_EXISTS"))
+
+    path = None
+    """
+        The path to the file scanned.
+    """
+
+    chunk_size = None
+    """
+        The number of bytes read from the file at once.
+    """
+
+    record = None
+    """
+        An optional callable receiving ("read", elapsed, bytes) for every read from the file, see parse.TargetFile.record.
+    """
+
+    def __init__(self, path, chunk_size, record=None):
+        """
+            Initializes a new ContentStream.
+
+            :param path: The path to the file to scan.
+            :param chunk_size: The number of bytes to read from the file at once.
+            :param record: An optional callable receiving ("read", elapsed, bytes) for every read from the file.
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.record = record
+
+    def _reader(self, handle):
+        """
+            Returns the function reading from an open file, which reports every read to .record if one is set.
+        """
+        record = self.record
+        if record is None:
+            return handle.read
+
+        def read(size):
+            start_time = default_timer()
+            data = handle.read(size)
+            record("read", default_timer() - start_time, len(data))
+            return data
+        return read
+
+    @classmethod
+    def _items(cls, parsed):
+        """
+            Yields the (opcode, argument) items of a parsed expression, including those of nested expressions.
+        """
+        if isinstance(parsed, sre_parse.SubPattern):
+            for opcode, argument in parsed:
+                yield opcode, argument
+                for item in cls._items(argument):
+                    yield item
+        elif isinstance(parsed, (tuple, list)):
+            for element in parsed:
+                for item in cls._items(element):
+                    yield item
+
+    @classmethod
+    def measure(cls, pattern, flags=0):
+        """
+            Determines what a chunked search for a regular expression has to take into account.
+
+            :param pattern: The regular expression, as bytes or text.
+            :param flags: The re flags the expression is compiled with.
+
+            :return: The length of the longest possible match, or None if the expression cannot be searched in chunks
+                because it looks around its match or its matches have no maximum length.
+            :rtype: int
+        """
+        try:
+            parsed = sre_parse.parse(pattern, flags)
+        except (re.error, OverflowError, RuntimeError):
+            return None
+
+        for opcode, _ in cls._items(parsed):
+            if opcode in cls._LOOKAROUND_OPCODES or opcode in cls._UNBOUNDED_OPCODES:
+                return None
+
+        maximum_width = parsed.getwidth()[1]
+        if maximum_width >= sre_parse.MAXREPEAT:
+            return None
+        return maximum_width
+
+    def windows(self, overlap=0):
+        """
+            Iterates the contents in chunks, each preceded by the last bytes of the one before.
+
+            :param overlap: The number of bytes of the previous chunk to repeat at the start of the next. A literal of up
+                to overlap + 1 bytes is contained in one of the windows if it occurs in the file.
+
+            :return: A generator of bytes.
+            :rtype: generator
+        """
+        with open(self.path, "rb") as handle:
+            read = self._reader(handle)
+            window = b""
+            chunk = read(self.chunk_size)
+            while len(chunk) != 0:
+                window = (window[max(0, len(window) - overlap):] if overlap > 0 else b"") + chunk
+                yield window
+                chunk = read(self.chunk_size)
+
+    def find_sequence(self, literals, prefix=b"", stop=None):
+        """
+            Returns whether the contents start with a prefix and contain the given literals one after another without
+            overlapping. This is exact whatever the chunk size.
+
+            :param literals: The list of literals to find, in order.
+            :param prefix: The literal the contents must start with.
+            :param stop: An optional byte that must not occur between the prefix and the end of the last literal.
+
+            :rtype: bool
+        """
+        with open(self.path, "rb") as handle:
+            read = self._reader(handle)
+            if len(prefix) != 0 and read(len(prefix)) != prefix:
+                return False
+
+            buffer = b""
+            offset = 0
+            for literal in literals:
+                if len(literal) == 0:
+                    continue
+
+                position = buffer.find(literal, offset)
+                while position == -1:
+                    if stop is not None and buffer.find(stop, offset) != -1:
+                        return False
+
+                    chunk = read(self.chunk_size)
+                    if len(chunk) == 0:
+                        return False
+
+                    # Only the bytes the literal could still begin in are kept
+                    buffer = buffer[max(offset, len(buffer) - len(literal) + 1):] + chunk
+                    offset = 0
+                    position = buffer.find(literal)
+                if stop is not None and buffer.find(stop, offset, position + len(literal)) != -1:
+                    return False
+                offset = position + len(literal)
+        return True
+
+    def search(self, pattern, measurement, requirement=LiteralExtractor.NOTHING):
+        """
+            Returns whether a regular expression matches anywhere in the contents.
+
+            Every chunk is searched together with the byte before it and the following bytes a match starting in the chunk
+            can extend over, so anchors and boundaries see the same context as in the whole file. This is exact, as only
+            expressions whose matches have a maximum length are searched in chunks.
+
+            :param pattern: The compiled regular expression.
+            :param measurement: The result of .measure for the expression.
+            :param requirement: The literals a match must contain, as produced by a LiteralExtractor. Parts of the file
+                that do not satisfy it are not searched.
+
+            :return: Whether the expression matches, or None if it cannot be searched in chunks, in which case the whole
+                contents have to be searched.
+        """
+        # A match without a maximum length can span any number of chunks
+        if measurement is None:
+            return None
+
+        chunk_size = self.chunk_size
+        # "$" also matches before a newline that ends the searched bytes, so it must see two bytes past the match
+        extension = measurement + 1
+
+        satisfies = LiteralExtractor.satisfies
+        with open(self.path, "rb") as handle:
+            read = self._reader(handle)
+            buffer = read(chunk_size + extension)
+            start = 0
+            while True:
+                final = len(buffer) < start + chunk_size + extension
+                match = None
+                if satisfies(requirement, buffer):
+                    match = pattern.search(buffer, start)
+                if match is not None and (final or match.start() < start + chunk_size):
+                    return True
+                elif final:
+                    return False
+
+                # The byte before the next chunk is kept, so anchors and word boundaries at its start see it
+                buffer = buffer[start + chunk_size - 1:] + read(chunk_size)
+                start = 1
@@ -24,4 +24,4 @@
 import parse
 
 class DataElement(parse.Operand):
-    pass
+    __CONSTANT__ = True
@@ -24,6 +24,8 @@
 from .dataelement import DataElement
 
 class Number(DataElement):
+    __SERIALIZED__ = ("number", "suffix")
+
     suffix = None
     """
         The suffix that was supplied.
@@ -38,5 +40,8 @@ class Number(DataElement):
         self.suffix = suffix
         self.number = float(number)
 
+    def describe(self):
+        return "%g" % self.number if self.suffix is None else "%g %s" % (self.number, self.suffix.__TOKEN__)
+
     def payload(self, target_file):
         return self.number if self.suffix is None else self.suffix.mutate(self.number)
@@ -24,6 +24,8 @@
 from .dataelement import DataElement
 
 class String(DataElement):
+    __SERIALIZED__ = ("string",)
+
     string = None
     """
         The string data that was supplied.
@@ -32,5 +34,8 @@ class String(DataElement):
     def __init__(self, string):
         self.string = string
 
+    def describe(self):
+        return '"%s"' % self.string
+
     def payload(self, target_file):
         return self.string
@@ -0,0 +1,215 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import re
+import itertools
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+class LiteralExtractor(object):
+    """
+        Determines the literal strings that text must contain for a regular expression to match it, by walking the parsed
+        form of the expression.
+
+        Requirements are given in disjunctive normal form: a list of alternatives, each being a list of literals that must
+        all be present. Text can only match if it satisfies at least one alternative, and [[]] states that nothing is
+        required. Requirements may be weaker than the expression, but never stronger.
+    """
+
+    MAXIMUM_EXACT = 16
+    """
+        The maximum number of strings tracked for a part of the expression that can only match a fixed set of strings.
+    """
+
+    MAXIMUM_ALTERNATIVES = 16
+    """
+        The maximum number of alternatives in a requirement. Larger requirements are weakened.
+    """
+
+    NOTHING = [[]]
+    """
+        The requirement that is always satisfied.
+    """
+
+    _SEQUENCE_OPCODES = set(
+        getattr(sre_parse, name) for name in ("SUBPATTERN", "ATOMIC_GROUP") if hasattr(sre_parse, name)
+    )
+    _REPEAT_OPCODES = set(
+        getattr(sre_parse, name) for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT") if hasattr(sre_parse, name)
+    )
+
+    @classmethod
+    def conjunction(cls, lhs, rhs):
+        """
+            Combines two requirements that must both be satisfied.
+        """
+        if lhs == cls.NOTHING:
+            return rhs
+        if rhs == cls.NOTHING or len(lhs) * len(rhs) > cls.MAXIMUM_ALTERNATIVES:
+            return lhs
+        return [lhs_literals + rhs_literals for lhs_literals, rhs_literals in itertools.product(lhs, rhs)]
+
+    @classmethod
+    def disjunction(cls, lhs, rhs):
+        """
+            Combines two requirements of which either must be satisfied.
+        """
+        if [] in lhs or [] in rhs or len(lhs) + len(rhs) > cls.MAXIMUM_ALTERNATIVES:
+            return cls.NOTHING
+        return lhs + rhs
+
+    @classmethod
+    def satisfies(cls, requirement, text):
+        """
+            Returns whether text satisfies a requirement.
+
+            :rtype: bool
+        """
+        for literals in requirement:
+            for literal in literals:
+                if literal not in text:
+                    break
+            else:
+                return True
+        return False
+
+    def extract(self, pattern, flags=0):
+        """
+            Determines the literals text must contain for a regular expression to match it.
+
+            :param pattern: The regular expression, as text or bytes.
+            :param flags: The flags the expression is compiled with.
+
+            :return: The requirement, see the class description.
+            :rtype: list
+        """
+        try:
+            parsed = sre_parse.parse(pattern, flags)
+        except (re.error, OverflowError, RuntimeError):
+            return self.NOTHING
+
+        state = getattr(parsed, "state", None) or parsed.pattern
+        if (flags | state.flags) & re.IGNORECASE:
+            return self.NOTHING
+
+        if type(pattern) is bytes:
+            self._character = chr if bytes is str else lambda code: bytes((code,))
+        else:
+            self._character = chr if str is not bytes else unichr
+        self._empty = pattern[:0]
+
+        exact, requirement = self._sequence(parsed)
+        if exact is not None:
+            return self._any_of(exact)
+        return requirement
+
+    def _any_of(self, exact):
+        """
+            Returns the requirement of text containing any of a set of strings.
+        """
+        if self._empty in exact or len(exact) > self.MAXIMUM_ALTERNATIVES:
+            return self.NOTHING
+        return [[string] for string in sorted(exact)]
+
+    def _sequence(self, subpattern):
+        """
+            Analyses a sequence of expression items.
+
+            :return: A tuple of the set of strings the sequence matches exactly, or None if that is not known, and the
+                requirement of the sequence when its exact strings are not known.
+            :rtype: tuple
+        """
+        # Runs of items with known strings are joined into longer literals
+        current = set([self._empty])
+        requirement = self.NOTHING
+        complete = True
+        for opcode, argument in subpattern:
+            exact, item_requirement = self._item(opcode, argument)
+            if exact is not None and len(current) * len(exact) <= self.MAXIMUM_EXACT:
+                current = set(prefix + suffix for prefix in current for suffix in exact)
+                continue
+
+            complete = False
+            requirement = self.conjunction(requirement, self._any_of(current))
+            if exact is not None:
+                current = exact
+            else:
+                requirement = self.conjunction(requirement, item_requirement)
+                current = set([self._empty])
+
+        if complete:
+            return current, self.NOTHING
+        return None, self.conjunction(requirement, self._any_of(current))
+
+    def _fold(self, exact, requirement):
+        """
+            Returns the requirement of an item.
+        """
+        return requirement if exact is None else self._any_of(exact)
+
+    def _item(self, opcode, argument):
+        """
+            Analyses a single expression item, see ._sequence.
+        """
+        if opcode is sre_parse.LITERAL:
+            return set([self._character(argument)]), self.NOTHING
+        elif opcode is sre_parse.AT:
+            return set([self._empty]), self.NOTHING
+        elif opcode is sre_parse.IN:
+            if len(argument) <= self.MAXIMUM_EXACT and all(item_opcode is sre_parse.LITERAL for item_opcode, _ in argument):
+                return set(self._character(code) for _, code in argument), self.NOTHING
+        elif opcode in self._SEQUENCE_OPCODES:
+            if opcode is sre_parse.SUBPATTERN and len(argument) == 4 and argument[1] & re.IGNORECASE:
+                return None, self.NOTHING
+            return self._sequence(argument[-1])
+        elif opcode is sre_parse.BRANCH:
+            branches = [self._sequence(branch) for branch in argument[1]]
+            if all(exact is not None for exact, _ in branches):
+                exact = set().union(*[exact for exact, _ in branches])
+                if len(exact) <= self.MAXIMUM_EXACT:
+                    return exact, self.NOTHING
+
+            requirement = self._fold(*branches[0])
+            for branch in branches[1:]:
+                requirement = self.disjunction(requirement, self._fold(*branch))
+            return None, requirement
+        elif opcode in self._REPEAT_OPCODES:
+            minimum, maximum, item = argument
+            if minimum == 0:
+                return (set([self._empty]) if maximum == 0 else None), self.NOTHING
+
+            exact, requirement = self._sequence(item)
+            if exact is None or len(exact) ** minimum > self.MAXIMUM_EXACT:
+                return None, self._fold(exact, requirement)
+
+            # Every match contains the item repeated at least the minimum number of times in a row
+            repeated = set([self._empty])
+            for _ in range(minimum):
+                repeated = set(prefix + suffix for prefix in repeated for suffix in exact)
+            if minimum == maximum:
+                return repeated, self.NOTHING
+            return None, self._any_of(repeated)
+        return None, self.NOTHING
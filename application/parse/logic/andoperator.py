@@ -20,13 +20,36 @@
     with this program; if not, write to the Free Software Foundation, Inc.,
     51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 """
+import parse
+
 from .logicaloperator import LogicalOperator
 
 class AndOperator(LogicalOperator):
     __TOKEN__ = "AND"
     __SHORT_CIRCUIT__ = False
+    __PRECEDENCE__ = 2
 
     def evaluate(self, target_file, rhs=None):
         if rhs is not None:
             return target_file and rhs
         return self.lhs.evaluate(target_file) and self.rhs.evaluate(target_file)
+
+    def build_evaluator(self):
+        lhs_evaluator = self.lhs.build_evaluator()
+        rhs_evaluator = self.rhs.build_evaluator()
+        return lambda target_file: lhs_evaluator(target_file) and rhs_evaluator(target_file)
+
+    def prefilter(self, target_file):
+        lhs = self.lhs.prefilter(target_file)
+        if lhs is False:
+            return False
+
+        rhs = self.rhs.prefilter(target_file)
+        if rhs is False:
+            return False
+        if lhs is True and rhs is True:
+            return True
+        return None
+
+    def required_literals(self):
+        return parse.LiteralExtractor.conjunction(self.lhs.required_literals(), self.rhs.required_literals())
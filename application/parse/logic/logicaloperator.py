@@ -28,5 +28,64 @@ class LogicalOperator(object):
         no short circuit behavior.
     """
 
+    __PRECEDENCE__ = 0
+    """
+        How tightly this logical operator binds its operands. Operators of higher precedence are grouped first, so that
+        "a OR b AND c" is parsed as "a OR (b AND c)".
+    """
+
     def evaluate(self, target_file, rhs=None):
         raise NotImplementedError(".evaluate not implemented.")
+
+    def cost(self):
+        """
+            Returns the estimated relative cost of evaluating both operands of this logical operator for one file.
+
+            :rtype: int
+        """
+        return self.lhs.cost() + self.rhs.cost()
+
+    def optimize(self):
+        """
+            Optimizes both operands and then orders them so the cheaper one is evaluated first. Predicates have no side
+            effects, so swapping the operands of AND and OR does not change the result.
+        """
+        self.lhs.optimize()
+        self.rhs.optimize()
+
+        if self.rhs.cost() < self.lhs.cost():
+            self.lhs, self.rhs = self.rhs, self.lhs
+
+    def build_evaluator(self):
+        """
+            Returns a callable evaluating this logical operator for a TargetFile, built from the evaluators of its operands.
+
+            :rtype: callable
+        """
+        raise NotImplementedError(".build_evaluator not implemented.")
+
+    def is_metadata(self):
+        """
+            Returns whether both operands of this logical operator can be evaluated from file metadata alone.
+
+            :rtype: bool
+        """
+        return self.lhs.is_metadata() and self.rhs.is_metadata()
+
+    def prefilter(self, target_file):
+        """
+            Evaluates this logical operator using three valued logic, where None stands for a result that depends on the file
+            contents. A True or False result is guaranteed to be what .evaluate would return.
+
+            :param target_file: The TargetFile instance to evaluate. Its contents are never accessed.
+        """
+        raise NotImplementedError(".prefilter not implemented.")
+
+    def required_literals(self):
+        """
+            Returns the literals the file contents must contain for this logical operator to be true, as a requirement in the
+            form described by parse.LiteralExtractor.
+
+            :rtype: list
+        """
+        raise NotImplementedError(".required_literals not implemented.")
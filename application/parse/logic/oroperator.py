@@ -21,13 +21,36 @@
     51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 """
 
+import parse
+
 from .logicaloperator import LogicalOperator
 
 class OrOperator(LogicalOperator):
     __TOKEN__ = "OR"
     __SHORT_CIRCUIT__ = True
+    __PRECEDENCE__ = 1
 
     def evaluate(self, target_file, rhs=None):
         if rhs is not None:
             return target_file or rhs
         return self.lhs.evaluate(target_file) or self.rhs.evaluate(target_file)
+
+    def build_evaluator(self):
+        lhs_evaluator = self.lhs.build_evaluator()
+        rhs_evaluator = self.rhs.build_evaluator()
+        return lambda target_file: lhs_evaluator(target_file) or rhs_evaluator(target_file)
+
+    def prefilter(self, target_file):
+        lhs = self.lhs.prefilter(target_file)
+        if lhs is True:
+            return True
+
+        rhs = self.rhs.prefilter(target_file)
+        if rhs is True:
+            return True
+        if lhs is False and rhs is False:
+            return False
+        return None
+
+    def required_literals(self):
+        return parse.LiteralExtractor.disjunction(self.lhs.required_literals(), self.rhs.required_literals())
@@ -0,0 +1,85 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import sys
+import mmap
+
+class MappedContents(mmap.mmap):
+    """
+        The contents of a file mapped into memory read only. Regular expressions and the find methods scan the mapping in
+        place, without copying the file into a bytes object.
+
+        A plain mmap object only accepts single bytes with "in" and compares by identity, so this implements the other
+        operations predicates apply to file contents the way bytes do. Comparisons and translate work on a copy.
+    """
+
+    SEARCH_WINDOW = 256 * 1024
+    """
+        The size of the pieces the contents are searched in on Python 2, see .find.
+    """
+
+    if sys.version_info[0] < 3:
+        def find(self, literal, start=0, end=None):
+            """
+                Returns the lowest index at which the literal is found, or -1. mmap.find is a naive loop on Python 2, so
+                the contents are searched with bytes.find through copies of SEARCH_WINDOW bytes, which stay in the cache.
+            """
+            start, end, _ = slice(start, end).indices(len(self))
+            position = start
+            while position + len(literal) <= end:
+                index = self[position:min(end, position + self.SEARCH_WINDOW + len(literal) - 1)].find(literal)
+                if index != -1:
+                    return position + index
+                position += self.SEARCH_WINDOW
+            return -1
+
+    def __contains__(self, literal):
+        return self.find(literal) != -1
+
+    def startswith(self, prefix):
+        return self[:len(prefix)] == prefix
+
+    def translate(self, table):
+        return self[:].translate(table)
+
+    def __eq__(self, other):
+        if isinstance(other, bytes) and len(other) != len(self):
+            return False
+        return self[:] == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __lt__(self, other):
+        return self[:] < other
+
+    def __gt__(self, other):
+        return self[:] > other
+
+    def __le__(self, other):
+        return self[:] <= other
+
+    def __ge__(self, other):
+        return self[:] >= other
+
+    __hash__ = None
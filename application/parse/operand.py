@@ -27,6 +27,61 @@ class Operand(object):
         the operators that are used to produce search results on a per-file basis.
     """
 
+    __METADATA__ = True
+    """
+        Whether the payload of this operand can be produced from the file path and stat information alone, without
+        reading the file contents.
+    """
+
+    __COST__ = 0
+    """
+        The estimated relative cost of producing the payload of this operand for one file. Constants are free, path
+        derived payloads are cheap, stat fields are more expensive and file contents are by far the most expensive.
+    """
+
+    __STREAMABLE__ = False
+    """
+        Whether the payload of this operand is the file contents, which predicates that support it scan in chunks through
+        TargetFile.stream when the file is large.
+    """
+
+    __CONSTANT__ = False
+    """
+        Whether the payload of this operand is the same for every file, so that it can be bound once when the query is
+        compiled into an evaluator.
+    """
+
+    __SERIALIZED__ = ()
+    """
+        The names of the attributes making up the stable serialized form of this operand, see SearchQuery.serialize. Any other
+        state is derived from these when the query is optimized.
+    """
+
+    def describe(self):
+        """
+            Returns a description of this operand in the query syntax, for reports such as the profile of an execution.
+
+            :rtype: str
+        """
+        return type(self).__name__
+
+    def build_payload(self):
+        """
+            Returns a callable producing the payload of this operand for a TargetFile. This is used when compiling a query
+            into an evaluator and may be overridden to avoid the method call overhead of .payload.
+
+            :rtype: callable
+        """
+        return self.payload
+
+    def prepare(self, execution_time):
+        """
+            Called once when a query starts executing, so that operands depending on the current time can resolve it once
+            instead of for every file.
+
+            :param execution_time: The time the execution started at, as seconds since the epoch.
+        """
+
     def payload(self, target_file):
         """
             Returns the payload associated with this operand.
@@ -9,6 +9,7 @@ from .containsoperator import ContainsOperator
 from .lessthanoperator import LessThanOperator
 from .notequaloperator import NotEqualOperator
 from .greaterthanoperator import GreaterThanOperator
+from .containsanyoperator import ContainsAnyOperator
 from .matchespatternoperator import MatchesPatternOperator
 from .containspatternoperator import ContainsPatternOperator
 from .containswildcardoperator import ContainsWildcardOperator
@@ -0,0 +1,150 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import parse
+
+from .containsoperator import ContainsOperator
+
+class ContainsAnyOperator(ContainsOperator):
+    """
+        Tests whether the left hand side contains any of several literals. The query planner puts this in place of a group of
+        CONTAINS predicates on the same reference that are combined with OR. Groups of at least AHO_CORASICK_THRESHOLD
+        literals are searched with an Aho-Corasick automaton in a single pass. Smaller groups are searched with one substring
+        search per literal, so they still cost about as much as the separate predicates: the automaton is written in Python
+        and only outruns the native substring searches from about a hundred literals on, see benchmarks/contains.py.
+
+        This is never produced by the compiler directly.
+    """
+
+    AHO_CORASICK_THRESHOLD = 112
+    """
+        The number of literals from which the group is searched with an Aho-Corasick automaton. Below this, the scan time
+        grows linearly with the number of literals.
+    """
+
+    __SERIALIZED__ = ContainsOperator.__SERIALIZED__ + ("operators",)
+
+    operators = None
+    """
+        The list of ContainsOperator instances this operator replaces.
+    """
+
+    matcher = None
+    """
+        The matching function built from the literals. This is built once by .optimize.
+    """
+
+    stream_matcher = None
+    """
+        The matching function built from the literals for a parse.ContentStream. This is built once by .optimize.
+    """
+
+    def __init__(self, operators):
+        """
+            Initializes a new ContainsAnyOperator.
+
+            :param operators: The list of ContainsOperator instances to replace. They must share their left hand side
+                reference and have constant right hand sides.
+        """
+        self.operators = operators
+        self.lhs = operators[0].lhs
+        self.rhs = operators[0].rhs
+
+    def literals(self):
+        """
+            Returns the list of literals searched for.
+
+            :rtype: list
+        """
+        return [operator.pattern_source() for operator in self.operators]
+
+    def describe(self):
+        return "%s CONTAINS ANY OF (%s)" % (self.lhs.describe(), ", ".join(operator.rhs.describe() for operator in self.operators))
+
+    def cost(self):
+        return sum(operator.cost() for operator in self.operators[:self.AHO_CORASICK_THRESHOLD])
+
+    def _build_matchers(self):
+        """
+            Builds the functions testing whether a payload, or the contents scanned by a parse.ContentStream, contain any of
+            the literals.
+
+            :return: A tuple (matcher, stream_matcher).
+            :rtype: tuple
+        """
+        literals = self.literals()
+        if any(len(literal) == 0 for literal in literals):
+            return (lambda payload: True), (lambda stream: True)
+
+        if len(literals) >= self.AHO_CORASICK_THRESHOLD and all(isinstance(literal, bytes) for literal in literals):
+            automaton = parse.AhoCorasick(literals)
+            return automaton.search, lambda stream: automaton.search_chunks(stream.windows())
+
+        def matcher(payload):
+            for literal in literals:
+                if literal in payload:
+                    return True
+            return False
+
+        overlap = max(len(literal) for literal in literals) - 1
+        def stream_matcher(stream):
+            for window in stream.windows(overlap):
+                if matcher(window):
+                    return True
+            return False
+        return matcher, stream_matcher
+
+    def optimize(self):
+        self.matcher, self.stream_matcher = self._build_matchers()
+
+    def evaluate(self, target_file):
+        if self.matcher is None:
+            self.optimize()
+        if self.lhs.__STREAMABLE__ and target_file.streamed:
+            return self.stream_matcher(target_file.stream())
+        return self.matcher(self.lhs.payload(target_file))
+
+    def build_evaluator(self):
+        if self.matcher is None:
+            self.optimize()
+
+        matcher = self.matcher
+        stream_matcher = self.stream_matcher
+        lhs_payload = self.lhs.build_payload()
+        return self.build_streaming_evaluator(
+            lambda target_file: matcher(lhs_payload(target_file)),
+            lambda target_file: stream_matcher(target_file.stream()),
+        )
+
+    def required_literals(self):
+        requirement = self.operators[0].required_literals()
+        for operator in self.operators[1:]:
+            requirement = parse.LiteralExtractor.disjunction(requirement, operator.required_literals())
+        return requirement
+
+    def __getstate__(self):
+        # The matchers are closures or bound methods, which cannot be pickled. They are rebuilt on first use.
+        state = self.__dict__.copy()
+        state.pop("matcher", None)
+        state.pop("stream_matcher", None)
+        return state
@@ -25,6 +25,30 @@ from .operator import Operator
 
 class ContainsOperator(Operator):
     __TOKEN__ = "CONTAINS"
+    __COST__ = 1
 
     def evaluate(self, target_file):
+        if self.lhs.__STREAMABLE__ and target_file.streamed:
+            return target_file.stream().find_sequence([self.rhs.payload(target_file)])
         return self.rhs.payload(target_file) in self.lhs.payload(target_file)
+
+    def required_literals(self):
+        if self.lhs.__METADATA__ or not self.rhs.__CONSTANT__ or len(self.pattern_source()) == 0:
+            return super(ContainsOperator, self).required_literals()
+        return [[self.pattern_source()]]
+
+    def build_evaluator(self):
+        lhs_payload = self.lhs.build_payload()
+        if self.rhs.__CONSTANT__:
+            rhs_value = self.rhs.payload(None)
+            literals = [self.pattern_source()]
+            return self.build_streaming_evaluator(
+                lambda target_file: rhs_value in lhs_payload(target_file),
+                lambda target_file: target_file.stream().find_sequence(literals),
+            )
+
+        rhs_payload = self.rhs.build_payload()
+        return self.build_streaming_evaluator(
+            lambda target_file: rhs_payload(target_file) in lhs_payload(target_file),
+            lambda target_file: target_file.stream().find_sequence([rhs_payload(target_file)]),
+        )
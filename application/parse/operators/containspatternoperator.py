@@ -23,10 +23,99 @@
 
 import re
 
+import parse
+
 from .operator import Operator
 
 class ContainsPatternOperator(Operator):
     __TOKEN__ = "CONTAINS PATTERN"
+    __COST__ = 4
+
+    pattern = None
+    """
+        The compiled right hand side pattern. This is compiled once by .optimize when the right hand side is a constant.
+    """
+
+    requirement = None
+    """
+        The literals the left hand side must contain for the pattern to match, in the form described by
+        parse.LiteralExtractor. This is determined once by .optimize when the right hand side is a constant.
+    """
+
+    measurement = None
+    """
+        What a search of the file contents in chunks has to take into account for the pattern, see
+        parse.ContentStream.measure. This is determined once by .optimize when the left hand side is the file contents.
+    """
+
+    def optimize(self):
+        pattern_source = self.pattern_source()
+        if pattern_source is not None:
+            self.pattern = re.compile(pattern_source)
+            if self.lhs.__STREAMABLE__:
+                self.measurement = parse.ContentStream.measure(pattern_source)
+
+            # Longer literals are less likely to occur, so they are searched for first
+            self.requirement = [
+                sorted(literals, key=len, reverse=True) for literals in parse.LiteralExtractor().extract(pattern_source)
+            ]
+
+    def _build_matcher(self):
+        """
+            Builds a function searching a payload for the pattern. The literals the pattern requires are looked for with
+            plain substring searches first, so the regular expression engine only runs on payloads that contain them.
+
+            :rtype: callable
+        """
+        search = self.pattern.search
+        requirement = self.requirement
+        if requirement == parse.LiteralExtractor.NOTHING:
+            return lambda payload: search(payload) is not None
+
+        if len(requirement) == 1 and len(requirement[0]) == 1:
+            literal = requirement[0][0]
+            return lambda payload: literal in payload and search(payload) is not None
+
+        satisfies = parse.LiteralExtractor.satisfies
+        return lambda payload: satisfies(requirement, payload) and search(payload) is not None
+
+    def _search_stream(self, target_file):
+        """
+            Searches the contents of a file for the pattern in chunks. Patterns that cannot be searched in chunks are
+            searched in the whole contents.
+
+            :param target_file: The TargetFile to search.
+
+            :rtype: bool
+        """
+        result = target_file.stream().search(self.pattern, self.measurement, self.requirement)
+        if result is None:
+            payload = target_file.contents
+            return parse.LiteralExtractor.satisfies(self.requirement, payload) and self.pattern.search(payload) is not None
+        return result
+
+    def required_literals(self):
+        if self.lhs.__METADATA__ or not self.rhs.__CONSTANT__:
+            return super(ContainsPatternOperator, self).required_literals()
+        if self.requirement is None:
+            self.optimize()
+        return self.requirement
 
     def evaluate(self, target_file):
+        if self.pattern is not None:
+            if self.lhs.__STREAMABLE__ and target_file.streamed:
+                return self._search_stream(target_file)
+
+            payload = self.lhs.payload(target_file)
+            return parse.LiteralExtractor.satisfies(self.requirement, payload) and self.pattern.search(payload) is not None
         return re.search(self.rhs.payload(target_file), self.lhs.payload(target_file)) is not None
+
+    def build_evaluator(self):
+        if self.pattern is None:
+            self.optimize()
+        if self.pattern is None:
+            return self.evaluate
+
+        matcher = self._build_matcher()
+        lhs_payload = self.lhs.build_payload()
+        return self.build_streaming_evaluator(lambda target_file: matcher(lhs_payload(target_file)), self._search_stream)
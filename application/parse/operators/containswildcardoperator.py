@@ -23,13 +23,169 @@
 
 import re
 
+import parse
+
 from .operator import Operator
 
 class ContainsWildcardOperator(Operator):
+    """
+        Matches the start of the left hand side against a pattern where '*' stands for any sequence of characters within a
+        line. Each '*' is translated to '.*?' and the rest of the pattern is a regular expression. Patterns without any other
+        regular expression syntax are matched with startswith and find on the first line instead of the regex engine.
+    """
+
     __TOKEN__ = "CONTAINS WILDCARD"
+    __COST__ = 2
+
+    METACHARACTERS = ".^$+?{}[]\\|()\n"
+    """
+        The characters besides '*' that are regular expression syntax. A newline is included because the literal matcher
+        only searches the first line.
+    """
+
+    matcher = None
+    """
+        The matching function built from the right hand side. This is built once by .optimize when the right hand side is a
+        constant.
+    """
+
+    pattern = None
+    """
+        The translated right hand side anchored at the start of the contents, for searching the contents in chunks. This is
+        compiled once by .optimize when the left hand side is the file contents and the pattern is not a plain literal.
+    """
+
+    measurement = None
+    """
+        What a search of the file contents in chunks has to take into account for .pattern, see
+        parse.ContentStream.measure.
+    """
+
+    def _translate(self, pattern):
+        """
+            Translates a wildcard pattern into a regular expression.
+
+            :param pattern: The wildcard pattern, as bytes or text.
+        """
+        if isinstance(pattern, bytes):
+            return pattern.replace(b"*", b".*?")
+        return pattern.replace(u"*", u".*?")
+
+    def _is_literal(self, pattern):
+        """
+            Returns whether a wildcard pattern contains no regular expression syntax besides '*'.
+
+            :param pattern: The wildcard pattern, as bytes or text.
+
+            :rtype: bool
+        """
+        text = pattern.decode("latin-1") if isinstance(pattern, bytes) else pattern
+        return not any(character in text for character in self.METACHARACTERS)
+
+    def _split(self, pattern):
+        """
+            Splits a literal wildcard pattern into the literal the payload must start with and the literals that must follow
+            it in order.
+
+            :param pattern: The wildcard pattern, as bytes or text.
+
+            :return: A tuple (prefix, literals).
+            :rtype: tuple
+        """
+        segments = pattern.split(b"*" if isinstance(pattern, bytes) else u"*")
+        return segments[0], [segment for segment in segments[1:] if len(segment) != 0]
+
+    def _build_matcher(self, pattern):
+        """
+            Builds a function testing whether a payload starts with the given wildcard pattern.
+
+            :param pattern: The wildcard pattern, as bytes or text.
+
+            :rtype: callable
+        """
+        if not self._is_literal(pattern):
+            match = re.compile(self._translate(pattern)).match
+            return lambda payload: match(payload) is not None
+
+        prefix, literals = self._split(pattern)
+        if len(literals) == 0:
+            return lambda payload: payload.startswith(prefix)
+
+        # '.*?' does not match newlines, so the literals must all follow the prefix on the first line
+        newline = b"\n" if isinstance(pattern, bytes) else u"\n"
+        def matcher(payload):
+            if not payload.startswith(prefix):
+                return False
+
+            position = len(prefix)
+            end = payload.find(newline, position)
+            if end == -1:
+                end = len(payload)
+            for literal in literals:
+                position = payload.find(literal, position, end)
+                if position == -1:
+                    return False
+                position += len(literal)
+            return True
+        return matcher
+
+    def _search_stream(self, target_file):
+        """
+            Matches the contents of a file in chunks. Patterns that cannot be searched in chunks are matched against the
+            whole contents.
+
+            :param target_file: The TargetFile to match.
+
+            :rtype: bool
+        """
+        if self.pattern is None:
+            prefix, literals = self._split(self.pattern_source())
+            return target_file.stream().find_sequence(literals, prefix, stop=b"\n")
+
+        result = target_file.stream().search(self.pattern, self.measurement)
+        if result is None:
+            return self.matcher(target_file.contents)
+        return result
+
+    def required_literals(self):
+        if self.lhs.__METADATA__ or not self.rhs.__CONSTANT__ or not self._is_literal(self.pattern_source()):
+            return super(ContainsWildcardOperator, self).required_literals()
+
+        pattern = self.pattern_source()
+        literals = [segment for segment in pattern.split(b"*" if isinstance(pattern, bytes) else u"*") if len(segment) != 0]
+        return [literals]
+
+    def optimize(self):
+        pattern_source = self.pattern_source()
+        if pattern_source is not None:
+            self.matcher = self._build_matcher(pattern_source)
+            if self.lhs.__STREAMABLE__ and not self._is_literal(pattern_source):
+                anchored_source = b"\\A(?:" + self._translate(pattern_source) + b")"
+                self.pattern = re.compile(anchored_source)
+                self.measurement = parse.ContentStream.measure(anchored_source)
 
     def evaluate(self, target_file):
-        # FIXME: This is a hack implementation that will break
-        rhs_payload = self.rhs.payload(target_file).replace("*", ".*?")
+        if self.matcher is None:
+            self.optimize()
+        if self.matcher is None:
+            return self._build_matcher(self.rhs.payload(target_file))(self.lhs.payload(target_file))
+
+        if self.lhs.__STREAMABLE__ and target_file.streamed:
+            return self._search_stream(target_file)
+        return self.matcher(self.lhs.payload(target_file))
+
+    def __getstate__(self):
+        # The matcher is a closure, which cannot be pickled. It is rebuilt on first use.
+        state = self.__dict__.copy()
+        state.pop("matcher", None)
+        return state
+
+    def build_evaluator(self):
+        if self.matcher is None:
+            self.optimize()
+        if self.matcher is None:
+            return self.evaluate
 
-        return re.match(rhs_payload, self.lhs.payload(target_file)) is not None
+        matcher = self.matcher
+        lhs_payload = self.lhs.build_payload()
+        return self.build_streaming_evaluator(lambda target_file: matcher(lhs_payload(target_file)), self._search_stream)
@@ -26,5 +26,17 @@ from .operator import Operator
 class EqualsOperator(Operator):
     __TOKEN__ = "==?"
 
+    def describe(self):
+        return "%s == %s" % (self.lhs.describe(), self.rhs.describe())
+
     def evaluate(self, target_file):
         return self.lhs.payload(target_file) == self.rhs.payload(target_file)
+
+    def build_evaluator(self):
+        lhs_payload = self.lhs.build_payload()
+        if self.rhs.__CONSTANT__:
+            rhs_value = self.rhs.payload(None)
+            return lambda target_file: lhs_payload(target_file) == rhs_value
+
+        rhs_payload = self.rhs.build_payload()
+        return lambda target_file: lhs_payload(target_file) == rhs_payload(target_file)
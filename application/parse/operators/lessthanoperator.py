@@ -27,3 +27,12 @@ class LessThanOperator(Operator):
 
     def evaluate(self, target_file):
         return self.lhs.payload(target_file) < self.rhs.payload(target_file)
+
+    def build_evaluator(self):
+        lhs_payload = self.lhs.build_payload()
+        if self.rhs.__CONSTANT__:
+            rhs_value = self.rhs.payload(None)
+            return lambda target_file: lhs_payload(target_file) < rhs_value
+
+        rhs_payload = self.rhs.build_payload()
+        return lambda target_file: lhs_payload(target_file) < rhs_payload(target_file)
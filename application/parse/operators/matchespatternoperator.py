@@ -23,15 +23,52 @@
 
 import re
 
+import parse
+
 from .operator import Operator
 
 class MatchesPatternOperator(Operator):
     __TOKEN__ = "MATCHES PATTERN"
+    __COST__ = 3
+
+    pattern = None
+    """
+        The compiled right hand side pattern. This is compiled once by .optimize when the right hand side is a constant.
+    """
+
+    def optimize(self):
+        pattern_source = self.pattern_source()
+        if pattern_source is not None:
+            self.pattern = re.compile(pattern_source)
+
+    def required_literals(self):
+        if self.lhs.__METADATA__ or not self.rhs.__CONSTANT__:
+            return super(MatchesPatternOperator, self).required_literals()
+        return parse.LiteralExtractor().extract(self.pattern_source())
 
     def evaluate(self, target_file):
         lhs_payload = self.lhs.payload(target_file)
 
-        match_result = re.match(self.rhs.payload(target_file), lhs_payload)
+        if self.pattern is not None:
+            match_result = self.pattern.match(lhs_payload)
+        else:
+            match_result = re.match(self.rhs.payload(target_file), lhs_payload)
+
         if match_result is None:
             return False
         return (match_result.end() - match_result.start()) == len(lhs_payload)
+
+    def build_evaluator(self):
+        if self.pattern is None:
+            self.optimize()
+        if self.pattern is None:
+            return self.evaluate
+
+        match = self.pattern.match
+        lhs_payload = self.lhs.build_payload()
+
+        def evaluator(target_file):
+            payload = lhs_payload(target_file)
+            match_result = match(payload)
+            return match_result is not None and match_result.end() == len(payload)
+        return evaluator
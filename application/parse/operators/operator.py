@@ -21,6 +21,109 @@
     51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 """
 
+import parse
+
 class Operator(object):
+    __COST__ = 1
+    """
+        The estimated relative cost of applying this operator, as a multiplier of the cost of its operands. Plain comparisons
+        cost 1, pattern matching costs more.
+    """
+
+    __SERIALIZED__ = ("lhs", "rhs")
+    """
+        The names of the attributes making up the stable serialized form of this operator, see SearchQuery.serialize. Any
+        other state is derived from these by .optimize.
+    """
+
     def evaluate(self, target_file):
         raise NotImplementedError(".evaluate not implemented on '%s'" % self.__class__.__name__)
+
+    def describe(self):
+        """
+            Returns a description of this operator and its operands in the query syntax, for reports such as the profile of
+            an execution.
+
+            :rtype: str
+        """
+        return "%s %s %s" % (self.lhs.describe(), self.__TOKEN__, self.rhs.describe())
+
+    def cost(self):
+        """
+            Returns the estimated relative cost of evaluating this operator for one file.
+
+            :rtype: int
+        """
+        return (self.lhs.__COST__ + self.rhs.__COST__) * self.__COST__
+
+    def build_evaluator(self):
+        """
+            Returns a callable evaluating this operator for a TargetFile. Operators override this to bind constant operands
+            directly into the callable.
+
+            :rtype: callable
+        """
+        return self.evaluate
+
+    def build_streaming_evaluator(self, evaluator, stream_evaluator):
+        """
+            Combines an evaluator working on the whole payload with one scanning the file contents in chunks. The latter is
+            used when the left hand side is the file contents and TargetFile.streamed says they should be scanned in chunks.
+
+            :param evaluator: A callable taking a TargetFile.
+            :param stream_evaluator: A callable taking a TargetFile, which scans the contents through TargetFile.stream.
+
+            :rtype: callable
+        """
+        if not self.lhs.__STREAMABLE__:
+            return evaluator
+        return lambda target_file: stream_evaluator(target_file) if target_file.streamed else evaluator(target_file)
+
+    def optimize(self):
+        """
+            Prepares this operator for execution. This is called once by the query planner.
+        """
+
+    def pattern_source(self):
+        """
+            Returns the constant right hand side of this operator in the string type of the left hand side payload: bytes
+            when matching file contents and text otherwise.
+
+            :return: The pattern, or None if the right hand side is not a constant.
+        """
+        if not self.rhs.__CONSTANT__:
+            return None
+
+        pattern = self.rhs.payload(None)
+        if not self.lhs.__METADATA__ and not isinstance(pattern, bytes):
+            pattern = pattern.encode("utf-8")
+        return pattern
+
+    def is_metadata(self):
+        """
+            Returns whether this operator can be evaluated from the file path and stat information alone.
+
+            :rtype: bool
+        """
+        return self.lhs.__METADATA__ and self.rhs.__METADATA__
+
+    def required_literals(self):
+        """
+            Returns the literals the file contents must contain for this operator to be true, as a requirement in the form
+            described by parse.LiteralExtractor.
+
+            :rtype: list
+        """
+        return parse.LiteralExtractor.NOTHING
+
+    def prefilter(self, target_file):
+        """
+            Evaluates this operator using only file metadata.
+
+            :param target_file: The TargetFile instance to evaluate. Its contents are never accessed.
+
+            :return: The result of the operator, or None if it depends on the file contents.
+        """
+        if self.is_metadata():
+            return self.evaluate(target_file)
+        return None
@@ -6,6 +6,7 @@ from .reference import Reference
 from .agoreference import AgoReference
 from .sizereference import SizeReference
 from .todayreference import TodayReference
+from .lastweekreference import LastWeekReference
 from .contentsreference import ContentsReference
 from .filenamereference import FileNameReference
 from .creationdatereference import CreationDateReference
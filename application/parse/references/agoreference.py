@@ -21,21 +21,26 @@
     51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 """
 
-import datetime
+import time
 
 from .reference import Reference
 
 class AgoReference(Reference):
     __UNITS__ = {
-        "DAY": None,
-        "HOUR": None,
-        "SECOND": None,
-        "MONTH": 30,
-        "YEAR": 365,
-        "WEEK": None
+        "DAY": 86400,
+        "HOUR": 3600,
+        "SECOND": 1,
+        "MONTH": 30 * 86400,
+        "YEAR": 365 * 86400,
+        "WEEK": 7 * 86400
     }
+    """
+        The supported time units and their length in seconds.
+    """
 
     __TOKEN__ = "([0-9]+(?:\.[0-9]+)?) (%s)S? AGO" % "|".join(["(?:%s)" % current_unit for current_unit in __UNITS__.keys()])
+    __CONSTANT__ = True
+    __SERIALIZED__ = ("total_time", "time_unit")
 
     total_time = None
     """
@@ -47,6 +52,11 @@ class AgoReference(Reference):
         The time unit that is being used.
     """
 
+    timestamp = None
+    """
+        The point in time this reference resolves to, as seconds since the epoch. This is set by .prepare.
+    """
+
     def __init__(self, match_data):
         self.time_unit = match_data.group(3)
         self.total_time = float(match_data.group(2))
@@ -54,14 +64,20 @@ class AgoReference(Reference):
     def __repr__(self):
         return "<%f %s Ago>" % (self.total_time, self.time_unit)
 
+    def describe(self):
+        return "%g %sS AGO" % (self.total_time, self.time_unit.upper())
+
+    def prepare(self, execution_time):
+        self.timestamp = execution_time - self.total_time * self.__UNITS__[self.time_unit.upper()]
+
     def is_operator(self, target_file, rhs):
-        start_date = self.payload(target_file)
-        end_date = datetime.datetime
-        return True
+        """
+            A date is the given time ago when it lies at or after that point in time, meaning within the last total_time
+            units.
+        """
+        return rhs.payload(target_file) >= self.payload(target_file)
 
     def payload(self, target_file):
-        if self.__UNITS__[self.time_unit.upper()] is None:
-            invocation = {"%ss" % self.time_unit.lower(): self.total_time}
-            return datetime.datetime.now() - datetime.timedelta(**invocation)
-        invocation = {"days": self.total_time * self.__UNITS__[self.time_unit.upper()]}
-        return datetime.datetime.now() - datetime.timedelta(**invocation)
+        if self.timestamp is None:
+            return time.time() - self.total_time * self.__UNITS__[self.time_unit.upper()]
+        return self.timestamp
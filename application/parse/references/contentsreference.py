@@ -25,6 +25,12 @@ from .reference import Reference
 
 class ContentsReference(Reference):
     __TOKEN__ = "(?:FILE )?CONTENTS"
+    __METADATA__ = False
+    __COST__ = 100
+    __STREAMABLE__ = True
+
+    def build_payload(self):
+        return lambda target_file: target_file.contents
 
     def payload(self, target_file):
         return target_file.contents
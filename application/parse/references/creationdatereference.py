@@ -25,10 +25,14 @@ from .reference import Reference
 
 class CreationDateReference(Reference):
     __TOKEN__ = "CREATION DATE"
+    __COST__ = 4
 
     def is_operator(self, target_file, rhs):
         result = rhs.is_operator(target_file, self)
         return result
 
+    def build_payload(self):
+        return lambda target_file: target_file.creation_time
+
     def payload(self, target_file):
-        return target_file.creation_date
+        return target_file.creation_time
@@ -27,6 +27,7 @@ from .reference import Reference
 
 class FileExtensionReference(Reference):
     __TOKEN__ = "(?:FILE)? EXTENSION"
+    __COST__ = 2
 
     def payload(self, target_file):
         built_extension = ""
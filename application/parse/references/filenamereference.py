@@ -27,6 +27,11 @@ from .reference import Reference
 
 class FileNameReference(Reference):
     __TOKEN__ = "FILENAME"
+    __COST__ = 1
+
+    def build_payload(self):
+        basename = os.path.basename
+        return lambda target_file: basename(target_file.path)
 
     def payload(self, target_file):
         return os.path.basename(target_file.path)
@@ -21,10 +21,23 @@
     51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 """
 
+import time
+
 from .reference import Reference
 
 class LastWeekReference(Reference):
     __TOKEN__ = "LAST WEEK"
+    __CONSTANT__ = True
+
+    timestamp = None
+    """
+        The time one week before the query started executing, as seconds since the epoch. This is set by .prepare.
+    """
+
+    def prepare(self, execution_time):
+        self.timestamp = execution_time - 7 * 86400
 
     def payload(self, target_file):
-        return datetime.datetime.now() - datetime.timedelta(days=7)
+        if self.timestamp is None:
+            return time.time() - 7 * 86400
+        return self.timestamp
@@ -21,12 +21,18 @@
     51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 """
 
+import re
+
 import parse
 
 class Reference(parse.Operand):
     def __init__(self, match_data):
         pass
 
+    def describe(self):
+        # The optional words of the token, such as "FILE " in "(?:FILE )?SIZE", are spelled out
+        return re.sub("\\(\\?:([^()]*)\\)\\?", "\\1", self.__TOKEN__)
+
     def is_operator(self, target_file, rhs):
         raise NotImplementedError(".is_operator is not implemented on reference '%s'" % self.__class__.__name__)
 
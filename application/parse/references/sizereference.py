@@ -25,6 +25,10 @@ from .reference import Reference
 
 class SizeReference(Reference):
     __TOKEN__ = "(?:FILE )?SIZE"
+    __COST__ = 4
+
+    def build_payload(self):
+        return lambda target_file: target_file.size
 
     def payload(self, target_file):
         return target_file.size
@@ -21,12 +21,23 @@
     51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 """
 
-import datetime
+import time
 
 from .reference import Reference
 
 class TodayReference(Reference):
     __TOKEN__ = "TODAY"
+    __CONSTANT__ = True
+
+    timestamp = None
+    """
+        The current time as seconds since the epoch, taken once by .prepare.
+    """
+
+    def prepare(self, execution_time):
+        self.timestamp = execution_time
 
     def payload(self, target_file):
-        return datetime.datetime.now()
+        if self.timestamp is None:
+            return time.time()
+        return self.timestamp
@@ -22,5 +22,10 @@
 """
 
 class Suffix(object):
+    __SERIALIZED__ = ()
+    """
+        The names of the attributes making up the stable serialized form of this suffix, see SearchQuery.serialize.
+    """
+
     def mutate(self, input):
         raise NotImplementedError(".mutate is not implemented on '%s'." % self.__class__.__name__)
@@ -22,11 +22,32 @@
 """
 
 import os
+import mmap
+import stat
 import datetime
 
+from timeit import default_timer
+
+from .contentstream import ContentStream
+from .mappedcontents import MappedContents
+
 class TargetFile(object):
     """
-        A class representing a potential target file to have queries ran against.
+        A class representing a potential target file to have queries ran against. Only the path is known up front;
+        the stat information and the file contents are loaded on first access so that metadata-only queries never
+        read file data. Depending on the size of the file, its contents are read, mapped into memory or scanned in chunks,
+        see .contents and .streamed.
+    """
+
+    CHUNK_SIZE = 16 * 1024 * 1024
+    """
+        The default chunk size.
+    """
+
+    MAPPING_SIZE = 256 * 1024
+    """
+        The size from which the contents of a file are mapped into memory rather than read. Reading small files is cheaper
+        than setting up a mapping.
     """
 
     path = None
@@ -34,27 +55,147 @@ class TargetFile(object):
         The path to the targeted file.
     """
 
-    size = None
+    chunk_size = None
+    """
+        The number of bytes predicates that can scan the contents in chunks read at once. Larger files are never read into
+        memory as a whole by these predicates.
+    """
+
+    timings = None
     """
-        The size of the file in bytes.
+        The execution.TimingReport the time spent stat'ing and reading this file is added to, or None if it is not timed.
     """
 
-    creation_date = None
+    io_time = 0.0
     """
-        The date the file was created on.
+        The time, in seconds, spent stat'ing and reading this file so far. This is only measured when timings is set.
     """
 
-    def __init__(self, path):
+    def __init__(self, path, stat_result=None, entry=None, chunk_size=None, timings=None):
         """
             Initializes a new TargetFile.
 
             :param path: The filepath to target.
+            :param stat_result: An optional os.stat_result that was already retrieved for this path. If None, the file
+                is stat'ed on first access of a metadata attribute.
+            :param entry: An optional os.DirEntry for this path. Its cached stat information is used instead of stat'ing the
+                file again.
+            :param chunk_size: The chunk size to use, or None for CHUNK_SIZE.
+            :param timings: An optional execution.TimingReport to add the time spent stat'ing and reading the file to.
         """
         self.path = path
+        self.chunk_size = self.CHUNK_SIZE if chunk_size is None else chunk_size
+        self.timings = timings
+        self._stat_result = stat_result
+        self._entry = entry
+        self._contents = None
+
+    @property
+    def stat_result(self):
+        """
+            The os.stat_result of the targeted file.
+        """
+        if self._stat_result is None:
+            if self.timings is None:
+                self._stat_result = self._load_stat_result()
+            else:
+                start_time = default_timer()
+                self._stat_result = self._load_stat_result()
+                self.record("stat", default_timer() - start_time)
+        return self._stat_result
+
+    def _load_stat_result(self):
+        """
+            Retrieves the stat information of the file, see .stat_result.
+        """
+        return os.stat(self.path) if self._entry is None else self._entry.stat()
+
+    def record(self, phase, elapsed, bytes=0):
+        """
+            Adds time spent stat'ing or reading this file to its timings and io_time.
+
+            :param phase: The name of the phase in the execution.TimingReport, "stat" or "read".
+            :param elapsed: The time spent, in seconds.
+            :param bytes: The number of bytes read.
+        """
+        self.io_time += elapsed
+        self.timings.add(phase, elapsed, bytes=bytes)
+
+    @property
+    def size(self):
+        """
+            The size of the file in bytes.
+        """
+        return self.stat_result.st_size
+
+    @property
+    def creation_time(self):
+        """
+            The time the file was created on, as seconds since the epoch.
+        """
+        return self.stat_result.st_ctime
+
+    @property
+    def creation_date(self):
+        """
+            The date the file was created on.
+        """
+        return datetime.datetime.fromtimestamp(self.stat_result.st_ctime)
+
+    @property
+    def contents(self):
+        """
+            The contents of the file. These are only read the first time they are requested.
 
-        # FIXME: Allow for processing bits of files at a time to save on memory
-        with open(path, "rb") as handle:
-            self.contents = handle.read()
+            Regular files of at least MAPPING_SIZE bytes are mapped into memory, and their contents are a MappedContents
+            object. Files that are not regular files, such as pipes and devices, have no contents: reading them could block
+            or never end.
+        """
+        if self._contents is None:
+            stat_result = self.stat_result
+            if self.timings is None:
+                self._contents = self._load_contents(stat_result)
+            else:
+                start_time = default_timer()
+                self._contents = self._load_contents(stat_result)
+                self.record("read", default_timer() - start_time, len(self._contents))
+        return self._contents
 
-        self.size = os.path.getsize(path)
-        self.creation_date = datetime.datetime.fromtimestamp(os.path.getctime(path))
+    def _load_contents(self, stat_result):
+        """
+            Reads or maps the contents of the file, see .contents.
+        """
+        if not stat.S_ISREG(stat_result.st_mode):
+            return b""
+
+        with open(self.path, "rb") as handle:
+            if stat_result.st_size >= self.MAPPING_SIZE:
+                try:
+                    return MappedContents(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                except (ValueError, EnvironmentError):
+                    # The file was emptied since it was stat'ed, or its file system does not support mapping
+                    pass
+            return handle.read()
+
+    @property
+    def contents_loaded(self):
+        """
+            Whether or not the file contents have been read.
+        """
+        return self._contents is not None
+
+    @property
+    def streamed(self):
+        """
+            Whether predicates that can scan the contents in chunks should do so, which is the case when the file is larger
+            than the chunk size and its contents were not read already.
+        """
+        return self._contents is None and self.size > self.chunk_size
+
+    def stream(self):
+        """
+            Returns a ContentStream over the contents of the file.
+
+            :rtype: ContentStream
+        """
+        return ContentStream(self.path, self.chunk_size, None if self.timings is None else self.record)
@@ -23,3 +23,4 @@
 
 import errors
 from .querycompiler import QueryCompiler
+from .querycache import QueryCache
@@ -0,0 +1,170 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import re
+import threading
+import collections
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import tokens
+
+from .querycompiler import QueryCompiler
+
+class QueryCache(object):
+    """
+        A bounded cache of compiled queries keyed on their normalized text, for programs that compile the same queries over
+        and over. When the cache is full, the least recently used query is dropped. The cache may be shared between threads.
+
+        Executing a query modifies it, as the operands depending on the current time, the compiled evaluator, the timings,
+        the profile and the predicate counters are kept on the SearchQuery. The cache therefore keeps every query in pickled
+        form and each compilation returns a private copy, which can be executed concurrently with the copies returned to
+        other threads. Unpickling a query costs a fraction of compiling it.
+    """
+
+    MAXIMUM_ENTRIES = 256
+    """
+        The default number of compiled queries kept.
+    """
+
+    _STRING_PATTERN = re.compile("""(('|")(?:.*?)\\2)""")
+    """
+        Matches the string literals of a query, which are left alone by .normalize. This must agree with tokens.String.
+    """
+
+    _WHITESPACE_PATTERN = tokens.WhiteSpace.__PATTERN__
+    """
+        Matches the runs of spaces that .normalize collapses. Only spaces separate tokens, so other whitespace is left for
+        the compiler to reject.
+    """
+
+    maximum_entries = None
+    """
+        The maximum number of compiled queries kept.
+    """
+
+    hits = 0
+    """
+        The number of compilations answered from the cache.
+    """
+
+    misses = 0
+    """
+        The number of compilations that had to compile the query.
+    """
+
+    def __init__(self, maximum_entries=MAXIMUM_ENTRIES):
+        """
+            Initializes a new QueryCache.
+
+            :param maximum_entries: The maximum number of compiled queries kept.
+        """
+        self.maximum_entries = maximum_entries
+        self.hits = 0
+        self.misses = 0
+        self._queries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def normalize(cls, query):
+        """
+            Normalizes the text of a query, so that queries differing only in their spacing share a cache entry. Runs of
+            spaces outside of string literals are collapsed into single spaces and leading and trailing spaces are removed.
+
+            :param query: The query text.
+
+            :rtype: str
+        """
+        components = cls._STRING_PATTERN.split(query)
+
+        # split returns the text between the literals, then each literal followed by its quote character
+        normalized = []
+        for index in range(0, len(components), 3):
+            normalized.append(cls._WHITESPACE_PATTERN.sub(" ", components[index]))
+            if index + 1 < len(components):
+                normalized.append(components[index + 1])
+        return "".join(normalized).strip(" ")
+
+    def compile(self, query, optimized=True):
+        """
+            Returns a private copy of the compiled form of a query, compiling the normalized query text with a QueryCompiler
+            if it is not cached yet. Queries that fail to compile are not cached, so they raise their error every time.
+
+            :param query: The query text.
+            :param optimized: Whether the query is optimized. Optimized and unoptimized queries are cached separately.
+
+            :rtype: SearchQuery
+        """
+        key = (self.normalize(query), optimized)
+        with self._lock:
+            pickled_query = self._queries.pop(key, None)
+            if pickled_query is not None:
+                self._queries[key] = pickled_query
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if pickled_query is not None:
+            return pickle.loads(pickled_query)
+
+        # Compiling outside of the lock lets other threads use the cache meanwhile. A thread that compiled the same query
+        # concurrently may have stored it first, in which case that entry is kept. The compiled instance itself is never
+        # stored, so it is returned as this call's copy.
+        compiled_query = QueryCompiler().compile(key[0], optimized=optimized)
+        pickled_query = pickle.dumps(compiled_query, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._queries[key] = self._queries.pop(key, pickled_query)
+            while len(self._queries) > self.maximum_entries:
+                self._queries.popitem(last=False)
+        return compiled_query
+
+    def clear(self):
+        """
+            Drops every cached query. The hit and miss counters are kept.
+        """
+        with self._lock:
+            self._queries.clear()
+
+    def statistics(self):
+        """
+            Returns the cache statistics.
+
+            :return: A dict with the number of hits, misses and cached entries, the maximum number of entries and the hit ratio,
+                which is None before the first compilation.
+            :rtype: dict
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._queries),
+                "maximum_entries": self.maximum_entries,
+                "hit_ratio": float(self.hits) / total if total != 0 else None,
+            }
+
+    def __len__(self):
+        return len(self._queries)
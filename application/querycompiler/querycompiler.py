@@ -26,6 +26,7 @@ import re
 import parse
 import tokens
 import errors
+import execution
 
 from searchquery import SearchQuery
 
@@ -46,6 +47,38 @@ TOKENS = [
     A list of tokens that the lexer will recognize and in what order to look for them.
 """
 
+def build_token_pattern(token_types):
+    """
+        Combines the patterns of the given token types into a single pattern with one named group per token type, so the
+        lexer finds the next token with a single match. Alternatives are tried in order, like the token types are.
+
+        Groups inside the patterns are renumbered, so their backreferences keep working. The combined pattern ignores case,
+        so a token type whose own pattern does not may match where it should not, which generate_token_stream checks.
+
+        :param token_types: The token types, in the order they are looked for in.
+
+        :return: A tuple (pattern, group_indices) where group_indices maps the group names to indices into token_types.
+        :rtype: tuple
+    """
+    alternatives = []
+    group_indices = {}
+    group_count = 0
+    for index, token_type in enumerate(token_types):
+        offset = group_count + 1
+        renumber = lambda match_data: "\\%u" % (int(match_data.group(1)) + offset)
+        source = re.sub(r"\\([1-9])", renumber, token_type.__PATTERN__.pattern)
+
+        group_name = "token%u" % index
+        alternatives.append("(?P<%s>%s)" % (group_name, source))
+        group_indices[group_name] = index
+        group_count += 1 + token_type.__PATTERN__.groups
+    return re.compile("|".join(alternatives), re.IGNORECASE), group_indices
+
+TOKEN_PATTERN, TOKEN_GROUPS = build_token_pattern(TOKENS)
+"""
+    The combined pattern of all TOKENS and the mapping of its group names to indices into TOKENS.
+"""
+
 def push_tokens(pushed_tokens, token_stream):
     pushed_tokens = [pushed_tokens] if type(pushed_tokens) is not list else pushed_tokens
 
@@ -55,15 +88,17 @@ def push_tokens(pushed_tokens, token_stream):
         yield token
 
 def generate_token_stream(input):
-    current_character_position = 0
-
     current_index = 0
     while current_index != len(input):
-        for token_data in TOKENS:
+        # The combined pattern finds the first token type that can match. Its own pattern is matched again to produce the
+        # token's match data, and to rule out a match that only happened because the combined pattern ignores case
+        combined_match = TOKEN_PATTERN.match(input, current_index)
+        first_token = len(TOKENS) if combined_match is None else TOKEN_GROUPS[combined_match.lastgroup]
+
+        for token_data in TOKENS[first_token:]:
             match_data = token_data.__PATTERN__.match(input, current_index)
 
             if match_data is not None:
-                found_match = True
                 yield token_data(match_data)
                 current_index = match_data.end()
                 break
@@ -96,6 +131,11 @@ class QueryCompiler(object):
         Whether or not the search should be timed. This is a debugging tool.
     """
 
+    profiled = False
+    """
+        Whether or not the search should be profiled per node. This is a debugging tool.
+    """
+
     compiled_data = None
     """
         The compiled query data from the compiler.
@@ -104,11 +144,15 @@ class QueryCompiler(object):
     def handle_timed_flag(self):
         self.timed = True
 
+    def handle_profile_flag(self):
+        self.profiled = True
+
     def handle_verbose_flag(self):
         pass
 
     FLAG_HANDLERS = {
         "timed": handle_timed_flag,
+        "profile": handle_profile_flag,
         "verbose": handle_verbose_flag,
     }
 
@@ -157,16 +201,10 @@ class QueryCompiler(object):
 
         # Lookup the operator
         operator_token = " ".join(operator_components).rstrip().lstrip()
-        operator_token_search = operator_token.lower()
-        for operator_class in parse.operators.Operator.__subclasses__():
-            current_operator_token = operator_class.__TOKEN__
-            current_operator_match = re.match(re.compile(current_operator_token, re.IGNORECASE), operator_token_search)
-            if current_operator_match is not None and (current_operator_match.end() - current_operator_match.start()) == len(operator_token_search):
-                new_operator = operator_class()
-                self.logic_stack[-1].append(new_operator)
-                break
-        else:
-            raise UnknownOperatorError(token_index=index, previous_token=self.previous_token, current_token=token, query=query, operator=operator_token)
+        operator_class = tokens.Operator.__LOOKUP__.lookup(operator_token)
+        if operator_class is None:
+            raise errors.UnknownOperatorError(token_index=index, previous_token=self.previous_token, current_token=token, query=query, operator=operator_token)
+        self.logic_stack[-1].append(operator_class())
 
         if next_token is not None:
             return push_tokens(next_token, token_stream)
@@ -179,41 +217,26 @@ class QueryCompiler(object):
 
     def handle_logical_token(self, index, token, token_stream, query):
         operator_token = token.match_data.group(1)
-        operator_token_search = operator_token.lower()
-        for operator_class in parse.logic.LogicalOperator.__subclasses__():
-            if operator_class.__TOKEN__.lower() == operator_token_search:
-                new_operator = operator_class()
-                self.logic_stack[-1].append(new_operator)
-                break
-        else:
-            raise UnknownOperatorError(token_index=index, previous_token=self.previous_token, current_token=token, query=query, operator=operator_token)
+        operator_class = tokens.LogicalOperator.__LOOKUP__.lookup(operator_token)
+        if operator_class is None:
+            raise errors.UnknownLogicalOperatorError(token_index=index, previous_token=self.previous_token, current_token=token, query=query, operator=operator_token)
+        self.logic_stack[-1].append(operator_class())
         return token_stream
 
     def handle_suffix_token(self, index, token, token_stream, query):
         suffix_token = token.match_data.group(1)
-        suffix_token_search = suffix_token.lower()
-        for suffix_class in parse.suffixes.Suffix.__subclasses__():
-            if suffix_class.__TOKEN__.lower() == suffix_token_search:
-                new_suffix = suffix_class()
-                self.logic_stack[-1].append(new_suffix)
-                break
-        else:
-            raise UnknownReferenceError(token_index=index, previous_token=self.previous_token, current_token=token, query=query, operator=suffix_token)
+        suffix_class = tokens.Suffix.__LOOKUP__.lookup(suffix_token)
+        if suffix_class is None:
+            raise errors.UnknownReferenceError(token_index=index, previous_token=self.previous_token, current_token=token, query=query, reference=suffix_token)
+        self.logic_stack[-1].append(suffix_class())
         return token_stream
 
     def handle_reference_token(self, index, token, token_stream, query):
         reference_token = token.match_data.group(1)
-        reference_token_search = reference_token.lower()
-        for reference_class in parse.references.Reference.__subclasses__():
-            reference_token = reference_class.__TOKEN__.lower()
-
-            reference_match = re.match(re.compile(reference_token, re.IGNORECASE), reference_token_search)
-            if reference_match is not None and (reference_match.end() - reference_match.start()) == len(reference_token_search):
-                new_reference = reference_class(match_data=token.match_data)
-                self.logic_stack[-1].append(new_reference)
-                break
-        else:
-            raise UnknownReferenceError(token_index=index, previous_token=self.previous_token, current_token=token, query=query, operator=reference_token)
+        reference_class = tokens.Reference.__LOOKUP__.lookup(reference_token)
+        if reference_class is None:
+            raise errors.UnknownReferenceError(token_index=index, previous_token=self.previous_token, current_token=token, query=query, reference=reference_token)
+        self.logic_stack[-1].append(reference_class(match_data=token.match_data))
         return token_stream
 
     def handle_parentheses_close_token(self, index, token, token_stream, query):
@@ -242,16 +265,39 @@ class QueryCompiler(object):
         tokens.Reference: handle_reference_token
     }
 
-    def compile(self, query, optimized=True):
+    def compile(self, query, optimized=True, timed=False, profiled=False):
         """
             Compiles the input query into a SearchQuery object.
+
+            :param query: The query text.
+            :param optimized: Whether the query is optimized.
+            :param timed: Whether executions of the query are timed, see SearchQuery.timed. The "timed:" flag of the query
+                has the same effect.
+            :param profiled: Whether executions of the query are profiled, see SearchQuery.profiled. The "profile:" flag of
+                the query has the same effect.
+
+            :rtype: SearchQuery
         """
+        self.timed = False
+        self.profiled = False
+        clock = execution.TimingReport.clock
 
+        start_time = clock()
         self._lex(query)
+        lexed_time = clock()
         result = SearchQuery(compiled_data=self._parse(self.current_compilation))
-        print(result.compiled_data)
+        parsed_time = clock()
         if optimized:
             result.optimize()
+        optimized_time = clock()
+
+        if timed or self.timed:
+            result.timed = True
+            result.timings = execution.TimingReport()
+            result.timings.add("lex", lexed_time - start_time)
+            result.timings.add("parse", parsed_time - lexed_time)
+            result.timings.add("optimize", optimized_time - parsed_time)
+        result.profiled = profiled or self.profiled
         return result
 
     def _lex(self, query):
@@ -302,53 +348,116 @@ class QueryCompiler(object):
     def _parse(self, compiled_data):
         """
             The final parse function. We assume the data is in the correct form and assemble it into the final executable
-            format.
+            format in a single pass, by precedence climbing: AND binds tighter than OR, so "a OR b AND c" is parsed as
+            "a OR (b AND c)".
+
+            A run of operands joined by one kind of logical operator becomes a chain of logical operators sharing their
+            neighbouring operands, which is the form SearchQuery evaluates. A chain that is the operand of an operator with a
+            lower precedence is nested in its own SearchQuery, like a parenthesized group.
+
+            :param compiled_data: The list produced by _lex, where parenthesized groups are nested lists.
+
+            :return: The chain of logical operators, or a list holding the single node of the query.
+            :rtype: list
+        """
+        operands, operators, position = self._parse_chain(compiled_data, 0, 0)
+        if position != len(compiled_data):
+            raise errors.CompilerError("Expected a logical operator, found %s." % type(compiled_data[position]).__name__)
+        return self._link_chain(operands, operators)
+
+    def _link_chain(self, operands, operators):
+        """
+            Links a run of operands and the logical operators between them into a chain.
+
+            :return: The list of logical operators, or a list holding the single operand if there are none.
+            :rtype: list
+        """
+        for index, operator in enumerate(operators):
+            operator.lhs = operands[index]
+            operator.rhs = operands[index + 1]
+        return operators if len(operators) != 0 else operands
+
+    def _parse_chain(self, compiled_data, position, minimum_precedence):
+        """
+            Parses operands joined by logical operators of at least the given precedence.
+
+            :return: A tuple (operands, operators, position) where operators are of one type and join the operands, and
+                position is the index of the first element that was not consumed.
+            :rtype: tuple
+        """
+        operand, position = self._parse_primary(compiled_data, position)
+        operands = [operand]
+        operators = []
+
+        while position < len(compiled_data):
+            operator = compiled_data[position]
+            if not isinstance(operator, parse.logic.LogicalOperator):
+                break
+
+            precedence = operator.__PRECEDENCE__
+            if precedence < minimum_precedence:
+                break
+
+            # Operators of a higher precedence to the right bind their operands first
+            rhs_operands, rhs_operators, position = self._parse_chain(compiled_data, position + 1, precedence + 1)
+            rhs = self._chain_operand(rhs_operands, rhs_operators)
+
+            # A different operator can only have a lower precedence here, so the chain so far becomes its left operand
+            if len(operators) != 0 and type(operator) is not type(operators[0]):
+                operands = [self._chain_operand(operands, operators)]
+                operators = []
+            operands.append(rhs)
+            operators.append(operator)
+        return operands, operators, position
+
+    def _chain_operand(self, operands, operators):
+        """
+            Turns a parsed chain into a single operand, nesting it in a SearchQuery if it has operators.
+        """
+        if len(operators) == 0:
+            return operands[0]
+        return SearchQuery(self._link_chain(operands, operators))
+
+    def _parse_primary(self, compiled_data, position):
+        """
+            Parses a parenthesized group, an operator with its operands, or a single operand.
+
+            :return: A tuple (node, position) where position is the index of the first element that was not consumed.
+            :rtype: tuple
+        """
+        if position == len(compiled_data):
+            raise errors.CompilerError("Expected an operand at the end of the query.")
+
+        element = compiled_data[position]
+        if type(element) is list:
+            return SearchQuery(self._parse(element)), position + 1
+
+        lhs, position = self._parse_operand(compiled_data, position)
+        if position == len(compiled_data) or not isinstance(compiled_data[position], parse.operators.Operator):
+            return lhs, position
+
+        operator = compiled_data[position]
+        operator.lhs = lhs
+        operator.rhs, position = self._parse_operand(compiled_data, position + 1)
+        return operator, position
+
+    def _parse_operand(self, compiled_data, position):
+        """
+            Parses a single operand of an operator, matching a number to its suffix.
+
+            :return: A tuple (operand, position) where position is the index of the first element that was not consumed.
+            :rtype: tuple
         """
-        current_data = None
-        current_operator = None
-
-        produced_ast = []
-
-        # First pass: Match suffixes to numbers
-        removed_entries = []
-        for index, current_element in enumerate(compiled_data):
-            current_element_type = type(current_element)
-
-            # If we have a number, look for a suffix
-            if index < len(compiled_data) - 1 and current_element_type is parse.data.Number:
-                next_element = compiled_data[index + 1]
-
-                if type(next_element) in parse.suffixes.Suffix.__subclasses__():
-                    current_element.suffix = next_element
-                    removed_entries.append(next_element)
-        produced_ast = [current_element for current_element in compiled_data if current_element not in removed_entries]
-
-        # Second pass: Convert sub queries
-        produced_ast = [current_element if type(current_element) is not list else SearchQuery(self._parse(current_element)) for current_element in produced_ast]
-
-        # Third pass: Match data to their operators
-        removed_entries = []
-        for index, current_element in enumerate(produced_ast):
-            current_element_type = type(current_element)
-
-            if current_element_type in parse.operators.Operator.__subclasses__():
-                current_element.lhs = produced_ast[index - 1]
-                current_element.rhs = produced_ast[index + 1]
-                removed_entries.append(current_element.lhs)
-                removed_entries.append(current_element.rhs)
-
-        produced_ast = [current_element for current_element in produced_ast if current_element not in removed_entries]
-
-        # Fourth pass: Match logical operands
-        removed_entries = []
-        for index, current_element in enumerate(produced_ast):
-            current_element_type = type(current_element)
-
-            if current_element_type in parse.logic.LogicalOperator.__subclasses__():
-                current_element.lhs = produced_ast[index - 1]
-                current_element.rhs = produced_ast[index + 1]
-                removed_entries.append(current_element.lhs)
-                removed_entries.append(current_element.rhs)
-
-        produced_ast = [current_element for current_element in produced_ast if current_element not in removed_entries]
-        return produced_ast
+        if position == len(compiled_data):
+            raise errors.CompilerError("Expected an operand at the end of the query.")
+
+        operand = compiled_data[position]
+        if type(operand) is list or isinstance(operand, (parse.operators.Operator, parse.logic.LogicalOperator)):
+            raise errors.CompilerError("Expected an operand, found %s." % type(operand).__name__)
+        position += 1
+
+        if type(operand) is parse.data.Number and position < len(compiled_data) and \
+                isinstance(compiled_data[position], parse.suffixes.Suffix):
+            operand.suffix = compiled_data[position]
+            position += 1
+        return operand, position
@@ -27,6 +27,7 @@ import os
 import sys
 import datetime
 
+from index import MetadataIndex, IndexDaemon, TrigramIndex
 from querycompiler import QueryCompiler
 
 class Application(object):
@@ -34,10 +35,39 @@ class Application(object):
         Main application object.
     """
 
+    def index(self, arguments):
+        if len(arguments) != 2 or arguments[0] not in ("build", "refresh", "watch", "contents"):
+            print("Usage: %s index <build/refresh/watch/contents> <root>" % sys.argv[0])
+            return
+
+        if arguments[0] == "contents":
+            with TrigramIndex(TrigramIndex.DATABASE_PATH) as trigram_index:
+                file_count = trigram_index.build(arguments[1])
+            print("Indexed the contents of %u files in %s" % (file_count, os.path.abspath(arguments[1])))
+            return
+
+        with MetadataIndex(MetadataIndex.DATABASE_PATH) as index:
+            if arguments[0] == "build":
+                file_count = index.build(arguments[1])
+                print("Indexed %u files in %s" % (file_count, os.path.abspath(arguments[1])))
+            elif arguments[0] == "watch":
+                print("Watching %s, press Ctrl+C to stop" % os.path.abspath(arguments[1]))
+                try:
+                    IndexDaemon(index, arguments[1]).run()
+                except KeyboardInterrupt:
+                    pass
+            else:
+                written_count, removed_count = index.refresh(arguments[1])
+                print("Updated %u and removed %u files in %s" % (written_count, removed_count, os.path.abspath(arguments[1])))
+
     def main(self):
         query = None
         filepath = None
 
+        if len(sys.argv) >= 2 and sys.argv[1] == "index":
+            self.index(sys.argv[2:])
+            return
+
         if len(sys.argv) == 2:
             query = sys.argv[1]
             filepath = os.getcwd()
@@ -47,34 +77,43 @@ class Application(object):
 
         if query is None or filepath is None:
             print("Usage: %s <filepath/query> [query]" % sys.argv[0])
+            print("       %s index <build/refresh/watch/contents> <root>" % sys.argv[0])
             return
 
         compiler = QueryCompiler()
         query = compiler.compile(query)
 
-        results = query.iexecute(path=filepath)
-        # Execute search
-        #self.results_start = datetime.datetime.now()
-        #results = self.execute(parsed_ast)
-        #self.results_end = datetime.datetime.now()
-
-        # Produce timing output
-        """
-        if self.timed:
-            compile_delta = compile_end - compile_start
-            parse_delta = parse_end - parse_start
-            results_delta = results_end - results_start
-            print("=========================================================")
-            print("Compiled in: %s" % str(compile_delta))
-            print("Parsed in: %s" % str(parse_delta))
-            print("Results in: %s" % str(compile_delta))
-            print("Total: %s" % (compile_delta + parse_delta + results_delta))
-            print("=========================================================")
-        """
-
-        # Produce results
-        for result in results:
-            print(result.path)
+        # Content searches skip the files the trigram index rules out, when one was built. The filter reads the index
+        # while the directory is walked, so the index stays open until the results are produced.
+        execute_arguments = {}
+        trigram_index = None
+        if os.path.exists(TrigramIndex.DATABASE_PATH):
+            trigram_index = TrigramIndex(TrigramIndex.DATABASE_PATH)
+            execute_arguments["entry_filter"] = trigram_index.entry_filter(query, filepath)
+
+        # Metadata queries are answered from the index when one was built
+        index = None
+        try:
+            if os.path.exists(MetadataIndex.DATABASE_PATH):
+                index = MetadataIndex(MetadataIndex.DATABASE_PATH)
+                results = index.iexecute(query, path=filepath, **execute_arguments)
+            else:
+                results = query.iexecute(path=filepath, **execute_arguments)
+
+            # Produce results
+            for result in results:
+                print(result.path)
+        finally:
+            if index is not None:
+                index.close()
+            if trigram_index is not None:
+                trigram_index.close()
+
+        # The reports go to stderr, so the results can still be piped
+        if query.profiled and query.profile is not None:
+            sys.stderr.write(query.profile.format() + "\n")
+        if query.timed:
+            sys.stderr.write(query.timings.format() + "\n")
 
 if __name__ == "__main__":
     Application().main()
@@ -22,62 +22,568 @@
 """
 
 import os
+import json
 import time
 import random
+import collections
 import multiprocessing
 
+from timeit import default_timer
+
 import parse
+import execution
 from searchresult import SearchResult
 
-def _threaded_execute(target_data):
+class SearchQuery(object):
+    """
+        A class representing an executable search query.
     """
-        Internal threaded execution function. This is used when thread counts are not None.
 
-        :param target_data: A tuple (SearchQuery, TargetFile).
+    BATCH_SIZE = 64
+    """
+        The number of paths sent to a worker process per task at the start of an execution. The batch size is then adapted to
+        the observed cost per file by an execution.BatchSizer.
+    """
 
-        :return: A list of TargetFile objects that match the search term.
-        :rtype: list
+    MAXIMUM_NESTED_EVALUATORS = 16
+    """
+        The number of operands from which a chain is evaluated by a loop rather than by nested closures, which would run into
+        the recursion limit for long chains.
     """
-    built_query, target_file = target_data
-    return built_query.execute([target_file], thread_count=None)
 
-class SearchQuery(object):
+    QUEUE_DEPTH = execution.SearchPipeline.QUEUE_DEPTH
     """
-        A class representing an executable search query.
+        The default number of enumerated files buffered ahead of evaluation.
+    """
+
+    SERIALIZED_VERSION = 1
+    """
+        The version of the form produced by .serialize. It changes whenever a serialized query could no longer be read back.
+    """
+
+    chunk_size = None
+    """
+        The number of bytes read at once by predicates that scan large files in chunks, see parse.TargetFile.chunk_size. If
+        None, parse.TargetFile.CHUNK_SIZE is used.
+    """
+
+    interpreted = False
+    """
+        If True, files are evaluated by walking the node objects with _execute, which maintains evaluated_predicates and
+        skipped_predicates. Otherwise the query is compiled into a single evaluator callable with build_evaluator.
+    """
+
+    optimized = False
+    """
+        Whether .optimize was called on this query.
+    """
+
+    timed = False
+    """
+        Whether executions of this query measure the time spent in each phase, see .timings. The "timed:" flag of the query
+        sets this.
+    """
+
+    timings = None
+    """
+        The execution.TimingReport of the last execution when .timed is set. The compiler stores the compilation phases of a
+        timed query in it, which every execution keeps.
+    """
+
+    profiled = False
+    """
+        Whether executions of this query count the evaluations, results, time and scanned bytes of every node, see .profile.
+        The "profile:" flag of the query sets this. Profiling uses the compiled evaluator, even if .interpreted is set, and
+        the metadata predicates are not pushed down into the directory walk, so that every file is counted by the nodes that
+        decide on it.
+    """
+
+    profile = None
+    """
+        The execution.QueryProfile of the last execution when .profiled is set.
+    """
+
+    evaluated_predicates = 0
+    """
+        The number of predicate evaluations performed by the last interpreted execution of this query.
+    """
+
+    skipped_predicates = 0
+    """
+        The number of predicate evaluations that short circuiting avoided during the last interpreted execution of this query.
     """
 
     # FIXME: We should signify this from the base class that has .evaluate
     def evaluate(self, target_file):
-        return self._execute(target_file, self.compiled_data)
+        if self._evaluator is None:
+            self._evaluator = self.build_evaluator()
+        return self._evaluator(target_file)
 
-    def _execute(self, target_file, target_code):
+    def build_evaluator(self):
         """
-            Internal executor function. This is what actually implements the search query execution logic.
+            Compiles the query into a single callable. Every node is turned into a closure with its constant operands bound
+            directly, so evaluating a file no longer goes through the node objects, their payload methods or type checks.
+
+            When the query is profiled and has a .profile, every group and predicate is wrapped to update its counters.
+
+            :return: A callable taking a TargetFile and returning whether it matches.
+            :rtype: callable
+        """
+        if not self.profiled or self.profile is None:
+            return self._build_evaluator(None)
+
+        node_counters = {}
+        for (node, depth, description), counters in zip(self._profile_nodes(), self.profile.counters):
+            node_counters[id(node)] = counters
+        return self._build_evaluator(
+            lambda node, evaluator: self._profile_evaluator(evaluator, node_counters[id(node)], self._scans_contents(node))
+        )
+
+    def _build_node_evaluator(self, node, wrap):
+        """
+            Builds the evaluator of a node of this query, see ._build_evaluator.
+        """
+        if isinstance(node, SearchQuery):
+            return node._build_evaluator(wrap)
+        elif wrap is None:
+            return node.build_evaluator()
+        return wrap(node, node.build_evaluator())
+
+    def _build_evaluator(self, wrap):
+        """
+            Compiles the query into a single callable, see .build_evaluator.
+
+            :param wrap: An optional callable receiving every group and predicate of the query with its evaluator, and
+                returning the evaluator to use in its place.
+
+            :rtype: callable
+        """
+        evaluator = self._build_chain_evaluator(wrap)
+        return evaluator if wrap is None else wrap(self, evaluator)
+
+    def _build_chain_evaluator(self, wrap):
+        """
+            Compiles the chain of this query into a single callable, see ._build_evaluator.
+
+            :rtype: callable
+        """
+        deciding_nodes, short_circuit = self.deciding_nodes()
+        if deciding_nodes is None:
+            return lambda target_file: self._execute(target_file, self)
+        if short_circuit is None:
+            return self._build_node_evaluator(deciding_nodes[0], wrap)
+
+        # Neighbouring nodes of a chain share an operand, so the chain is evaluated from its distinct operands
+        evaluators = [self._build_node_evaluator(operand, wrap) for operand in self._chain_operands(deciding_nodes)]
+        if len(evaluators) > self.MAXIMUM_NESTED_EVALUATORS:
+            if short_circuit is False:
+                return lambda target_file: all(evaluator(target_file) for evaluator in evaluators)
+            return lambda target_file: any(evaluator(target_file) for evaluator in evaluators)
+
+        evaluator = evaluators[-1]
+        for lhs_evaluator in reversed(evaluators[:-1]):
+            evaluator = self._combine_evaluators(lhs_evaluator, evaluator, short_circuit)
+        return evaluator
+
+    def _profile_nodes(self, depth=0):
+        """
+            Lists the groups and predicates of the query that its evaluator evaluates, in the order of the nodes of a
+            QueryProfile.
+
+            :param depth: The depth of this query in the query tree.
+
+            :return: A generator of tuples (node, depth, description).
+            :rtype: generator
+        """
+        deciding_nodes, short_circuit = self.deciding_nodes()
+        if deciding_nodes is None or short_circuit is None:
+            yield self, depth, "QUERY" if depth == 0 else "GROUP"
+            operands = [] if deciding_nodes is None else deciding_nodes
+        else:
+            yield self, depth, deciding_nodes[0].__TOKEN__
+            operands = self._chain_operands(deciding_nodes)
+
+        for operand in operands:
+            if isinstance(operand, SearchQuery):
+                for entry in operand._profile_nodes(depth + 1):
+                    yield entry
+            else:
+                yield operand, depth + 1, operand.describe()
+
+    def _scans_contents(self, node):
+        """
+            Returns whether a node of the query is a predicate on the file contents, whose scanned bytes are profiled.
+
+            :rtype: bool
+        """
+        return not isinstance(node, SearchQuery) and node.lhs.__STREAMABLE__
+
+    @staticmethod
+    def _profile_evaluator(evaluator, counters, scans_contents):
+        """
+            Wraps an evaluator so that it updates the profile counters of its node, see execution.QueryProfile.FIELDS.
+
+            :param evaluator: The evaluator of the node.
+            :param counters: The list of counters of the node.
+            :param scans_contents: Whether the node scans the file contents, whose size is counted as scanned bytes.
+
+            :rtype: callable
+        """
+        clock = default_timer
+        def profiled_evaluator(target_file):
+            start_time = clock()
+            result = evaluator(target_file)
+            counters[3] += clock() - start_time
+            counters[0] += 1
+            counters[1 if result else 2] += 1
+            if scans_contents:
+                counters[4] += target_file.size
+            return result
+        return profiled_evaluator
+
+    def _chain_operands(self, nodes):
+        """
+            Returns the distinct operands of a chain of logical operators, from left to right.
+
+            :rtype: list
+        """
+        operands = []
+        visited = set()
+        for node in nodes:
+            for operand in (node.lhs, node.rhs):
+                if id(operand) not in visited:
+                    visited.add(id(operand))
+                    operands.append(operand)
+        return operands
+
+    def deciding_nodes(self):
+        """
+            Determines the nodes of the top level chain that decide the result of the query.
+
+            :return: A tuple of the deciding nodes and the short circuit value they are combined with. The short circuit
+                value is None if the query consists of a single node. If the chain cannot be reduced, the nodes are None.
+            :rtype: tuple
+        """
+        first_node = self.compiled_data[0]
+        if not isinstance(first_node, parse.logic.LogicalOperator):
+            return [first_node], None
+
+        # _execute returns as soon as a node produces the short circuit value of its operator, and when the short circuit
+        # value changes along the chain the running result is always equal to the new one. Only the leading run of nodes
+        # sharing a short circuit value can therefore decide the result.
+        short_circuit = first_node.__SHORT_CIRCUIT__
+        if short_circuit is None:
+            return None, None
+
+        deciding_nodes = []
+        for node in self.compiled_data:
+            if node.__SHORT_CIRCUIT__ is not short_circuit:
+                break
+            deciding_nodes.append(node)
+        return deciding_nodes, short_circuit
+
+    def _combine_evaluators(self, lhs_evaluator, rhs_evaluator, short_circuit):
+        """
+            Combines two evaluators into one that short circuits on the given value.
+
+            :rtype: callable
+        """
+        if short_circuit is False:
+            return lambda target_file: lhs_evaluator(target_file) and rhs_evaluator(target_file)
+        return lambda target_file: lhs_evaluator(target_file) or rhs_evaluator(target_file)
+
+    def _predicate_count(self, node):
+        """
+            Returns how many predicate evaluations a node performs when none of them are skipped.
+
+            :param node: An operator, logical operator or SearchQuery node.
+
+            :rtype: int
+        """
+        if isinstance(node, parse.logic.LogicalOperator):
+            return self._predicate_count(node.lhs) + self._predicate_count(node.rhs)
+        elif isinstance(node, SearchQuery):
+            return sum(self._predicate_count(child) for child in node.compiled_data)
+        return 1
+
+    def _build_execution_plan(self):
+        """
+            Precomputes what _execute needs for every node so that no type checks are made per file.
+        """
+        self._execution_plan = [(node, getattr(node, "__SHORT_CIRCUIT__", None)) for node in self.compiled_data]
+
+        # The number of predicate evaluations left from each position onwards, used to count skipped evaluations
+        self._remaining_predicates = [0]
+        for node in reversed(self.compiled_data):
+            self._remaining_predicates.insert(0, self._remaining_predicates[0] + self._predicate_count(node))
+
+    def _evaluate_node(self, node, target_file):
+        """
+            Evaluates a single node of the query. The right hand side of a logical operator is only evaluated when the left
+            hand side did not already decide the result.
+
+            :param node: An operator, logical operator or SearchQuery node.
+            :param target_file: The current TargetFile object we are processing.
+        """
+        if isinstance(node, parse.logic.LogicalOperator):
+            lhs_result = self._evaluate_node(node.lhs, target_file)
+            if node.__SHORT_CIRCUIT__ is not None and lhs_result is node.__SHORT_CIRCUIT__:
+                self.skipped_predicates += self._predicate_count(node.rhs)
+                return lhs_result
+            return node.evaluate(lhs_result, self._evaluate_node(node.rhs, target_file))
+        elif isinstance(node, SearchQuery):
+            return self._execute(target_file, node)
+
+        self.evaluated_predicates += 1
+        return node.evaluate(target_file)
+
+    def _execute(self, target_file, target_query):
+        """
+            Internal executor function. This is what actually implements the search query execution logic. Nodes are only
+            evaluated while the result still depends on them, and the evaluations that were avoided are counted in
+            skipped_predicates.
 
             :param target_file: The current TargetFile object we are processing.
-            :param target_code: The current query code to execute. We don't use self.compiled_data directly because we handled
-                parentheses by recursively nesting queries.
+            :param target_query: The SearchQuery whose nodes to execute. We don't use self directly because we handled
+                parentheses by recursively nesting queries. Counters are always accumulated on self.
         """
-        logic_results = [(logical_operator.evaluate(target_file), logical_operator) for logical_operator in target_code]
-        current_evaluation, _ = logic_results[0]
+        current_evaluation = None
+        for index, (node, short_circuit) in enumerate(target_query._execution_plan):
+            # The running result of a short circuiting operator can no longer change
+            if index != 0 and short_circuit is not None and current_evaluation is short_circuit:
+                break
+
+            node_result = self._evaluate_node(node, target_file)
+            if index == 0 or short_circuit is not None:
+                current_evaluation = node_result
+            else:
+                current_evaluation = node.evaluate(current_evaluation, node_result)
 
-        for current_boolean, logical_operator in logic_results:
-            # FIXME: Represent single-component queries without having this hack here
-            if type(logical_operator) in parse.operators.Operator.__subclasses__():
-                current_evaluation = current_boolean
+            if short_circuit is not None and current_evaluation is short_circuit:
+                index += 1
                 break
-            current_evaluation = logical_operator.evaluate(current_evaluation, current_boolean)
-
-            if logical_operator.__SHORT_CIRCUIT__ is not None:
-                # If the short circuit is a boolean, then we return if the current result is equal
-                if type(logical_operator.__SHORT_CIRCUIT__) is bool and logical_operator.__SHORT_CIRCUIT__ is current_evaluation:
-                    return current_evaluation
-                # If the short circuit is anything else, it's a callable function.
-                elif type(logical_operator.__SHORT_CIRCUIT__) is not bool and logical_operator.__SHORT_CIRCUIT__(current_evaluation) is True:
-                    return current_evaluation
+        else:
+            return current_evaluation
+
+        self.skipped_predicates += target_query._remaining_predicates[index]
+        return current_evaluation
+
+    def is_metadata(self):
+        """
+            Returns whether the whole query can be evaluated from file metadata alone.
+
+            :rtype: bool
+        """
+        return all(node.is_metadata() for node in self.compiled_data)
+
+    def predicates(self):
+        """
+            Iterates the distinct operator nodes of this query from left to right, including those in parenthesized sub queries.
+
+            :return: A generator of parse.operators.Operator instances.
+            :rtype: generator
+        """
+        visited = set()
+        pending = list(reversed(self.compiled_data))
+        while len(pending) != 0:
+            node = pending.pop()
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+
+            if isinstance(node, SearchQuery):
+                pending.extend(reversed(node.compiled_data))
+            elif isinstance(node, parse.logic.LogicalOperator):
+                pending.extend([node.rhs, node.lhs])
+            else:
+                yield node
+
+    def prefilter(self, target_file):
+        """
+            Evaluates the query using only file metadata. This mirrors _execute with three valued logic, where None stands for a
+            result that depends on the file contents. A True or False result is guaranteed to be what _execute would return: the
+            evaluation stops with None as soon as the running result becomes unknown, because _execute may have short circuited
+            at that point.
+
+            :param target_file: The TargetFile instance to evaluate. Its contents are never accessed.
+
+            :return: True, False or None.
+        """
+        current_evaluation = None
+        for index, node in enumerate(self.compiled_data):
+            node_result = node.prefilter(target_file)
+            if not isinstance(node, parse.logic.LogicalOperator):
+                return node_result
+            if index == 0:
+                current_evaluation = node_result
+
+            short_circuit = node.__SHORT_CIRCUIT__
+            if current_evaluation is short_circuit or node_result is short_circuit:
+                return short_circuit
+            if current_evaluation is None or node_result is None:
+                return None
         return current_evaluation
 
-    def execute(self, target=os.getcwd(), thread_count=multiprocessing.cpu_count()):
+    def required_literals(self):
+        """
+            Returns the literals the file contents must contain for this query to match, as a requirement in the form
+            described by parse.LiteralExtractor.
+
+            :rtype: list
+        """
+        deciding_nodes, short_circuit = self.deciding_nodes()
+        if deciding_nodes is None:
+            return parse.LiteralExtractor.NOTHING
+
+        combine = parse.LiteralExtractor.disjunction if short_circuit else parse.LiteralExtractor.conjunction
+        requirement = deciding_nodes[0].required_literals()
+        for node in deciding_nodes[1:]:
+            requirement = combine(requirement, node.required_literals())
+        return requirement
+
+    def prepare(self, execution_time):
+        """
+            Resolves the operands that depend on the current time once for this execution, so that every file is compared
+            against the same point in time.
+
+            :param execution_time: The time the execution started at, as seconds since the epoch.
+        """
+        for predicate in self.predicates():
+            predicate.lhs.prepare(execution_time)
+            predicate.rhs.prepare(execution_time)
+
+        # Constants are bound into the evaluator, so it has to be rebuilt
+        self._evaluator = None
+
+    def _timed_evaluation(self, timings, target_file, evaluate, *arguments):
+        """
+            Calls evaluate with the given arguments and adds the time spent to the evaluate phase of timings, except for the
+            time spent stat'ing and reading the target file, which the file records itself.
+
+            :param timings: The execution.TimingReport to add to.
+            :param target_file: The TargetFile being evaluated. Its timings must be set.
+            :param evaluate: The callable to time. A result other than a TargetFile means the file was decided on.
+
+            :return: The result of evaluate.
+        """
+        io_time = target_file.io_time
+        start_time = timings.clock()
+        result = evaluate(*arguments)
+        elapsed = timings.clock() - start_time - (target_file.io_time - io_time)
+        timings.add("evaluate", elapsed, files=0 if isinstance(result, parse.TargetFile) else 1)
+        return result
+
+    def _pushdown(self, entry, entry_filter=None, timings=None):
+        """
+            Applies the metadata predicates of the query to a directory entry during the walk.
+
+            :param entry: The os.DirEntry of the file.
+            :param entry_filter: An optional callable receiving the entry of a file whose contents decide the result, and
+                returning False if the file cannot match.
+            :param timings: An optional execution.TimingReport to add the time spent to.
+
+            :return: None if the file cannot match, a SearchResult if it matches on metadata alone, or a TargetFile built
+                from the entry when the file contents decide the result.
+        """
+        target_file = parse.TargetFile(entry.path, entry=entry, chunk_size=self.chunk_size, timings=timings)
+        if timings is not None:
+            return self._timed_evaluation(timings, target_file, self._prefilter_entry, target_file, entry, entry_filter)
+        return self._prefilter_entry(target_file, entry, entry_filter)
+
+    def _prefilter_entry(self, target_file, entry, entry_filter):
+        """
+            Decides on a directory entry from its metadata, see ._pushdown.
+        """
+        # A profiled execution leaves every file to the profiled evaluator, see .profiled
+        result = None if self.profiled else self.prefilter(target_file)
+        if result is None:
+            if entry_filter is not None and not entry_filter(entry):
+                if self.profile is not None and self.profiled:
+                    self.profile.add_walk_decision()
+                return None
+            return target_file
+        return SearchResult(path=target_file.path) if result is True else None
+
+    def _enumerate(self, target, entry_filter=None, timings=None):
+        """
+            Produces the entries of all files to process.
+
+            :param target: If a string, it is the target directory to recurse. If a list, it is either a list of strings representing
+                the files to process or TargetFile instances.
+            :param entry_filter: An optional callable receiving the DirEntry of a file found in the walk whose contents decide
+                the result, and returning False if the file cannot match.
+            :param timings: An optional execution.TimingReport to add the time spent walking and deciding on entries to.
+
+            :return: The list itself, or an execution.FileWalker over the target directory.
+        """
+        if type(target) is list:
+            return target
+
+        # Only push predicates down into the walk when there is something to decide on metadata
+        if entry_filter is not None or (not self.profiled and any(predicate.is_metadata() for predicate in self.predicates())):
+            pushdown = lambda entry: self._pushdown(entry, entry_filter, timings)
+            return execution.FileWalker(target, entry_filter=pushdown, timings=timings)
+        return execution.FileWalker(target, timings=timings)
+
+    def _execute_files(self, file_list, timings=None):
+        """
+            Evaluates the query against the given files in this thread.
+
+            :param file_list: An iterable of file paths, TargetFile instances, DirEntry objects or SearchResult objects. The
+                latter are files that were already matched during the walk and are passed through.
+            :param timings: An optional execution.TimingReport to add the time spent stat'ing, reading and evaluating files
+                to.
+
+            :return: A generator of SearchResult objects for the files that match.
+            :rtype: generator
+        """
+        if self.interpreted and not self.profiled:
+            evaluate = lambda target_file: self._execute(target_file, self)
+        else:
+            evaluate = self.evaluate
+
+        for current_file in file_list:
+            if isinstance(current_file, SearchResult):
+                yield current_file
+                continue
+            elif type(current_file) is str:
+                current_file = parse.TargetFile(current_file, chunk_size=self.chunk_size, timings=timings)
+            elif not isinstance(current_file, parse.TargetFile):
+                current_file = parse.TargetFile(current_file.path, entry=current_file, chunk_size=self.chunk_size, timings=timings)
+            elif timings is not None:
+                current_file.timings = timings
+
+            if timings is None:
+                result = evaluate(current_file)
+            else:
+                result = self._timed_evaluation(timings, current_file, evaluate, current_file)
+            if result is True:
+                yield SearchResult(path=current_file.path)
+
+    def _collect_batch(self, pending_batch, batch_sizer, timings=None):
+        """
+            Waits for the result of a batch that was sent to a worker process and merges its counters into this query.
+
+            :param pending_batch: A tuple (file_count, PendingBatch) for a SearchExecutor.submit call.
+            :param batch_sizer: The execution.BatchSizer to report the cost of the batch to.
+            :param timings: The execution.TimingReport to merge the timings of the worker into, if the execution is timed.
+
+            :return: A list of SearchResult objects.
+            :rtype: list
+        """
+        file_count, pending_result = pending_batch
+        matched_paths, evaluated_predicates, skipped_predicates, elapsed, batch_timings, batch_profile = pending_result.get()
+        self.evaluated_predicates += evaluated_predicates
+        self.skipped_predicates += skipped_predicates
+        if timings is not None and batch_timings is not None:
+            timings.merge(batch_timings)
+        if self.profile is not None and batch_profile is not None:
+            self.profile.merge(batch_profile)
+        batch_sizer.record(file_count, elapsed)
+        return [SearchResult(path=matched_path) for matched_path in matched_paths]
+
+    def execute(self, target=os.getcwd(), thread_count=multiprocessing.cpu_count(), queue_depth=QUEUE_DEPTH, executor=None,
+                entry_filter=None):
         """
             Executes the search query.
 
@@ -86,104 +592,330 @@ class SearchQuery(object):
             :param thread_count: The number of threads to use when processing the query. This defaults to the number of available processing
                 cores the executing system has. If None, then the query is processed in this thread. This uses the multiprocessing module internally,
                 so you actually get concurrent processing.
+            :param queue_depth: The maximum number of enumerated files buffered ahead of evaluation.
+            :param executor: An optional running execution.SearchExecutor to evaluate the files on. Its worker processes are
+                reused and thread_count is ignored. If None and thread_count is not None, a temporary executor is started and
+                shut down again for this execution.
+            :param entry_filter: An optional callable receiving the DirEntry of every file found in the directory walk whose
+                contents decide the result. Files for which it returns False are skipped without being read.
 
             :return: A list of SearchResult objects.
             :rtype: list
         """
+        return list(
+            self.iexecute(target, thread_count=thread_count, queue_depth=queue_depth, executor=executor, entry_filter=entry_filter)
+        )
 
-        # Collect a file list first (so we can use multiprocessing later)
-        file_list = target if type(target) is list else []
-        if type(target) is not list:
-            for directory, directory_names, filenames in os.walk(target):
-                for filename in filenames:
-                    relative_path = os.path.join(directory, filename)
-
-                    if os.path.isfile(relative_path):
-                        file_list.append(parse.TargetFile(relative_path))
-        else:
-            file_list = [parse.TargetFile(file_entry) if type(file_entry) is str else file_entry for file_entry in file_list]
-
-        matched_files = []
-        if thread_count is None:
-            # Process the file list
-            for current_file in file_list:
-                result = self._execute(current_file, self.compiled_data)
-                if result is True:
-                    matched_files.append(SearchResult(path=current_file.path))
-        else:
-            thread_pool = multiprocessing.Pool(thread_count)
-            passed_data = [(self, current_file) for current_file in file_list]
-
-            result_files = thread_pool.imap(_threaded_execute, passed_data)
-            for result in result_files:
-                matched_files += result
-
-        return matched_files
-
-    def iexecute(self, path=os.getcwd(), thread_count=8):
+    def iexecute(self, path=os.getcwd(), thread_count=8, queue_depth=QUEUE_DEPTH, executor=None, entry_filter=None):
         """
             Executes the search query and returns an iterator to results from the query. This allows you to execute queries asynchronously and retrieve results
             as they become available.
 
+            The directory walk runs concurrently with evaluation and feeds it through a bounded queue, so memory use does not grow with the size of
+            the tree and results are yielded while the walk is still in progress.
+
             :param target: If a string, it is the target directory to recurse. If a list, it is either a list of strings representing
                 the files to process or TargetFile instances.
             :param thread_count: The number of threads to use when processing the query. This defaults to the number of available processing
                 cores the executing system has. If None, then the query is processed in this thread. This uses the multiprocessing module internally,
                 so you actually get concurrent processing.
+            :param queue_depth: The maximum number of enumerated files buffered ahead of evaluation.
+            :param executor: An optional running execution.SearchExecutor to evaluate the files on. Its worker processes are
+                reused and thread_count is ignored. If None and thread_count is not None, a temporary executor is started and
+                shut down again for this execution.
+            :param entry_filter: An optional callable receiving the DirEntry of every file found in the directory walk whose
+                contents decide the result. Files for which it returns False are skipped without being read.
 
             :return: A generator to the results of the query.
             :rtype: generator
         """
+        if not self.timed:
+            return self._iexecute(path, thread_count, queue_depth, executor, entry_filter, None)
 
-        # Collect a file list first (so we can use multiprocessing later)
-        file_list = path if type(path) is list else []
-        if type(path) is not list:
-            for directory, directory_names, filenames in os.walk(path):
-                for filename in filenames:
-                    relative_path = os.path.join(directory, filename)
+        self.timings = execution.TimingReport() if self.timings is None else self.timings.restart()
+        return self.timings.time_results(self._iexecute(path, thread_count, queue_depth, executor, entry_filter, self.timings))
 
-                    if os.path.isfile(relative_path):
-                        file_list.append(parse.TargetFile(relative_path))
+    def _iexecute(self, path, thread_count, queue_depth, executor, entry_filter, timings):
+        """
+            Executes the search query, see .iexecute.
 
-        if thread_count is None:
-            for current_file in file_list:
-                result = self._execute(current_file, self.compiled_data)
-                if result is True:
-                    yield SearchResult(path=current_file.path)
-        else:
-            thread_pool = multiprocessing.Pool(thread_count)
-            passed_data = [(self, current_file) for current_file in file_list]
+            :param timings: The execution.TimingReport of the execution, or None if it is not timed.
 
-            result_files = thread_pool.imap(_threaded_execute, passed_data)
-            for result_list in result_files:
-                for result in result_list:
+            :return: A generator to the results of the query.
+            :rtype: generator
+        """
+        self.evaluated_predicates = 0
+        self.skipped_predicates = 0
+        if self.profiled:
+            self.profile = execution.QueryProfile([(depth, description) for node, depth, description in self._profile_nodes()])
+        self.prepare(time.time())
+
+        if thread_count is None and executor is None:
+            pipeline = execution.SearchPipeline(self._enumerate(path, entry_filter, timings), queue_depth)
+            try:
+                for result in self._execute_files(pipeline, timings):
                     yield result
+            finally:
+                pipeline.close()
+            return
+
+        # A temporary executor is started before the pipeline so that no walker threads exist when the workers are forked
+        owns_executor = executor is None
+        if owns_executor:
+            executor = execution.SearchExecutor(thread_count)
+        executor.start()
+
+        pipeline = execution.SearchPipeline(self._enumerate(path, entry_filter, timings), queue_depth)
+        query_handle = executor.register(self)
+
+        batch_sizer = execution.BatchSizer(self.BATCH_SIZE)
+        pending_results = collections.deque()
+        completed = False
+        try:
+            while True:
+                entry_batch = pipeline.next_batch(batch_sizer.size)
+                if entry_batch is None:
+                    break
+
+                path_batch = []
+                for entry in entry_batch:
+                    if isinstance(entry, SearchResult):
+                        yield entry
+                    else:
+                        path_batch.append(entry if type(entry) is str else entry.path)
+
+                if len(path_batch) != 0:
+                    pending_results.append((len(path_batch), executor.submit(query_handle, path_batch)))
+
+                # Bound the number of batches in flight so the pool cannot drain the pipeline faster than it evaluates
+                maximum_pending = max(executor.thread_count * 2, queue_depth // batch_sizer.size)
+                while len(pending_results) >= maximum_pending or (len(pending_results) != 0 and pending_results[0][1].ready()):
+                    for result in self._collect_batch(pending_results.popleft(), batch_sizer, timings):
+                        yield result
+
+            while len(pending_results) != 0:
+                for result in self._collect_batch(pending_results.popleft(), batch_sizer, timings):
+                    yield result
+            completed = True
+        finally:
+            pipeline.close()
+            if owns_executor:
+                executor.shutdown(wait=completed)
+
+    def cost(self):
+        """
+            Returns the estimated relative cost of evaluating this query for one file.
+
+            :rtype: int
+        """
+        return sum(predicate.cost() for predicate in self.predicates())
 
     def optimize(self):
         """
             Optimizes the query for performance. This is mostly useful when processing large sets of files.
 
-            :FIXME: This is currently a stub.
+            Every node is given an estimated cost from its operator and references, so that matching on the file name is
+            cheaper than on the extension, stat fields are more expensive, and CONTAINS and then CONTAINS PATTERN on the file
+            contents are the most expensive. The operands of every AND and OR are then ordered cheapest first, and the operands
+            of a chain of logical operators of one kind are ordered by cost as well and linked into the chain again, so that
+            content scans only run when the cheap predicates did not already decide the result.
         """
+        for node in self.compiled_data:
+            node.optimize()
+
+        # A chain of the same logical operator is commutative as a whole. Mixed chains depend on their order.
+        logical_types = set(type(node) for node in self.compiled_data)
+        if len(logical_types) == 1 and issubclass(list(logical_types)[0], parse.logic.LogicalOperator):
+            if logical_types.pop() is parse.logic.OrOperator:
+                self._group_contains()
+
+            # The nodes share their operands with their neighbours, so the operands are ordered rather than the nodes
+            if isinstance(self.compiled_data[0], parse.logic.LogicalOperator):
+                operands = sorted(self._chain_operands(self.compiled_data), key=lambda operand: operand.cost())
+                for node, lhs, rhs in zip(self.compiled_data, operands, operands[1:]):
+                    node.lhs = lhs
+                    node.rhs = rhs
+        self._build_execution_plan()
+        self._evaluator = None
+        self.optimized = True
+
+    def _group_contains(self):
+        """
+            Replaces the CONTAINS predicates on the same reference in a chain of OR operators by a single
+            parse.operators.ContainsAnyOperator, so that a file is searched for all of their literals at once.
+        """
+        operands = self._chain_operands(self.compiled_data)
+        groups = collections.OrderedDict()
+        for operand in operands:
+            if type(operand) is parse.operators.ContainsOperator and operand.rhs.__CONSTANT__:
+                groups.setdefault(type(operand.lhs), []).append(operand)
+
+        grouped_operands = []
+        for operand in operands:
+            group = groups.get(type(operand.lhs)) if type(operand) is parse.operators.ContainsOperator else None
+            if group is None or len(group) == 1 or operand not in group:
+                grouped_operands.append(operand)
+            elif operand is group[0]:
+                contains_any = parse.operators.ContainsAnyOperator(group)
+                contains_any.optimize()
+                grouped_operands.append(contains_any)
+
+        if len(grouped_operands) == len(operands):
+            return
+        elif len(grouped_operands) == 1:
+            self.compiled_data = grouped_operands
+            return
+
+        self.compiled_data = []
+        for lhs, rhs in zip(grouped_operands, grouped_operands[1:]):
+            or_operator = parse.logic.OrOperator()
+            or_operator.lhs = lhs
+            or_operator.rhs = rhs
+            self.compiled_data.append(or_operator)
+
+    @staticmethod
+    def _node_types():
+        """
+            Returns the classes that can appear in a serialized query, keyed by their name.
 
-    def __init__(self, compiled_data):
-        self.compiled_data = compiled_data
+            :rtype: dict
+        """
+        node_types = {"SearchQuery": SearchQuery}
+        pending = [parse.Operand, parse.operators.Operator, parse.logic.LogicalOperator, parse.suffixes.Suffix]
+        while len(pending) != 0:
+            node_type = pending.pop()
+            node_types[node_type.__name__] = node_type
+            pending.extend(node_type.__subclasses__())
+        return node_types
+
+    def _encode_chain(self):
+        """
+            Encodes the chain of this query as its distinct operands and the logical operators between them, which refer to
+            their operands by index so that the operands they share stay shared.
 
-        # Execute search
-        #self.results_start = datetime.datetime.now()
-        #results = self.execute(parsed_ast)
-        #self.results_end = datetime.datetime.now()
+            :rtype: dict
+        """
+        if not isinstance(self.compiled_data[0], parse.logic.LogicalOperator):
+            return {"type": "SearchQuery", "operands": [self._encode_value(node) for node in self.compiled_data], "nodes": []}
+
+        operands = self._chain_operands(self.compiled_data)
+        indices = dict((id(operand), index) for index, operand in enumerate(operands))
+        nodes = [
+            {"type": type(node).__name__, "lhs": indices[id(node.lhs)], "rhs": indices[id(node.rhs)]}
+            for node in self.compiled_data
+        ]
+        return {"type": "SearchQuery", "operands": [self._encode_value(operand) for operand in operands], "nodes": nodes}
+
+    @classmethod
+    def _encode_value(cls, value):
+        """
+            Encodes a node of the query, or a value of one of its serialized attributes, into plain values.
+        """
+        if type(value) is list:
+            return [cls._encode_value(element) for element in value]
+        elif isinstance(value, SearchQuery):
+            return value._encode_chain()
+        elif hasattr(value, "__SERIALIZED__"):
+            data = {"type": type(value).__name__}
+            for name in value.__SERIALIZED__:
+                data[name] = cls._encode_value(getattr(value, name))
+            return data
+        return value
+
+    @classmethod
+    def _decode_value(cls, data, node_types):
+        """
+            Rebuilds a node of the query, or a value of one of its serialized attributes, from what ._encode_value produced.
+        """
+        if type(data) is list:
+            return [cls._decode_value(element, node_types) for element in data]
+        elif type(data) is not dict:
+            # JSON produces text, while the compiler produces byte strings on Python 2
+            if not isinstance(data, str) and isinstance(data, type(u"")):
+                return data.encode("utf-8")
+            return data
+
+        node_type = node_types.get(data["type"])
+        if node_type is None:
+            raise ValueError("Unknown node type '%s' in serialized query." % data["type"])
+
+        if node_type is SearchQuery:
+            operands = [cls._decode_value(operand, node_types) for operand in data["operands"]]
+            if len(data["nodes"]) == 0:
+                return SearchQuery(operands)
+
+            compiled_data = []
+            for node_data in data["nodes"]:
+                node = cls._decode_value({"type": node_data["type"]}, node_types)
+                node.lhs = operands[node_data["lhs"]]
+                node.rhs = operands[node_data["rhs"]]
+                compiled_data.append(node)
+            return SearchQuery(compiled_data)
+
+        # The constructors take the compiler's match data, so the serialized attributes are assigned directly
+        node = node_type.__new__(node_type)
+        for name in getattr(node_type, "__SERIALIZED__", ()):
+            setattr(node, name, cls._decode_value(data[name], node_types))
+        return node
+
+    def to_data(self):
+        """
+            Returns the stable serialized form of this query, see .serialize, as a structure of dicts, lists and plain values.
 
-        # Produce timing output
+            :rtype: dict
         """
-        if self.timed:
-            compile_delta = compile_end - compile_start
-            parse_delta = parse_end - parse_start
-            results_delta = results_end - results_start
-            print("=========================================================")
-            print("Compiled in: %s" % str(compile_delta))
-            print("Parsed in: %s" % str(parse_delta))
-            print("Results in: %s" % str(compile_delta))
-            print("Total: %s" % (compile_delta + parse_delta + results_delta))
-            print("=========================================================")
+        return {"version": self.SERIALIZED_VERSION, "optimized": self.optimized, "query": self._encode_chain()}
+
+    @classmethod
+    def from_data(cls, data):
+        """
+            Rebuilds a query from the structure returned by .to_data.
+
+            :param data: The structure returned by .to_data.
+
+            :rtype: SearchQuery
         """
+        if data.get("version") != cls.SERIALIZED_VERSION:
+            raise ValueError("Unsupported serialized query version %r." % data.get("version"))
+
+        query = cls._decode_value(data["query"], cls._node_types())
+        if data["optimized"]:
+            query.optimize()
+        return query
+
+    def serialize(self):
+        """
+            Serializes this query into a stable JSON form that can be stored or sent to another process and read back with
+            .deserialize without compiling the query text again.
+
+            Only the structure of the query and the attributes each node lists in its __SERIALIZED__ are stored. Everything
+            derived from them, such as compiled patterns and the cost ordering, is rebuilt by .optimize when the query is
+            read back, so the form does not depend on the Python version or on implementation details of the nodes.
+
+            :rtype: str
+        """
+        return json.dumps(self.to_data(), sort_keys=True, separators=(",", ":"))
+
+    @classmethod
+    def deserialize(cls, serialized):
+        """
+            Rebuilds a query from the JSON form produced by .serialize.
+
+            :param serialized: The JSON text.
+
+            :rtype: SearchQuery
+        """
+        return cls.from_data(json.loads(serialized))
+
+    def __init__(self, compiled_data):
+        self.compiled_data = compiled_data
+        self.evaluated_predicates = 0
+        self.skipped_predicates = 0
+        self._evaluator = None
+        self._build_execution_plan()
+
+    def __getstate__(self):
+        # The compiled evaluator is made of closures, which cannot be pickled. Worker processes build their own.
+        state = self.__dict__.copy()
+        state["_evaluator"] = None
+        return state
@@ -9,6 +9,7 @@ from .suffix import Suffix
 from .number import Number
 from .string import String
 from .operator import Operator
+from .tokenlookup import TokenLookup
 from .reference import Reference
 from .whitespace import WhiteSpace
 from .parenthesesopen import ParenthesesOpen
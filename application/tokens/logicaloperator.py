@@ -25,6 +25,7 @@ import re
 
 from .token import Token
 from .reference import Reference
+from .tokenlookup import TokenLookup
 from parse.logic import LogicalOperator
 
 class LogicalOperator(Token):
@@ -42,3 +43,8 @@ class LogicalOperator(Token):
     """
         A regular expression pattern automatically built from the operator list.
     """
+
+    __LOOKUP__ = TokenLookup(LogicalOperator.__subclasses__())
+    """
+        A lookup table from operator tokens to the operator classes.
+    """
@@ -26,6 +26,7 @@ import re
 from .word import Word
 from .token import Token
 from .string import String
+from .tokenlookup import TokenLookup
 from parse.operators import Operator
 
 class Operator(Token):
@@ -34,3 +35,4 @@ class Operator(Token):
     """
     __OPERATORS__ = {operator.__name__: operator for operator in Operator.__subclasses__()}
     __PATTERN__ = re.compile("(%s)" % "|".join(["(?:%s)" % operator.__TOKEN__ for operator in Operator.__subclasses__()]), re.IGNORECASE)
+    __LOOKUP__ = TokenLookup(Operator.__subclasses__())
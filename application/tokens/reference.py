@@ -24,8 +24,10 @@
 import re
 
 from .token import Token
+from .tokenlookup import TokenLookup
 from parse.references import Reference
 
 class Reference(Token):
     __OPERATORS__ = {operator.__name__: operator for operator in Reference.__subclasses__()}
     __PATTERN__ = re.compile("(%s)" % "|".join(["(?:%s)" % operator.__TOKEN__ for operator in Reference.__subclasses__()]), re.IGNORECASE)
+    __LOOKUP__ = TokenLookup(Reference.__subclasses__())
@@ -0,0 +1,69 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import re
+
+class TokenLookup(object):
+    """
+        A lookup table from the text of a token to the class whose __TOKEN__ pattern matches all of it, ignoring case. The
+        patterns are compiled once, and the class found for a text is remembered, so a text is only matched once.
+    """
+
+    MAXIMUM_ENTRIES = 4096
+    """
+        The maximum number of texts remembered. The table is emptied when it is full, since texts such as "5 DAYS AGO" can
+        take arbitrarily many forms.
+    """
+
+    def __init__(self, classes):
+        """
+            Initializes a new TokenLookup.
+
+            :param classes: The classes to look up, in the order their patterns are tried in.
+        """
+        self._patterns = [(re.compile(current_class.__TOKEN__, re.IGNORECASE), current_class) for current_class in classes]
+        self._classes = {}
+
+    def lookup(self, text):
+        """
+            Returns the class for a token text.
+
+            :param text: The text of the token.
+
+            :return: The first class whose pattern matches the whole text, or None.
+        """
+        key = text.lower()
+        if key in self._classes:
+            return self._classes[key]
+
+        for pattern, current_class in self._patterns:
+            match_data = pattern.match(key)
+            if match_data is not None and match_data.end() == len(key):
+                break
+        else:
+            current_class = None
+
+        if len(self._classes) >= self.MAXIMUM_ENTRIES:
+            self._classes.clear()
+        self._classes[key] = current_class
+        return current_class
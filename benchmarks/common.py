@@ -0,0 +1,92 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import os
+import sys
+import random
+import shutil
+import tempfile
+import contextlib
+
+from timeit import default_timer
+
+# The application modules import each other as top level modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "application"))
+
+def create_corpus(directory, file_count, word_count, seed=0):
+    """
+        Writes text files of random words below a directory, spread over subdirectories of 100 files. Every tenth file
+        contains a line "ERROR <n>".
+
+        :param directory: The directory to write to.
+        :param file_count: The number of files.
+        :param word_count: The number of words per file.
+        :param seed: The seed of the random words.
+
+        :return: The paths of the files written.
+        :rtype: list
+    """
+    generator = random.Random(seed)
+    vocabulary = ["".join(generator.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(generator.randint(3, 9)))
+                  for _ in range(2000)]
+
+    paths = []
+    for index in range(file_count):
+        subdirectory = os.path.join(directory, "d%u" % (index // 100))
+        if not os.path.isdir(subdirectory):
+            os.makedirs(subdirectory)
+
+        path = os.path.join(subdirectory, "f%u.%s" % (index, "log" if index % 3 == 0 else "txt"))
+        with open(path, "w") as handle:
+            handle.write(" ".join(generator.choice(vocabulary) for _ in range(word_count)))
+            if index % 10 == 0:
+                handle.write("\nERROR %u\n" % index)
+        paths.append(path)
+    return paths
+
+@contextlib.contextmanager
+def temporary_corpus(file_count, word_count, seed=0):
+    """
+        Creates a corpus with create_corpus in a temporary directory, which is removed again afterwards.
+
+        :return: A tuple of the directory and the paths of the files.
+    """
+    directory = tempfile.mkdtemp(prefix="fssearch-benchmark-")
+    try:
+        yield directory, create_corpus(directory, file_count, word_count, seed)
+    finally:
+        shutil.rmtree(directory)
+
+def best_time(function, repeat):
+    """
+        Calls a function several times and returns the shortest duration, which is the least disturbed by other activity.
+
+        :return: A tuple of the shortest duration in seconds and the result of the last call.
+    """
+    best = None
+    for _ in range(repeat):
+        start_time = default_timer()
+        result = function()
+        elapsed = default_timer() - start_time
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
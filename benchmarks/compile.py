@@ -0,0 +1,80 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+"""
+    Measures how fast long generated queries are lexed and compiled, for queries of 1 to 10000 clauses combined with OR.
+
+    Usage: python benchmarks/compile.py [--clauses N [N ...]] [--total N]
+"""
+
+import random
+import argparse
+
+# Puts the application modules on the path
+import common
+
+from timeit import default_timer
+
+from querycompiler import QueryCompiler
+from querycompiler.querycompiler import generate_token_stream
+
+def generate_clause(generator):
+    """
+        Returns a random clause. Numbers carry a suffix, as the lexer does not accept them before a closing parenthesis.
+    """
+    return generator.choice((
+        'FILENAME == "report%u.txt"' % generator.randint(0, 999),
+        'FILE EXTENSION == ".txt"',
+        'FILE SIZE > %u KB' % generator.randint(1, 9999),
+        'CONTENTS CONTAINS PATTERN "err[0-9]+"',
+        'CONTENTS CONTAINS "word%u"' % generator.randint(0, 999),
+        'CREATION DATE > %u DAYS AGO' % generator.randint(1, 90),
+        '(FILE SIZE < %u MB AND FILENAME != "a")' % generator.randint(1, 99),
+    ))
+
+def main():
+    parser = argparse.ArgumentParser(description="Query compilation throughput.")
+    parser.add_argument("--clauses", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+    parser.add_argument("--total", type=int, default=20000, help="The number of clauses compiled per query length.")
+    arguments = parser.parse_args()
+
+    generator = random.Random(21)
+    for clause_count in arguments.clauses:
+        queries = [" OR ".join(generate_clause(generator) for _ in range(clause_count))
+                   for _ in range(max(1, arguments.total // clause_count))]
+
+        start_time = default_timer()
+        token_count = sum(sum(1 for _ in generate_token_stream(query)) for query in queries)
+        lex_time = default_timer() - start_time
+
+        start_time = default_timer()
+        for query in queries:
+            QueryCompiler().compile(query)
+        compile_time = default_timer() - start_time
+
+        print("%5u clauses x %5u queries: lex %9.0f tokens/s  compile %9.1f queries/s  %9.2f ms per query" % (
+            clause_count, len(queries), token_count / lex_time, len(queries) / compile_time, compile_time * 1000 / len(queries)
+        ))
+
+if __name__ == "__main__":
+    main()
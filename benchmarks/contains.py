@@ -0,0 +1,75 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+"""
+    Compares the ways a query made of many CONTAINS terms combined with OR is evaluated: as separate predicates, as one
+    parse.operators.ContainsAnyOperator scanning for each literal in turn, and as one ContainsAnyOperator using an
+    Aho-Corasick automaton. The group strategy is chosen with ContainsAnyOperator.AHO_CORASICK_THRESHOLD.
+
+    Usage: python benchmarks/contains.py [--files N] [--repeat N] [--terms N [N ...]]
+"""
+
+import random
+import argparse
+
+import common
+
+import parse
+from querycompiler import QueryCompiler
+
+def main():
+    parser = argparse.ArgumentParser(description="Separate versus grouped CONTAINS terms.")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--terms", type=int, nargs="+", default=[1, 10, 100, 1000])
+    arguments = parser.parse_args()
+
+    threshold = parse.operators.ContainsAnyOperator.AHO_CORASICK_THRESHOLD
+    generator = random.Random(17)
+    with common.temporary_corpus(arguments.files, 4000) as (directory, paths):
+        target_files = [parse.TargetFile(path) for path in paths]
+        for target_file in target_files:
+            target_file.contents
+
+        for term_count in arguments.terms:
+            # The terms are not in the corpus, so every file is scanned for all of them
+            terms = ["".join(generator.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(8)) + "#" for _ in range(term_count)]
+            query = " OR ".join('CONTENTS CONTAINS "%s"' % term for term in terms)
+
+            durations = []
+            for optimized, aho_corasick_threshold in ((False, None), (True, term_count + 1), (True, 1)):
+                parse.operators.ContainsAnyOperator.AHO_CORASICK_THRESHOLD = aho_corasick_threshold
+                try:
+                    compiled_query = QueryCompiler().compile(query, optimized=optimized)
+                finally:
+                    parse.operators.ContainsAnyOperator.AHO_CORASICK_THRESHOLD = threshold
+                duration, results = common.best_time(lambda: compiled_query.execute(target_files, thread_count=None), arguments.repeat)
+                durations.append(duration)
+
+            print("%5u terms: separate %9.2f ms  grouped linear %9.2f ms  grouped automaton %9.2f ms  (%s at the threshold of %u)" % (
+                term_count, durations[0] * 1000, durations[1] * 1000, durations[2] * 1000,
+                "automaton" if term_count >= threshold else "linear", threshold
+            ))
+
+if __name__ == "__main__":
+    main()
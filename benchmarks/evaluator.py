@@ -0,0 +1,126 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+"""
+    Compares three ways of evaluating files against a query:
+
+    - original: the node walk SearchQuery._execute performed before evaluation was made lazy, reproduced by
+      original_evaluate on an unoptimized compilation. Every node of a query is evaluated up front, so the predicates
+      below a chain of logical operators are evaluated again for every operator in the chain.
+    - interpreted: the current node walk of SearchQuery.interpreted, which stops evaluating once the result is decided.
+    - compiled: the evaluator compiled into closures by SearchQuery.build_evaluator.
+
+    All three use the current operator implementations, so only the evaluation strategy differs. The files are stat'ed and
+    read before timing, and each file is passed to the evaluation directly, so only evaluation is measured.
+
+    Usage: python benchmarks/evaluator.py [--files N] [--repeat N]
+"""
+
+import argparse
+
+import common
+
+import parse
+from searchquery import SearchQuery
+from querycompiler import QueryCompiler
+
+QUERIES = (
+    'FILENAME == "f9.log"',
+    'FILE SIZE > 1 KB AND FILE EXTENSION == ".log"',
+    'FILENAME == "f1.txt" OR FILENAME == "f2.txt" OR FILENAME == "f3.txt" OR FILE SIZE < 1 KB',
+    '(FILE EXTENSION == ".txt" AND FILE SIZE > 1 KB) OR (FILE EXTENSION == ".log" AND FILENAME != "f0.log")',
+    'CONTENTS CONTAINS "ERROR"',
+    'FILE EXTENSION == ".log" AND CONTENTS CONTAINS PATTERN "ERROR [0-9]+"',
+)
+
+def _original_node(node, target_file):
+    if isinstance(node, SearchQuery):
+        return original_evaluate(node, target_file)
+    elif isinstance(node, parse.logic.LogicalOperator):
+        # As the original AndOperator and OrOperator.evaluate, which evaluated their operands with Python's and / or
+        lhs_result = _original_node(node.lhs, target_file)
+        if lhs_result is node.__SHORT_CIRCUIT__:
+            return lhs_result
+        return node.evaluate(lhs_result, _original_node(node.rhs, target_file))
+    return node.evaluate(target_file)
+
+def original_evaluate(query, target_file):
+    """
+        Evaluates a file the way SearchQuery._execute did before evaluation was made lazy.
+
+        :param query: The SearchQuery to evaluate, compiled without optimization.
+        :param target_file: The TargetFile to evaluate.
+
+        :rtype: bool
+    """
+    logic_results = [(_original_node(node, target_file), node) for node in query.compiled_data]
+    current_evaluation, _ = logic_results[0]
+
+    for current_boolean, node in logic_results:
+        if not isinstance(node, parse.logic.LogicalOperator):
+            current_evaluation = current_boolean
+            break
+        current_evaluation = node.evaluate(current_evaluation, current_boolean)
+
+        if node.__SHORT_CIRCUIT__ is not None and node.__SHORT_CIRCUIT__ is current_evaluation:
+            return current_evaluation
+    return current_evaluation
+
+def main():
+    parser = argparse.ArgumentParser(description="Original, interpreted and compiled evaluation.")
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+
+    with common.temporary_corpus(arguments.files, 200) as (directory, paths):
+        target_files = [parse.TargetFile(path) for path in paths]
+        for target_file in target_files:
+            target_file.stat_result
+            target_file.contents
+
+        for query in QUERIES:
+            original_query = QueryCompiler().compile(query, optimized=False)
+            compiled_query = QueryCompiler().compile(query)
+            evaluators = (
+                lambda target_file: original_evaluate(original_query, target_file),
+                lambda target_file: compiled_query._execute(target_file, compiled_query),
+                compiled_query.build_evaluator(),
+            )
+
+            durations = []
+            match_counts = set()
+            for evaluate in evaluators:
+                duration, results = common.best_time(
+                    lambda: [target_file for target_file in target_files if evaluate(target_file)], arguments.repeat
+                )
+                durations.append(duration)
+                match_counts.add(len(results))
+            assert len(match_counts) == 1, "%s: the evaluations disagree" % query
+
+            print("%-100s original %8.2f ms  interpreted %8.2f ms  compiled %8.2f ms  %5.2fx  (%u matches)" % (
+                query, durations[0] * 1000, durations[1] * 1000, durations[2] * 1000, durations[0] / durations[2],
+                len(results)
+            ))
+
+if __name__ == "__main__":
+    main()
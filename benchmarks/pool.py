@@ -0,0 +1,65 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+"""
+    Compares queries that start and stop their own worker processes with queries sent to a running
+    execution.SearchExecutor, whose workers are already forked and keep the queries they have seen.
+
+    Usage: python benchmarks/pool.py [--files N] [--processes N] [--repeat N]
+"""
+
+import argparse
+
+import common
+
+import execution
+from querycompiler import QueryCompiler
+
+QUERIES = (
+    'CONTENTS CONTAINS "ERROR 5"',
+    " OR ".join('CONTENTS CONTAINS "term%u"' % index for index in range(1000)),
+)
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold versus warm worker pool.")
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=10)
+    arguments = parser.parse_args()
+
+    with common.temporary_corpus(arguments.files, 200) as (directory, paths):
+        with execution.SearchExecutor(arguments.processes) as executor:
+            for query in QUERIES:
+                compiled_query = QueryCompiler().compile(query)
+                cold_time, cold_results = common.best_time(
+                    lambda: compiled_query.execute(paths, thread_count=arguments.processes), arguments.repeat
+                )
+                warm_time, warm_results = common.best_time(lambda: compiled_query.execute(paths, executor=executor), arguments.repeat)
+
+                print("%-60s cold %8.2f ms  warm %8.2f ms  %5.2fx  (%u matches)" % (
+                    query[:60], cold_time * 1000, warm_time * 1000, cold_time / warm_time, len(warm_results)
+                ))
+                assert len(cold_results) == len(warm_results)
+
+if __name__ == "__main__":
+    main()
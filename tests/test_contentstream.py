@@ -0,0 +1,95 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import unittest
+
+import parse
+from querycompiler import QueryCompiler
+
+class ContentStreamTest(unittest.TestCase):
+    """
+        Tests that searching the contents in chunks finds the same matches as searching them whole, including matches
+        spanning a chunk boundary.
+    """
+
+    CONTENTS = (b"xx ERROR 42 in module\nlast", b"ERROR 12345678 in\n", b"a ERROR\n1 in b", b"ERRORS 7 in", b"in module")
+    """
+        The file contents searched.
+    """
+
+    PATTERNS = (r"ERROR [0-9]{1,3} in", r"ERROR [0-9]+ in", r"in$", r"module$", r"(?m)module$", r"\bERROR\b", r"42\b",
+                r"^ERROR", r"\Bin", r"[0-9] in")
+    """
+        Bounded patterns, patterns testing what follows or precedes a position and unbounded patterns.
+    """
+
+    CHUNK_SIZES = tuple(range(1, 10))
+    """
+        The chunk sizes the contents are searched with.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_query(self):
+        for index, contents in enumerate(self.CONTENTS):
+            path = os.path.join(self.directory, "%d.txt" % index)
+            with open(path, "wb") as handle:
+                handle.write(contents)
+
+            for pattern in self.PATTERNS:
+                expected = re.search(pattern.encode("ascii"), contents) is not None
+                query = QueryCompiler().compile('CONTENTS CONTAINS PATTERN "%s"' % pattern)
+                for chunk_size in self.CHUNK_SIZES:
+                    results = query.execute([parse.TargetFile(path, chunk_size=chunk_size)], thread_count=None)
+                    self.assertEqual(len(results) == 1, expected, "%r %r chunk size %d" % (contents, pattern, chunk_size))
+
+    def test_search(self):
+        path = os.path.join(self.directory, "a.txt")
+        with open(path, "wb") as handle:
+            handle.write(self.CONTENTS[0])
+
+        for pattern in self.PATTERNS:
+            measurement = parse.ContentStream.measure(pattern.encode("ascii"))
+            expected = re.search(pattern.encode("ascii"), self.CONTENTS[0]) is not None
+            for chunk_size in self.CHUNK_SIZES:
+                result = parse.ContentStream(path, chunk_size).search(re.compile(pattern.encode("ascii")), measurement)
+                if measurement is None:
+                    self.assertIsNone(result, pattern)
+                else:
+                    self.assertEqual(result, expected, "%r chunk size %d" % (pattern, chunk_size))
+
+    def test_unbounded(self):
+        self.assertIsNone(parse.ContentStream.measure(b"ERROR [0-9]+ in"))
+        self.assertIsNone(parse.ContentStream.measure(b"(?<=a)b"))
+        self.assertEqual(parse.ContentStream.measure(b"ERROR [0-9]{1,3} in"), 12)
+
+if __name__ == "__main__":
+    unittest.main()
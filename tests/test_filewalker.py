@@ -0,0 +1,88 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import execution
+from execution import filewalker
+
+class FileWalkerTest(unittest.TestCase):
+    """
+        Tests the directory listings used by the FileWalker.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for index in range(4):
+            subdirectory = os.path.join(self.directory, "d%d" % index)
+            os.mkdir(subdirectory)
+            for file_index in range(8):
+                with open(os.path.join(subdirectory, "f%d.txt" % file_index), "w") as handle:
+                    handle.write("x")
+        self.paths = sorted(os.path.join(path, name) for path, _, names in os.walk(self.directory) for name in names)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _walk(self, thread_count=4):
+        return sorted(entry.path for entry in execution.FileWalker(self.directory, thread_count=thread_count))
+
+    def test_listdir_fallback(self):
+        original_scandir = filewalker.scandir
+        self.addCleanup(setattr, filewalker, "scandir", original_scandir)
+        filewalker.scandir = None
+        self.assertEqual(self._walk(), self.paths)
+
+    def test_listings_closed(self):
+        listings = []
+
+        class Listing(object):
+            def __init__(self, directory):
+                self.entries = iter(filewalker._ListDirEntry(directory, name) for name in os.listdir(directory))
+                self.closed = False
+                listings.append(self)
+
+            def __iter__(self):
+                return self
+
+            def __next__(self):
+                return next(self.entries)
+            next = __next__
+
+            def close(self):
+                self.closed = True
+
+        original_scandir = filewalker.scandir
+        self.addCleanup(setattr, filewalker, "scandir", original_scandir)
+        filewalker.scandir = Listing
+
+        self.assertEqual(self._walk(), self.paths)
+        execution.FileWalker(self.directory, thread_count=1).walk(lambda entry: False)
+        self.assertTrue(len(listings) > 5)
+        self.assertTrue(all(listing.closed for listing in listings))
+
+if __name__ == "__main__":
+    unittest.main()
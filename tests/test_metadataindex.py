@@ -0,0 +1,106 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+
+from index import MetadataIndex
+
+class MetadataIndexTest(unittest.TestCase):
+    """
+        Tests that refreshing a MetadataIndex gives the same index as building it again.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.root = os.path.join(self.directory, "root")
+        self._write("a.txt", "hello\n")
+        self._write("b.log", "world\n")
+        self._write("sub/c.txt", "sub\n")
+        self._write("sub/deep/d.tar.gz", "deep\n")
+        self._write("sub/deep/e.txt", "")
+        self._write("gone/f.txt", "removed\n")
+        self._write("same/g.txt", "unchanged\n")
+
+        # Refreshing relies on the modification times of directories, which must differ from those of the changes below
+        past_time = time.time() - 100
+        for directory, directory_names, file_names in os.walk(self.root):
+            os.utime(directory, (past_time, past_time))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, contents):
+        path = os.path.join(self.root, name)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, "w") as handle:
+            handle.write(contents)
+
+    def _rows(self, index):
+        connection = index._connection
+        return (
+            connection.execute("SELECT * FROM directories ORDER BY path").fetchall(),
+            connection.execute("SELECT * FROM files ORDER BY path").fetchall(),
+        )
+
+    def _index(self, name):
+        index = MetadataIndex(os.path.join(self.directory, name))
+        self.addCleanup(index.close)
+        return index
+
+    def test_refresh(self):
+        refreshed_index = self._index("refreshed.db")
+        self.assertEqual(refreshed_index.build(self.root), 7)
+
+        # Add, remove, rename and rewrite files, and add and remove directories
+        self._write("new.txt", "new\n")
+        os.remove(os.path.join(self.root, "b.log"))
+        os.rename(os.path.join(self.root, "sub/c.txt"), os.path.join(self.root, "sub/c.log"))
+        self._write("sub/deep/e.txt", "now with contents\n")
+        os.remove(os.path.join(self.root, "sub/deep/d.tar.gz"))
+        self._write("sub/added/h.txt", "added\n")
+        self._write("sub/added/nested/i.txt", "nested\n")
+        shutil.rmtree(os.path.join(self.root, "gone"))
+
+        written_count, removed_count = refreshed_index.refresh(self.root)
+        built_index = self._index("built.db")
+        built_index.build(self.root)
+
+        self.assertEqual(self._rows(refreshed_index), self._rows(built_index))
+        self.assertEqual(removed_count, 4)
+        self.assertGreaterEqual(written_count, 5)
+
+    def test_refresh_unchanged(self):
+        index = self._index("index.db")
+        index.build(self.root)
+        rows = self._rows(index)
+
+        self.assertEqual(index.refresh(self.root), (0, 0))
+        self.assertEqual(self._rows(index), rows)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import unittest
+
+import parse
+from querycompiler import QueryCompiler
+from searchquery import SearchQuery
+
+class OptimizeTest(unittest.TestCase):
+    """
+        Tests the ordering of queries by SearchQuery.optimize.
+    """
+
+    def _operand_types(self, query):
+        compiled_query = QueryCompiler().compile(query)
+        operands = [compiled_query.compiled_data[0].lhs] + [node.rhs for node in compiled_query.compiled_data]
+        for node, next_node in zip(compiled_query.compiled_data, compiled_query.compiled_data[1:]):
+            self.assertIs(node.rhs, next_node.lhs)
+        return [type(operand) for operand in operands]
+
+    def test_and_chain(self):
+        self.assertEqual(
+            self._operand_types('CONTENTS CONTAINS "y" AND CONTENTS CONTAINS PATTERN "x" AND FILENAME == "z"'),
+            [parse.operators.EqualsOperator, parse.operators.ContainsOperator, parse.operators.ContainsPatternOperator]
+        )
+
+    def test_or_chain(self):
+        self.assertEqual(
+            self._operand_types('CONTENTS CONTAINS PATTERN "x" OR FILE SIZE > 3 OR FILENAME == "z"'),
+            [parse.operators.EqualsOperator, parse.operators.GreaterThanOperator, parse.operators.ContainsPatternOperator]
+        )
+
+    def test_mixed_chain(self):
+        # AND binds tighter, so the OR chain has two operands of which the AND group is the cheaper one
+        self.assertEqual(
+            self._operand_types('CONTENTS CONTAINS "x" OR FILENAME == "a" AND FILE SIZE < 3 KB'),
+            [SearchQuery, parse.operators.ContainsOperator]
+        )
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import threading
+
+from querycompiler import QueryCache, QueryCompiler
+
+class QueryCacheTest(unittest.TestCase):
+    """
+        Tests the sharing of compiled queries by a QueryCache.
+    """
+
+    QUERY = 'CREATION DATE > 3 DAYS AGO AND CONTENTS CONTAINS "import"'
+    """
+        A query that resolves the current time and builds its evaluator on every execution.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for index in range(64):
+            with open(os.path.join(self.directory, "file%d.py" % index), "w") as handle:
+                handle.write("import os\n" if index % 2 == 0 else "pass\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_normalize(self):
+        self.assertEqual(QueryCache.normalize('  FILENAME  ==  "a  b"  OR FILE SIZE > 3 '), 'FILENAME == "a  b" OR FILE SIZE > 3')
+        self.assertEqual(QueryCache.normalize('FILENAME ==\t"a"\n'), 'FILENAME ==\t"a"\n')
+
+    def test_rejects_like_compiler(self):
+        def outcome(compile, query):
+            try:
+                compile(query)
+            except Exception as error:
+                return type(error)
+            return None
+
+        cache = QueryCache()
+        for query in ('FILENAME ==\t"a"', '\tFILENAME == "a"', 'FILENAME == "a"\n', 'FILENAME ==\n"a"',
+                      '  FILENAME  ==  "a"  ', 'FILENAME == "a\tb"'):
+            expected = outcome(QueryCompiler().compile, query)
+            self.assertEqual(outcome(cache.compile, query), expected, repr(query))
+            # A rejected query must not be answered from the cache on a second attempt either
+            self.assertEqual(outcome(cache.compile, query), expected, repr(query))
+
+    def test_copies(self):
+        cache = QueryCache()
+        first_query = cache.compile(self.QUERY)
+        second_query = cache.compile("  " + self.QUERY)
+
+        self.assertIsNot(first_query, second_query)
+        self.assertEqual(first_query.serialize(), second_query.serialize())
+        self.assertEqual(cache.statistics()["hits"], 1)
+        self.assertEqual(cache.statistics()["misses"], 1)
+
+    def test_interleaved_execution(self):
+        cache = QueryCache()
+        first_query = cache.compile("profile: " + self.QUERY)
+        second_query = cache.compile("profile: " + self.QUERY)
+
+        # The second execution runs entirely while the first one is suspended after its first result
+        first_results = first_query.iexecute(self.directory, thread_count=None)
+        first_matches = [next(first_results)]
+        second_matches = second_query.execute(self.directory, thread_count=None)
+        first_matches.extend(first_results)
+
+        self.assertEqual(len(first_matches), 32)
+        self.assertEqual(len(second_matches), 32)
+        for query in (first_query, second_query):
+            profile = query.profile.to_dict()
+            self.assertEqual(profile["query"]["evaluations"], 64)
+
+    def test_concurrent_execution(self):
+        cache = QueryCache()
+        expected = sorted(result.path for result in cache.compile(self.QUERY).execute(self.directory, thread_count=None))
+        self.assertEqual(len(expected), 32)
+
+        # Switching threads as often as possible makes executions of a shared query interleave reliably
+        if hasattr(sys, "setswitchinterval"):
+            switch_interval = sys.getswitchinterval()
+            self.addCleanup(sys.setswitchinterval, switch_interval)
+            sys.setswitchinterval(1e-6)
+        else:
+            check_interval = sys.getcheckinterval()
+            self.addCleanup(sys.setcheckinterval, check_interval)
+            sys.setcheckinterval(1)
+
+        failures = []
+        def run():
+            try:
+                for iteration in range(60):
+                    query = cache.compile(self.QUERY)
+                    results = sorted(result.path for result in query.execute(self.directory, thread_count=None))
+                    if results != expected:
+                        failures.append(results)
+            except Exception as error:
+                failures.append(error)
+
+        threads = [threading.Thread(target=run) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(failures, [])
+
+if __name__ == "__main__":
+    unittest.main()
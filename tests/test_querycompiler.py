@@ -0,0 +1,180 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import random
+import unittest
+
+import parse
+from searchquery import SearchQuery
+from querycompiler import QueryCompiler
+
+class LegacyQueryCompiler(QueryCompiler):
+    """
+        The query compiler with the four pass parser it had before precedence climbing, kept as a reference for queries
+        whose groups each use a single logical operator. It did not implement precedence, so it must not be given chains
+        mixing AND and OR.
+    """
+
+    def _parse(self, compiled_data):
+        # First pass: Match suffixes to numbers
+        removed_entries = []
+        for index, current_element in enumerate(compiled_data):
+            if index < len(compiled_data) - 1 and type(current_element) is parse.data.Number:
+                next_element = compiled_data[index + 1]
+                if type(next_element) in parse.suffixes.Suffix.__subclasses__():
+                    current_element.suffix = next_element
+                    removed_entries.append(next_element)
+        produced_ast = [current_element for current_element in compiled_data if current_element not in removed_entries]
+
+        # Second pass: Convert sub queries
+        produced_ast = [
+            current_element if type(current_element) is not list else SearchQuery(self._parse(current_element))
+            for current_element in produced_ast
+        ]
+
+        # Third pass: Match data to their operators, fourth pass: Match logical operands
+        for operator_type in (parse.operators.Operator, parse.logic.LogicalOperator):
+            removed_entries = []
+            for index, current_element in enumerate(produced_ast):
+                if type(current_element) in operator_type.__subclasses__():
+                    current_element.lhs = produced_ast[index - 1]
+                    current_element.rhs = produced_ast[index + 1]
+                    removed_entries.append(current_element.lhs)
+                    removed_entries.append(current_element.rhs)
+            produced_ast = [current_element for current_element in produced_ast if current_element not in removed_entries]
+        return produced_ast
+
+class QueryCompilerTest(unittest.TestCase):
+    """
+        Tests the parser of the QueryCompiler against the previous parser and against the precedence of Python's boolean
+        operators.
+    """
+
+    ATOMS = ('FILENAME == "a"', 'FILE SIZE > 40 KB', 'FILE SIZE < 3 MB', 'CONTENTS CONTAINS "x"', 'FILE EXTENSION != ".c"',
+             'FILENAME MATCHES PATTERN "[ab]"', 'CONTENTS CONTAINS PATTERN "[0-9]+"')
+    """
+        The predicates random queries are made of. The lexer does not accept a closing parenthesis after a number without
+        suffix or a time reference, so these are left out.
+    """
+
+    SEED_COUNT = 300
+    """
+        The number of random queries generated per test.
+    """
+
+    def _compile(self, compiler_type, query):
+        compiler = compiler_type()
+        compiler._lex(query)
+        return SearchQuery(compiler._parse(compiler.current_compilation))
+
+    def _structure(self, node):
+        if isinstance(node, SearchQuery):
+            return [self._structure(child) for child in node.compiled_data]
+        elif isinstance(node, (parse.logic.LogicalOperator, parse.operators.Operator)):
+            return (type(node).__name__, self._structure(node.lhs), self._structure(node.rhs))
+        return (type(node).__name__, node.describe())
+
+    def _generate(self, generator, atom, mixed, depth=0):
+        """
+            Generates a random query and returns it with the equivalent Python expression, in which each atom is replaced
+            by the text atom returns for it.
+        """
+        operator = generator.choice(("AND", "OR"))
+        query_parts = []
+        expression_parts = []
+        for index in range(generator.randint(1, 5)):
+            if index != 0:
+                operator = generator.choice(("AND", "OR")) if mixed else operator
+                query_parts.append(operator)
+                expression_parts.append(operator.lower())
+
+            if index != 0 and depth < 3 and generator.random() < 0.3:
+                query, expression = self._generate(generator, atom, mixed, depth + 1)
+                query_parts.append("(%s)" % query)
+                expression_parts.append("(%s)" % expression)
+            else:
+                query, expression = atom(generator)
+                query_parts.append(query)
+                expression_parts.append(expression)
+        return " ".join(query_parts), " ".join(expression_parts)
+
+    def _evaluate(self, node, values):
+        if isinstance(node, SearchQuery):
+            chain = node.compiled_data
+            if not isinstance(chain[0], parse.logic.LogicalOperator):
+                return self._evaluate(chain[0], values)
+
+            # A chain holds a single kind of logical operator
+            self.assertEqual(len(set(type(child) for child in chain)), 1)
+            results = [self._evaluate(child, values) for child in chain]
+            return all(results) if chain[0].__SHORT_CIRCUIT__ is False else any(results)
+        elif isinstance(node, parse.logic.LogicalOperator):
+            lhs_result, rhs_result = self._evaluate(node.lhs, values), self._evaluate(node.rhs, values)
+            return lhs_result and rhs_result if node.__SHORT_CIRCUIT__ is False else lhs_result or rhs_result
+        return values[node.rhs.string]
+
+    def test_legacy_parser(self):
+        generator = random.Random(22)
+        atom = lambda generator: (generator.choice(self.ATOMS), "")
+        for iteration in range(self.SEED_COUNT):
+            query, expression = self._generate(generator, atom, False)
+            self.assertEqual(
+                self._structure(self._compile(QueryCompiler, query)), self._structure(self._compile(LegacyQueryCompiler, query)),
+                query
+            )
+
+    def test_mixed_precedence(self):
+        generator = random.Random(22)
+        names = ["f%d" % index for index in range(6)]
+        atom = lambda generator: (lambda name: ('FILENAME == "%s"' % name, name))(generator.choice(names))
+        for iteration in range(self.SEED_COUNT):
+            query, expression = self._generate(generator, atom, True)
+            compiled_query = self._compile(QueryCompiler, query)
+            for assignment in range(8):
+                values = dict((name, generator.random() < 0.5) for name in names)
+                self.assertEqual(self._evaluate(compiled_query, values), eval(expression, {}, values), query)
+
+    def test_precedence(self):
+        compiled_query = self._compile(QueryCompiler, 'FILENAME == "a" OR FILENAME == "b" AND FILENAME == "c" OR FILENAME == "d"')
+        self.assertEqual(self._structure(compiled_query), [
+            ("OrOperator", ("EqualsOperator", ("FileNameReference", "FILENAME"), ("String", '"a"')), [
+                ("AndOperator", ("EqualsOperator", ("FileNameReference", "FILENAME"), ("String", '"b"')),
+                    ("EqualsOperator", ("FileNameReference", "FILENAME"), ("String", '"c"'))),
+            ]),
+            ("OrOperator", [
+                ("AndOperator", ("EqualsOperator", ("FileNameReference", "FILENAME"), ("String", '"b"')),
+                    ("EqualsOperator", ("FileNameReference", "FILENAME"), ("String", '"c"'))),
+            ], ("EqualsOperator", ("FileNameReference", "FILENAME"), ("String", '"d"'))),
+        ])
+
+        # A leading group of ANDs becomes a single operand of the OR
+        compiled_query = self._compile(QueryCompiler, 'FILE SIZE > 1 KB AND FILENAME == "a" AND FILENAME == "b" OR FILENAME == "c"')
+        self.assertEqual(len(compiled_query.compiled_data), 1)
+        self.assertEqual([type(node) for node in compiled_query.compiled_data[0].lhs.compiled_data], [parse.logic.AndOperator] * 2)
+
+    def test_syntax_errors(self):
+        for query in ('FILENAME == "a" FILENAME == "b"', 'FILENAME == "a" AND', '(FILENAME == "a"'):
+            self.assertRaises(Exception, QueryCompiler().compile, query)
+
+if __name__ == "__main__":
+    unittest.main()
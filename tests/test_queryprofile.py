@@ -0,0 +1,76 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from querycompiler import QueryCompiler
+
+class QueryProfileTest(unittest.TestCase):
+    """
+        Tests the counters of profiled executions.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for index in range(12):
+            with open(os.path.join(self.directory, "file%d.log" % index), "w") as handle:
+                handle.write(("ERROR %d\n" % index if index % 3 == 0 else "fine\n") * (1 + 100 * (index % 2)))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _profile(self, query, thread_count):
+        compiled_query = QueryCompiler().compile(query, profiled=True)
+        results = compiled_query.execute(self.directory, thread_count=thread_count)
+        return results, compiled_query.profile.to_dict()
+
+    def test_metadata_predicates(self):
+        for thread_count in (None, 2):
+            results, profile = self._profile('FILE SIZE > 100 AND CONTENTS CONTAINS "ERROR"', thread_count)
+            root = profile["query"]
+            size_node, contents_node = root["children"]
+
+            self.assertEqual(len(results), 2)
+            self.assertEqual(profile["walk_files"], 0)
+            self.assertEqual((root["evaluations"], root["true"], root["false"]), (12, 2, 10))
+            self.assertEqual(size_node["node"], "FILE SIZE > 100")
+            self.assertEqual((size_node["evaluations"], size_node["true"], size_node["false"]), (12, 6, 6))
+            self.assertEqual((contents_node["evaluations"], contents_node["true"]), (6, 2))
+
+    def test_entry_filter(self):
+        compiled_query = QueryCompiler().compile('FILE SIZE > 100 OR CONTENTS CONTAINS "ERROR"', profiled=True)
+        results = compiled_query.execute(
+            self.directory, thread_count=None, entry_filter=lambda entry: not entry.name.startswith("file1")
+        )
+        profile = compiled_query.profile.to_dict()
+
+        # file1.log, file10.log and file11.log are excluded by the entry filter
+        self.assertEqual(profile["walk_files"], 3)
+        self.assertEqual(profile["query"]["evaluations"], 9)
+        self.assertEqual(profile["query"]["true"], len(results))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import execution
+from querycompiler import QueryCompiler
+
+class SearchExecutorTest(unittest.TestCase):
+    """
+        Tests the evaluation of batches by the worker processes of a SearchExecutor.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.paths = []
+        for index in range(200):
+            path = os.path.join(cls.directory, "file%d.txt" % index)
+            with open(path, "w") as handle:
+                handle.write("<term%d>\n" % index)
+            cls.paths.append(path)
+
+        cls.executor = execution.SearchExecutor(2)
+        cls.executor.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+        shutil.rmtree(cls.directory)
+
+    def test_executions(self):
+        compiled_query = QueryCompiler().compile(" OR ".join('CONTENTS CONTAINS "<term%d>"' % index for index in range(0, 300, 3)))
+        expected = sorted(result.path for result in compiled_query.execute(self.paths, thread_count=None))
+        self.assertEqual(len(expected), 67)
+
+        for iteration in range(3):
+            results = compiled_query.execute(self.paths, executor=self.executor)
+            self.assertEqual(sorted(result.path for result in results), expected)
+
+    def test_missing_query(self):
+        compiled_query = QueryCompiler().compile('CONTENTS CONTAINS "<term1>"')
+        query_handle = self.executor.register(compiled_query)
+
+        # Batches beyond the first thread_count ones are sent without the query, which no worker has seen yet
+        self.executor._query_sends[query_handle[0]] = self.executor.thread_count
+        pending_batches = [self.executor.submit(query_handle, self.paths[index:index + 10]) for index in range(0, 200, 10)]
+
+        matched_paths = []
+        for pending_batch in pending_batches:
+            matched_paths.extend(pending_batch.get()[0])
+        self.assertEqual(matched_paths, [self.paths[1]])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import parse
+from querycompiler import QueryCompiler
+
+class TargetFileTest(unittest.TestCase):
+    """
+        Tests that the contents of a TargetFile are only read by queries depending on them.
+    """
+
+    METADATA_QUERIES = ('FILE SIZE > 4', 'FILENAME == "b.txt"', 'FILE SIZE > 4 OR FILENAME == "b.txt"',
+                        'FILE EXTENSION == ".txt" AND CREATION DATE > 1 DAYS AGO')
+    """
+        Queries that are decided on file metadata alone.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for name, contents in (("a.txt", "hello world\n"), ("b.txt", "hi\n"), ("c.log", "")):
+            with open(os.path.join(self.directory, name), "w") as handle:
+                handle.write(contents)
+        self.paths = sorted(os.path.join(self.directory, name) for name in os.listdir(self.directory))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _forbid_open(self):
+        # A module global shadows the builtin for the modules reading file contents
+        def forbidden_open(*arguments, **keywords):
+            raise AssertionError("A file was opened: %r" % (arguments,))
+
+        for module in (parse.targetfile, parse.contentstream):
+            module.open = forbidden_open
+            self.addCleanup(delattr, module, "open")
+
+    def test_metadata_queries(self):
+        for query in self.METADATA_QUERIES:
+            target_files = [parse.TargetFile(path) for path in self.paths]
+            QueryCompiler().compile(query).execute(target_files, thread_count=None)
+            for target_file in target_files:
+                self.assertFalse(target_file.contents_loaded, "%s read %s" % (query, target_file.path))
+
+    def test_metadata_queries_open_nothing(self):
+        self._forbid_open()
+        for query in self.METADATA_QUERIES:
+            for optimized in (True, False):
+                compiled_query = QueryCompiler().compile(query, optimized=optimized)
+                compiled_query.execute(self.directory, thread_count=None)
+                compiled_query.execute(self.paths, thread_count=None)
+
+    def test_contents_query(self):
+        target_files = [parse.TargetFile(path) for path in self.paths]
+        results = QueryCompiler().compile('FILENAME == "a.txt" AND CONTENTS CONTAINS "world"').execute(
+            target_files, thread_count=None
+        )
+
+        self.assertEqual([result.path for result in results], [self.paths[0]])
+        self.assertEqual([target_file.contents_loaded for target_file in target_files], [True, False, False])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+import search
+from index import MetadataIndex, TrigramIndex
+from querycompiler import QueryCompiler
+
+class TrigramIndexTest(unittest.TestCase):
+    """
+        Tests that searching with a TrigramIndex finds the same files as a full search.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.root = os.path.join(self.directory, "root")
+        for index in range(40):
+            subdirectory = os.path.join(self.root, *["d%u" % depth for depth in range(index % 4)])
+            if not os.path.isdir(subdirectory):
+                os.makedirs(subdirectory)
+            with open(os.path.join(subdirectory, "f%u.txt" % index), "w") as handle:
+                handle.write("line %u\n" % index + ("ERROR %u\n" % index if index % 5 == 0 else ""))
+
+        self.index = TrigramIndex(os.path.join(self.directory, "trigrams.db"))
+        self.index.build(self.root)
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.directory)
+
+    def _search(self, query, path):
+        compiled_query = QueryCompiler().compile(query)
+        expected = sorted(result.path for result in compiled_query.execute(path, thread_count=None))
+        results = sorted(result.path for result in self.index.execute(compiled_query, path, thread_count=None))
+        self.assertEqual(results, expected, query)
+        return results
+
+    def test_search(self):
+        self.assertEqual(len(self._search('CONTENTS CONTAINS "ERROR"', self.root)), 8)
+        self.assertEqual(len(self._search('CONTENTS CONTAINS "ERROR 15"', self.root)), 1)
+        self.assertEqual(len(self._search('CONTENTS CONTAINS "ERROR 1" OR CONTENTS CONTAINS "line 3"', self.root)), 13)
+        self.assertEqual(len(self._search('CONTENTS CONTAINS "ERROR"', os.path.join(self.root, "d0"))), 6)
+
+    def test_modified_files(self):
+        with open(os.path.join(self.root, "d0", "d1", "f2.txt"), "a") as handle:
+            handle.write("ERROR modified since the index was built\n")
+        self.assertEqual(len(self._search('CONTENTS CONTAINS "ERROR"', self.root)), 9)
+
+    def test_relative_path(self):
+        working_directory = os.getcwd()
+        self.addCleanup(os.chdir, working_directory)
+        os.chdir(self.directory)
+        self.assertEqual(len(self._search('CONTENTS CONTAINS "ERROR"', "root")), 8)
+
+    def test_command_line(self):
+        # The command line opens the indexes at their default locations
+        for index_type, database_path in ((TrigramIndex, self.index.database_path), (MetadataIndex, os.path.join(self.directory, "none.db"))):
+            self.addCleanup(setattr, index_type, "DATABASE_PATH", index_type.DATABASE_PATH)
+            index_type.DATABASE_PATH = database_path
+
+        arguments, output = sys.argv, sys.stdout
+        self.addCleanup(setattr, sys, "argv", arguments)
+        self.addCleanup(setattr, sys, "stdout", output)
+        sys.argv = ["search.py", self.root, 'CONTENTS CONTAINS "ERROR 1"']
+        sys.stdout = StringIO()
+        search.Application().main()
+
+        printed_paths = sorted(sys.stdout.getvalue().split())
+        self.assertEqual(printed_paths, sorted([os.path.join(self.root, "d0", "d1", "f10.txt"), os.path.join(self.root, "d0", "d1", "d2", "f15.txt")]))
+
+if __name__ == "__main__":
+    unittest.main()
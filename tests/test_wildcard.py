@@ -0,0 +1,95 @@
+"""
+    Filesystem searching software. This software acts as both a library and
+    an independent program used to provide search queries to your file system
+    and return the results to either the terminal or the calling python
+    programming.
+
+    Copyright (C) 2017 Robert MacGregor
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import unittest
+
+import parse
+from querycompiler import QueryCompiler
+
+class WildcardTest(unittest.TestCase):
+    """
+        Tests that CONTAINS WILDCARD matches like re.match with each '*' replaced by '.*?', whether the contents are read
+        whole or in chunks.
+    """
+
+    CASES = (
+        (b"abc\n", "a.c", True),
+        (b"a.c\n", "a.c", True),
+        (b"abc\n", "a[bx]c*", True),
+        (b"ab cd\n", "ab*cd", True),
+        (b"ab\ncd\n", "ab*cd", False),
+        (b"ab\ncd\n", "ab*", True),
+        (b"xabcd\n", "ab*", False),
+        (b"xabcd\n", "*cd", True),
+        (b"abcd", "abcd", True),
+        (b"ab cd ef gh\n", "ab*cd*gh", True),
+        (b"ab gh cd\n", "ab*cd*gh", False),
+        (b"ERROR 42 in module\n", "ERROR [0-9]+ in*module", True),
+        (b"ERROR x in module\n", "ERROR [0-9]+ in*module", False),
+        (b"line\nERROR 1\n", "*ERROR*", False),
+    )
+    """
+        Tuples (contents, pattern, expected).
+    """
+
+    CHUNK_SIZES = (None, 1, 2, 3, 7)
+    """
+        The chunk sizes the contents are read with, where None reads them whole.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, contents):
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as handle:
+            handle.write(contents)
+        return path
+
+    def test_cases(self):
+        for index, (contents, pattern, expected) in enumerate(self.CASES):
+            self.assertEqual(re.match(pattern.replace("*", ".*?").encode("ascii"), contents) is not None, expected)
+
+            path = self._write("%d.txt" % index, contents)
+            for optimized in (True, False):
+                query = QueryCompiler().compile('CONTENTS CONTAINS WILDCARD "%s"' % pattern, optimized=optimized)
+                for chunk_size in self.CHUNK_SIZES:
+                    results = query.execute([parse.TargetFile(path, chunk_size=chunk_size)], thread_count=None)
+                    self.assertEqual(len(results) == 1, expected, "%r %r chunk size %s" % (contents, pattern, chunk_size))
+
+    def test_filename(self):
+        path = self._write("report.txt", b"")
+        for pattern, expected in (("rep*.txt", True), ("rep*txt", True), ("r.p*", True), ("*.log", False),
+                                  ("port*", False)):
+            results = QueryCompiler().compile('FILENAME CONTAINS WILDCARD "%s"' % pattern).execute([path], thread_count=None)
+            self.assertEqual(len(results) == 1, expected, pattern)
+
+if __name__ == "__main__":
+    unittest.main()